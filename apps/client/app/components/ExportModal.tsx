@@ -11,7 +11,7 @@ import {
 import type { ExportCreate, ExportRecord } from "~/lib/schemas";
 import { truncateText } from "~/lib/utils";
 
-type ExportFormat = "csv" | "xlsx" | "pdf";
+type ExportFormat = ExportCreate["format"];
 type ExportScope = "transactions" | "accounts" | "categories" | "full_dump";
 type ExportStatus = "idle" | "pending" | "querying" | "rendering" | "done" | "error";
 const EXPORT_NAME_INPUT_MAX = 60;
@@ -36,6 +36,8 @@ const FORMAT_OPTIONS: { value: ExportFormat; label: string; description: string
   { value: "csv", label: "CSV", description: "Spreadsheet" },
   { value: "xlsx", label: "XLSX", description: "Excel workbook" },
   { value: "pdf", label: "PDF", description: "Report" },
+  { value: "parquet", label: "Parquet", description: "Typed columns" },
+  { value: "arrow", label: "Arrow", description: "Typed columns" },
 ];
 
 const SCOPE_OPTIONS: { value: ExportScope; label: string; description: string }[] = [
@@ -68,7 +70,11 @@ function generateDefaultName(scope: ExportScope, _format: ExportFormat): string
 }
 
 function getExportExtension(format: ExportFormat, scope: ExportScope): string {
-  if (format === "csv" && scope === "full_dump") return "zip";
+  if (scope === "full_dump" && (format === "csv" || format === "parquet" || format === "arrow")) {
+    return "zip";
+  }
+  if (format === "csv_gz") return "csv.gz";
+  if (format === "csv_zst") return "csv.zst";
   return format;
 }
 
@@ -1,7 +1,6 @@
-import { useEffect, useMemo, useState } from "react";
-import { getBudgetHistory } from "~/lib/api";
-import { useBudgets } from "~/lib/budgets";
-import type { BudgetHistoryPeriod, BudgetHistoryResponse } from "~/lib/schemas";
+import { useMemo, useState } from "react";
+import { useDashboardBudgetHistory } from "~/lib/dashboard/data-context";
+import type { BudgetHistoryPeriod } from "~/lib/schemas";
 import { formatCurrency } from "~/lib/utils";
 
 function HistoryBar({
@@ -57,33 +56,16 @@ function HistoryBar({
 }
 
 export function BudgetHistoryWidget() {
-  const { budgets, loading: budgetsLoading } = useBudgets();
+  // Every active weekly/monthly budget's history, computed in one pass by
+  // /dashboard/bootstrap; switching budgets is a local lookup.
+  const histories = useDashboardBudgetHistory();
   const [selectedId, setSelectedId] = useState<string>("");
-  const [history, setHistory] = useState<BudgetHistoryResponse | null>(null);
-  const [historyLoading, setHistoryLoading] = useState(false);
 
-  const periodicBudgets = useMemo(
-    () => budgets.filter((b) => b.period_type !== "custom"),
-    [budgets],
+  const history = useMemo(
+    () => histories.find((h) => h.budget_id === selectedId) ?? histories[0] ?? null,
+    [histories, selectedId],
   );
 
-  // Auto-select first budget
-  useEffect(() => {
-    if (!selectedId && periodicBudgets.length > 0) {
-      setSelectedId(periodicBudgets[0].id);
-    }
-  }, [periodicBudgets, selectedId]);
-
-  // Fetch history when selection changes
-  useEffect(() => {
-    if (!selectedId) return;
-    setHistoryLoading(true);
-    getBudgetHistory(selectedId, 6)
-      .then(setHistory)
-      .catch(() => setHistory(null))
-      .finally(() => setHistoryLoading(false));
-  }, [selectedId]);
-
   const { max, axisLabels } = useMemo(() => {
     if (!history) return { max: 1, axisLabels: [] };
     const peak = Math.max(1, ...history.periods.flatMap((p) => [p.spent, p.budgeted]));
@@ -97,8 +79,6 @@ export function BudgetHistoryWidget() {
     };
   }, [history]);
 
-  const isLoading = budgetsLoading || historyLoading;
-
   return (
     <div className="flex h-full flex-col overflow-hidden px-4 pb-3.5 pt-3">
       <div className="flex items-center justify-between gap-2 mb-3">
@@ -118,26 +98,22 @@ export function BudgetHistoryWidget() {
           </svg>
           Budget history
         </div>
-        {periodicBudgets.length > 1 && (
+        {histories.length > 1 && (
           <select
-            value={selectedId}
+            value={history?.budget_id ?? ""}
             onChange={(e) => setSelectedId(e.target.value)}
             className="text-[10px] bg-surface-elevated border border-edge-default rounded px-1.5 py-0.5 text-content-secondary focus:outline-none focus:ring-1 focus:ring-emerald max-w-[180px] truncate"
           >
-            {periodicBudgets.map((b) => (
-              <option key={b.id} value={b.id}>
-                {b.name}
+            {histories.map((h) => (
+              <option key={h.budget_id} value={h.budget_id}>
+                {h.budget_name}
               </option>
             ))}
           </select>
         )}
       </div>
 
-      {isLoading ? (
-        <div className="flex flex-1 items-center justify-center">
-          <div className="h-5 w-5 animate-spin rounded-full border-2 border-emerald border-t-transparent" />
-        </div>
-      ) : periodicBudgets.length === 0 ? (
+      {histories.length === 0 ? (
         <div className="flex flex-1 flex-col items-center justify-center gap-1.5 text-center">
           <p className="text-xs text-content-muted">No recurring budgets yet</p>
           <p className="text-[11px] text-content-muted/70">
@@ -1,17 +1,10 @@
-import { useMemo } from "react";
-import { useRecurring } from "~/lib/recurring";
+import { useDashboardUpcomingRecurring } from "~/lib/dashboard/data-context";
 import { formatCurrency, formatDate } from "~/lib/utils";
 
 export function UpcomingRecurringWidget() {
-  const { rules, loading } = useRecurring();
-
-  const upcoming = useMemo(() => {
-    return rules
-      .filter((r) => r.is_active)
-      .slice()
-      .sort((a, b) => a.next_due_at.localeCompare(b.next_due_at))
-      .slice(0, 8);
-  }, [rules]);
+  // Occurrences of every active rule in the next 30 days, already sorted and
+  // converted to the display currency by /dashboard/bootstrap.
+  const { occurrences: upcoming, currency } = useDashboardUpcomingRecurring();
 
   return (
     <div className="flex h-full flex-col overflow-hidden px-4 pb-3.5 pt-3">
@@ -33,49 +26,45 @@ export function UpcomingRecurringWidget() {
           Upcoming recurring
         </div>
         <span className="shrink-0 text-[10px] font-medium uppercase tracking-[0.14em] text-content-muted">
-          {upcoming.length} {upcoming.length === 1 ? "rule" : "rules"}
+          next 30 days
         </span>
       </div>
 
-      {loading ? (
-        <div className="flex flex-1 items-center justify-center text-xs text-content-muted">
-          Loading…
-        </div>
-      ) : upcoming.length === 0 ? (
+      {upcoming.length === 0 ? (
         <div className="flex flex-1 items-center justify-center text-center text-xs text-content-muted">
-          No active recurring rules.
+          Nothing due in the next 30 days.
           <br />
           Create one in Settings → Recurring.
         </div>
       ) : (
         <ul className="mt-2.5 flex min-h-0 flex-1 flex-col gap-1 overflow-y-auto">
-          {upcoming.map((rule) => {
+          {upcoming.map((occurrence) => {
             const tone =
-              rule.type === "income"
+              occurrence.type === "income"
                 ? "bg-positive-bg text-positive-text-strong"
-                : rule.type === "transfer"
+                : occurrence.type === "transfer"
                   ? "bg-accent-soft-bg text-accent-soft-text"
                   : "bg-surface-elevated text-content-secondary";
             return (
               <li
-                key={rule.id}
+                key={`${occurrence.rule_id}-${occurrence.due_date}`}
                 className="flex items-center gap-3 rounded-md border border-edge-default/70 bg-surface-elevated/55 px-2.5 py-1.5"
               >
                 <span
                   className={`shrink-0 rounded px-1.5 py-0.5 text-[9px] font-semibold uppercase tracking-wide ${tone}`}
                 >
-                  {rule.type[0]}
+                  {occurrence.type[0]}
                 </span>
                 <div className="flex min-w-0 flex-1 flex-col">
                   <span className="truncate text-[12px] font-medium leading-tight text-content-primary">
-                    {rule.name}
+                    {occurrence.name}
                   </span>
                   <span className="truncate text-[10px] text-content-tertiary">
-                    next {formatDate(rule.next_due_at, "mobile")}
+                    {formatDate(occurrence.due_date, "mobile")}
                   </span>
                 </div>
                 <span className="shrink-0 text-right text-[12px] font-semibold tabular-nums text-content-primary">
-                  {formatCurrency(rule.amount, rule.currency, true, 0)}
+                  {formatCurrency(occurrence.amount, currency, true, 0)}
                 </span>
               </li>
             );
@@ -652,6 +652,8 @@ export async function getDashboardBootstrap(options: {
   weeks?: number;
   days?: number;
   lookbackDays?: number;
+  upcomingDays?: number;
+  budgetPeriods?: number;
   widgetTypes: string[];
 }): Promise<DashboardBootstrapResponse> {
   const params = new URLSearchParams({
@@ -663,6 +665,8 @@ export async function getDashboardBootstrap(options: {
     weeks: String(options.weeks ?? 8),
     days: String(options.days ?? 90),
     lookback_days: String(options.lookbackDays ?? 120),
+    upcoming_days: String(options.upcomingDays ?? 30),
+    budget_periods: String(options.budgetPeriods ?? 6),
   });
   if (options.currency) params.set("currency", options.currency);
   if (options.category) params.set("category", options.category);
@@ -1,5 +1,6 @@
 import { createContext, type ReactNode, useContext } from "react";
 import type {
+  BudgetHistoryResponse,
   AccountBalance,
   AccountTrendResponse,
   Expense,
@@ -8,6 +9,7 @@ import type {
   MonthlyTrendResponse,
   RecurringResponse,
   SparklineResponse,
+  UpcomingRecurringResponse,
   WeekdayHeatmapResponse,
 } from "../schemas";
 
@@ -20,6 +22,8 @@ export type DashboardData = {
   weekdayHeatmap: WeekdayHeatmapResponse;
   accountTrend: AccountTrendResponse;
   recurring: RecurringResponse;
+  upcomingRecurring: UpcomingRecurringResponse;
+  budgetHistory: BudgetHistoryResponse[];
   startDate: string;
   endDate: string;
   currency: string | null;
@@ -56,6 +60,8 @@ const DashboardMonthlyTrendContext = createContext<MonthlyTrendResponse | null>(
 const DashboardWeekdayHeatmapContext = createContext<WeekdayHeatmapResponse | null>(null);
 const DashboardAccountTrendContext = createContext<AccountTrendResponse | null>(null);
 const DashboardRecurringContext = createContext<RecurringResponse | null>(null);
+const DashboardUpcomingRecurringContext = createContext<UpcomingRecurringResponse | null>(null);
+const DashboardBudgetHistoryContext = createContext<BudgetHistoryResponse[] | null>(null);
 const DashboardTransactionsContext = createContext<DashboardTransactionsData | null>(null);
 const DashboardActionsContext = createContext<DashboardDataActions | null>(null);
 
@@ -87,11 +93,15 @@ export function DashboardDataProvider({
                 <DashboardWeekdayHeatmapContext.Provider value={data.weekdayHeatmap}>
                   <DashboardAccountTrendContext.Provider value={data.accountTrend}>
                     <DashboardRecurringContext.Provider value={data.recurring}>
-                      <DashboardTransactionsContext.Provider value={transactions}>
-                        <DashboardActionsContext.Provider value={actions}>
-                          {children}
-                        </DashboardActionsContext.Provider>
-                      </DashboardTransactionsContext.Provider>
+                      <DashboardUpcomingRecurringContext.Provider value={data.upcomingRecurring}>
+                        <DashboardBudgetHistoryContext.Provider value={data.budgetHistory}>
+                          <DashboardTransactionsContext.Provider value={transactions}>
+                            <DashboardActionsContext.Provider value={actions}>
+                              {children}
+                            </DashboardActionsContext.Provider>
+                          </DashboardTransactionsContext.Provider>
+                        </DashboardBudgetHistoryContext.Provider>
+                      </DashboardUpcomingRecurringContext.Provider>
                     </DashboardRecurringContext.Provider>
                   </DashboardAccountTrendContext.Provider>
                 </DashboardWeekdayHeatmapContext.Provider>
@@ -114,6 +124,8 @@ export function useDashboardData(): DashboardData {
     weekdayHeatmap: useDashboardWeekdayHeatmap(),
     accountTrend: useDashboardAccountTrend(),
     recurring: useDashboardRecurring(),
+    upcomingRecurring: useDashboardUpcomingRecurring(),
+    budgetHistory: useDashboardBudgetHistory(),
     ...useDashboardMeta(),
   };
 }
@@ -190,6 +202,22 @@ export function useDashboardRecurring(): RecurringResponse {
   return recurring;
 }
 
+export function useDashboardUpcomingRecurring(): UpcomingRecurringResponse {
+  const upcomingRecurring = useContext(DashboardUpcomingRecurringContext);
+  if (!upcomingRecurring) {
+    throw new Error("useDashboardUpcomingRecurring must be used inside DashboardDataProvider");
+  }
+  return upcomingRecurring;
+}
+
+export function useDashboardBudgetHistory(): BudgetHistoryResponse[] {
+  const budgetHistory = useContext(DashboardBudgetHistoryContext);
+  if (!budgetHistory) {
+    throw new Error("useDashboardBudgetHistory must be used inside DashboardDataProvider");
+  }
+  return budgetHistory;
+}
+
 export function useDashboardTransactionsData(): DashboardTransactionsData {
   const data = useContext(DashboardTransactionsContext);
   if (!data) {
@@ -169,7 +169,7 @@ export const TransferResponseSchema = z.object({
 // ============================================================================
 
 export const ExportCreateSchema = z.object({
-  format: z.enum(["csv", "xlsx", "pdf"]),
+  format: z.enum(["csv", "csv_gz", "csv_zst", "xlsx", "pdf", "parquet", "arrow"]),
   scope: z.enum(["transactions", "accounts", "categories", "full_dump"]),
   name: z.string().max(120).optional(),
   start_date: z.coerce.date().optional(),
@@ -177,6 +177,8 @@ export const ExportCreateSchema = z.object({
   account_id: z.string().optional(),
   category_id: z.string().optional(),
   currency: z.string().length(3).optional(),
+  since_export_id: z.string().optional(),
+  since: z.coerce.date().optional(),
 });
 
 export const ExportJobResponseSchema = z.object({
@@ -194,6 +196,8 @@ export const ExportRecordSchema = z.object({
   name: z.string(),
   format: z.string(),
   scope: z.string(),
+  extension: z.string(),
+  delta_since: z.coerce.date().nullable().optional(),
   file_size: z.number(),
   created_at: z.coerce.date(),
   expires_at: z.coerce.date(),
@@ -298,6 +302,30 @@ export const RecurringResponseSchema = z.object({
   is_converted: z.boolean().default(false),
 });
 
+export const UpcomingOccurrenceSchema = z.object({
+  rule_id: z.string(),
+  due_date: z.string(),
+  type: z.enum(["expense", "income", "transfer"]),
+  name: z.string(),
+  amount: z.number(),
+  original_amount: z.number(),
+  original_currency: z.string().length(3),
+  account_name: z.string(),
+  to_account_name: z.string().nullable().optional(),
+  category_name: z.string().nullable().optional(),
+  category_color_light: z.string().nullable().optional(),
+  category_color_dark: z.string().nullable().optional(),
+});
+
+export const UpcomingRecurringResponseSchema = z.object({
+  occurrences: z.array(UpcomingOccurrenceSchema),
+  start_date: z.string(),
+  end_date: z.string(),
+  truncated: z.boolean().default(false),
+  currency: z.string().length(3),
+  is_converted: z.boolean().default(false),
+});
+
 export const DashboardBootstrapResponseSchema = z.object({
   preferred_currency: z.string().length(3),
   expenses: ExpensesResponseSchema,
@@ -309,6 +337,9 @@ export const DashboardBootstrapResponseSchema = z.object({
   weekday_heatmap: WeekdayHeatmapResponseSchema,
   account_trend: AccountTrendResponseSchema,
   recurring: RecurringResponseSchema,
+  upcoming_recurring: UpcomingRecurringResponseSchema,
+  // Budget schemas are declared further down; resolve them lazily.
+  budget_history: z.lazy(() => z.array(BudgetHistoryResponseSchema)).default([]),
 });
 
 // ============================================================================
@@ -523,6 +554,8 @@ export type AccountTrendSeries = z.infer<typeof AccountTrendSeriesSchema>;
 export type AccountTrendResponse = z.infer<typeof AccountTrendResponseSchema>;
 export type RecurringCharge = z.infer<typeof RecurringChargeSchema>;
 export type RecurringResponse = z.infer<typeof RecurringResponseSchema>;
+export type UpcomingOccurrence = z.infer<typeof UpcomingOccurrenceSchema>;
+export type UpcomingRecurringResponse = z.infer<typeof UpcomingRecurringResponseSchema>;
 export type DashboardBootstrapResponse = z.infer<typeof DashboardBootstrapResponseSchema>;
 export type RecurringRuleType = z.infer<typeof RecurringTypeSchema>;
 export type RecurringIntervalUnit = z.infer<typeof RecurringIntervalUnitSchema>;
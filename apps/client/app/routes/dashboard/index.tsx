@@ -75,6 +75,8 @@ const MONTHLY_TREND_WIDGET_TYPES = new Set<WidgetType>(["monthly_trend_bars"]);
 const WEEKDAY_HEATMAP_WIDGET_TYPES = new Set<WidgetType>(["weekday_heatmap"]);
 const ACCOUNT_TREND_WIDGET_TYPES = new Set<WidgetType>(["account_trend"]);
 const RECURRING_WIDGET_TYPES = new Set<WidgetType>(["recurring_subscriptions"]);
+const UPCOMING_RECURRING_WIDGET_TYPES = new Set<WidgetType>(["upcoming_recurring"]);
+const BUDGET_HISTORY_WIDGET_TYPES = new Set<WidgetType>(["budget_history"]);
 const TRANSACTIONS_WIDGET_TYPES = new Set<WidgetType>(["transactions"]);
 
 ensureWidgetsRegistered();
@@ -138,6 +140,8 @@ export async function clientLoader({ request }: { request: Request }) {
     weekdayHeatmap: bootstrap.weekday_heatmap,
     accountTrend: bootstrap.account_trend,
     recurring: bootstrap.recurring,
+    upcomingRecurring: bootstrap.upcoming_recurring,
+    budgetHistory: bootstrap.budget_history,
     preferredCurrency: bootstrap.preferred_currency,
     startDate,
     endDate,
@@ -210,6 +214,8 @@ export default function Dashboard() {
     weekdayHeatmap,
     accountTrend,
     recurring,
+    upcomingRecurring,
+    budgetHistory,
     accountBalances,
     preferredCurrency,
     startDate,
@@ -266,6 +272,8 @@ export default function Dashboard() {
     weekdayHeatmap,
     accountTrend,
     recurring,
+    upcomingRecurring,
+    budgetHistory,
     startDate,
     endDate,
     currency: currentCurrency || null,
@@ -319,6 +327,8 @@ export default function Dashboard() {
       weekdayHeatmap,
       accountTrend,
       recurring,
+      upcomingRecurring,
+      budgetHistory,
       startDate,
       endDate,
       currency: currentCurrency || null,
@@ -336,6 +346,7 @@ export default function Dashboard() {
   }, [
     accountBalances,
     accountTrend,
+    budgetHistory,
     currentCurrency,
     endDate,
     expenses,
@@ -350,6 +361,7 @@ export default function Dashboard() {
     sparkline,
     startDate,
     total_count,
+    upcomingRecurring,
     weekdayHeatmap,
   ]);
 
@@ -642,6 +654,9 @@ export default function Dashboard() {
         if (WEEKDAY_HEATMAP_WIDGET_TYPES.has(type)) next.weekdayHeatmap = bootstrap.weekday_heatmap;
         if (ACCOUNT_TREND_WIDGET_TYPES.has(type)) next.accountTrend = bootstrap.account_trend;
         if (RECURRING_WIDGET_TYPES.has(type)) next.recurring = bootstrap.recurring;
+        if (UPCOMING_RECURRING_WIDGET_TYPES.has(type))
+          next.upcomingRecurring = bootstrap.upcoming_recurring;
+        if (BUDGET_HISTORY_WIDGET_TYPES.has(type)) next.budgetHistory = bootstrap.budget_history;
         return next;
       });
 
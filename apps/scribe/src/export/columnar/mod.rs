@@ -0,0 +1,231 @@
+use std::io::Cursor;
+use std::sync::Arc;
+
+use arrow_array::builder::{
+    BooleanBuilder, Float64Builder, Int64Builder, StringBuilder, StringDictionaryBuilder,
+    TimestampMicrosecondBuilder,
+};
+use arrow_array::types::Int32Type;
+use arrow_array::{ArrayRef, RecordBatch};
+use arrow_schema::{ArrowError, DataType, Field, Schema, TimeUnit};
+use chrono::{DateTime, NaiveDateTime};
+use parquet::arrow::ArrowWriter;
+use parquet::basic::{Compression, ZstdLevel};
+use parquet::file::properties::WriterProperties;
+
+use crate::models::{AccountRow, CategoryRow, TransactionRow};
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ColumnarFormat {
+    Parquet,
+    ArrowIpc,
+}
+
+impl ColumnarFormat {
+    pub fn parse(name: &str) -> Option<Self> {
+        match name {
+            "parquet" => Some(Self::Parquet),
+            "arrow" => Some(Self::ArrowIpc),
+            _ => None,
+        }
+    }
+
+    pub fn extension(self) -> &'static str {
+        match self {
+            Self::Parquet => "parquet",
+            Self::ArrowIpc => "arrow",
+        }
+    }
+}
+
+// Low-cardinality text (names, types, currencies) is dictionary-encoded so
+// readers like pandas/DuckDB load it as categoricals.
+pub fn dictionary_type() -> DataType {
+    DataType::Dictionary(Box::new(DataType::Int32), Box::new(DataType::Utf8))
+}
+
+pub fn timestamp_type() -> DataType {
+    DataType::Timestamp(TimeUnit::Microsecond, Some("UTC".into()))
+}
+
+/// Parse the ISO-8601 strings produced by the server. Naive values (SQLite) are read as UTC.
+pub fn parse_timestamp_micros(value: &str) -> Option<i64> {
+    if let Ok(dt) = DateTime::parse_from_rfc3339(value) {
+        return Some(dt.timestamp_micros());
+    }
+    NaiveDateTime::parse_from_str(value, "%Y-%m-%dT%H:%M:%S%.f")
+        .ok()
+        .map(|dt| dt.and_utc().timestamp_micros())
+}
+
+pub fn transactions_batch(rows: &[TransactionRow]) -> Result<RecordBatch, ArrowError> {
+    let mut date = TimestampMicrosecondBuilder::with_capacity(rows.len()).with_timezone("UTC");
+    let mut description = StringBuilder::new();
+    let mut amount = Float64Builder::with_capacity(rows.len());
+    let mut currency = StringDictionaryBuilder::<Int32Type>::new();
+    let mut category = StringDictionaryBuilder::<Int32Type>::new();
+    let mut category_type = StringDictionaryBuilder::<Int32Type>::new();
+    let mut account = StringDictionaryBuilder::<Int32Type>::new();
+    let mut account_type = StringDictionaryBuilder::<Int32Type>::new();
+    let mut is_transfer = BooleanBuilder::with_capacity(rows.len());
+    let mut transfer_direction = StringDictionaryBuilder::<Int32Type>::new();
+    let mut is_opening_balance = BooleanBuilder::with_capacity(rows.len());
+
+    for row in rows {
+        date.append_option(parse_timestamp_micros(&row.date));
+        description.append_value(&row.description);
+        amount.append_value(row.amount);
+        currency.append_value(&row.currency);
+        category.append_value(&row.category);
+        category_type.append_value(&row.category_type);
+        account.append_value(&row.account);
+        account_type.append_value(&row.account_type);
+        is_transfer.append_value(row.is_transfer);
+        if row.transfer_direction.is_empty() {
+            transfer_direction.append_null();
+        } else {
+            transfer_direction.append_value(&row.transfer_direction);
+        }
+        is_opening_balance.append_value(row.is_opening_balance);
+    }
+
+    let schema = Schema::new(vec![
+        Field::new("date", timestamp_type(), true),
+        Field::new("description", DataType::Utf8, false),
+        Field::new("amount", DataType::Float64, false),
+        Field::new("currency", dictionary_type(), false),
+        Field::new("category", dictionary_type(), false),
+        Field::new("category_type", dictionary_type(), false),
+        Field::new("account", dictionary_type(), false),
+        Field::new("account_type", dictionary_type(), false),
+        Field::new("is_transfer", DataType::Boolean, false),
+        Field::new("transfer_direction", dictionary_type(), true),
+        Field::new("is_opening_balance", DataType::Boolean, false),
+    ]);
+    let columns: Vec<ArrayRef> = vec![
+        Arc::new(date.finish()),
+        Arc::new(description.finish()),
+        Arc::new(amount.finish()),
+        Arc::new(currency.finish()),
+        Arc::new(category.finish()),
+        Arc::new(category_type.finish()),
+        Arc::new(account.finish()),
+        Arc::new(account_type.finish()),
+        Arc::new(is_transfer.finish()),
+        Arc::new(transfer_direction.finish()),
+        Arc::new(is_opening_balance.finish()),
+    ];
+    RecordBatch::try_new(Arc::new(schema), columns)
+}
+
+pub fn accounts_batch(rows: &[AccountRow]) -> Result<RecordBatch, ArrowError> {
+    let mut name = StringDictionaryBuilder::<Int32Type>::new();
+    let mut account_type = StringDictionaryBuilder::<Int32Type>::new();
+    let mut balance = Float64Builder::with_capacity(rows.len());
+
+    for row in rows {
+        name.append_value(&row.name);
+        account_type.append_value(&row.account_type);
+        balance.append_value(row.balance);
+    }
+
+    let schema = Schema::new(vec![
+        Field::new("name", dictionary_type(), false),
+        Field::new("type", dictionary_type(), false),
+        Field::new("balance", DataType::Float64, false),
+    ]);
+    let columns: Vec<ArrayRef> = vec![
+        Arc::new(name.finish()),
+        Arc::new(account_type.finish()),
+        Arc::new(balance.finish()),
+    ];
+    RecordBatch::try_new(Arc::new(schema), columns)
+}
+
+pub fn categories_batch(rows: &[CategoryRow]) -> Result<RecordBatch, ArrowError> {
+    let mut name = StringDictionaryBuilder::<Int32Type>::new();
+    let mut category_type = StringDictionaryBuilder::<Int32Type>::new();
+    let mut total = Float64Builder::with_capacity(rows.len());
+    let mut count = Int64Builder::with_capacity(rows.len());
+
+    for row in rows {
+        name.append_value(&row.name);
+        category_type.append_value(&row.category_type);
+        total.append_value(row.total);
+        count.append_value(row.count);
+    }
+
+    let schema = Schema::new(vec![
+        Field::new("name", dictionary_type(), false),
+        Field::new("type", dictionary_type(), false),
+        Field::new("total", DataType::Float64, false),
+        Field::new("count", DataType::Int64, false),
+    ]);
+    let columns: Vec<ArrayRef> = vec![
+        Arc::new(name.finish()),
+        Arc::new(category_type.finish()),
+        Arc::new(total.finish()),
+        Arc::new(count.finish()),
+    ];
+    RecordBatch::try_new(Arc::new(schema), columns)
+}
+
+pub fn write_parquet(batch: &RecordBatch) -> Result<Vec<u8>, Box<dyn std::error::Error>> {
+    let props = WriterProperties::builder()
+        .set_compression(Compression::ZSTD(ZstdLevel::default()))
+        .build();
+    let mut writer = ArrowWriter::try_new(Vec::new(), batch.schema(), Some(props))?;
+    writer.write(batch)?;
+    Ok(writer.into_inner()?)
+}
+
+pub fn write_arrow_ipc(batch: &RecordBatch) -> Result<Vec<u8>, Box<dyn std::error::Error>> {
+    let mut writer = arrow_ipc::writer::FileWriter::try_new(Vec::new(), &batch.schema())?;
+    writer.write(batch)?;
+    writer.finish()?;
+    Ok(writer.into_inner()?)
+}
+
+pub fn write_batch(
+    batch: &RecordBatch,
+    format: ColumnarFormat,
+) -> Result<Vec<u8>, Box<dyn std::error::Error>> {
+    match format {
+        ColumnarFormat::Parquet => write_parquet(batch),
+        ColumnarFormat::ArrowIpc => write_arrow_ipc(batch),
+    }
+}
+
+pub fn write_full_dump_zip(
+    transactions: &[TransactionRow],
+    accounts: &[AccountRow],
+    categories: &[CategoryRow],
+    format: ColumnarFormat,
+) -> Result<Vec<u8>, Box<dyn std::error::Error>> {
+    let buf = Cursor::new(Vec::new());
+    let mut zip = zip::ZipWriter::new(buf);
+    // Parquet pages are already zstd-compressed; deflating them again only burns CPU.
+    let method = match format {
+        ColumnarFormat::Parquet => zip::CompressionMethod::Stored,
+        ColumnarFormat::ArrowIpc => zip::CompressionMethod::Deflated,
+    };
+    let options = zip::write::SimpleFileOptions::default().compression_method(method);
+    let ext = format.extension();
+
+    let batches = [
+        ("transactions", transactions_batch(transactions)?),
+        ("accounts", accounts_batch(accounts)?),
+        ("categories", categories_batch(categories)?),
+    ];
+    for (name, batch) in &batches {
+        zip.start_file(format!("{}.{}", name, ext), options)?;
+        let bytes = write_batch(batch, format)?;
+        std::io::Write::write_all(&mut zip, &bytes)?;
+    }
+
+    let cursor = zip.finish()?;
+    Ok(cursor.into_inner())
+}
+
+#[cfg(test)]
+mod tests;
@@ -0,0 +1,181 @@
+use std::io::Cursor;
+
+use arrow_array::cast::AsArray;
+use arrow_array::types::TimestampMicrosecondType;
+use parquet::arrow::arrow_reader::ParquetRecordBatchReaderBuilder;
+
+use super::*;
+
+fn sample_transaction() -> TransactionRow {
+    TransactionRow {
+        date: "2026-01-15T10:30:00+00:00".to_string(),
+        description: "Coffee at Blue Bottle".to_string(),
+        amount: 5.50,
+        currency: "NZD".to_string(),
+        category: "Food & Drink".to_string(),
+        category_type: "expense".to_string(),
+        account: "Checking".to_string(),
+        account_type: "checking".to_string(),
+        is_transfer: false,
+        transfer_direction: String::new(),
+        is_opening_balance: false,
+    }
+}
+
+fn sample_account() -> AccountRow {
+    AccountRow {
+        name: "Checking".to_string(),
+        account_type: "checking".to_string(),
+        balance: 1234.56,
+    }
+}
+
+fn sample_category() -> CategoryRow {
+    CategoryRow {
+        name: "Food & Drink".to_string(),
+        category_type: "expense".to_string(),
+        total: 150.75,
+        count: 12,
+    }
+}
+
+fn read_parquet(bytes: Vec<u8>) -> RecordBatch {
+    let mut reader = ParquetRecordBatchReaderBuilder::try_new(bytes::Bytes::from(bytes))
+        .unwrap()
+        .build()
+        .unwrap();
+    reader.next().unwrap().unwrap()
+}
+
+#[test]
+fn parse_timestamp_with_offset() {
+    let micros = parse_timestamp_micros("2026-01-15T10:30:00+00:00").unwrap();
+    assert_eq!(micros, 1_768_473_000_000_000);
+    let shifted = parse_timestamp_micros("2026-01-15T12:30:00+02:00").unwrap();
+    assert_eq!(shifted, micros);
+}
+
+#[test]
+fn parse_timestamp_naive_as_utc() {
+    assert_eq!(
+        parse_timestamp_micros("2026-01-15T10:30:00"),
+        Some(1_768_473_000_000_000)
+    );
+    assert_eq!(
+        parse_timestamp_micros("2026-01-15T10:30:00.250000"),
+        Some(1_768_473_000_250_000)
+    );
+    assert_eq!(parse_timestamp_micros("not a date"), None);
+}
+
+#[test]
+fn transactions_batch_types() {
+    let batch = transactions_batch(&[sample_transaction(), sample_transaction()]).unwrap();
+    assert_eq!(batch.num_rows(), 2);
+    let schema = batch.schema();
+    assert_eq!(
+        schema.field_with_name("date").unwrap().data_type(),
+        &timestamp_type()
+    );
+    assert_eq!(
+        schema.field_with_name("amount").unwrap().data_type(),
+        &DataType::Float64
+    );
+    assert_eq!(
+        schema.field_with_name("category").unwrap().data_type(),
+        &dictionary_type()
+    );
+    assert_eq!(
+        schema.field_with_name("is_transfer").unwrap().data_type(),
+        &DataType::Boolean
+    );
+}
+
+#[test]
+fn transactions_batch_dictionary_dedupes_names() {
+    let mut other = sample_transaction();
+    other.category = "Groceries".to_string();
+    let rows = vec![sample_transaction(), other, sample_transaction()];
+    let batch = transactions_batch(&rows).unwrap();
+    let category = batch
+        .column_by_name("category")
+        .unwrap()
+        .as_dictionary::<Int32Type>();
+    assert_eq!(category.values().len(), 2);
+    assert_eq!(category.keys().values(), &[0, 1, 0]);
+}
+
+#[test]
+fn transactions_batch_empty_direction_is_null() {
+    let mut transfer = sample_transaction();
+    transfer.is_transfer = true;
+    transfer.transfer_direction = "to".to_string();
+    let batch = transactions_batch(&[sample_transaction(), transfer]).unwrap();
+    let direction = batch.column_by_name("transfer_direction").unwrap();
+    assert!(direction.is_null(0));
+    assert!(direction.is_valid(1));
+}
+
+#[test]
+fn parquet_round_trip() {
+    let batch = transactions_batch(&[sample_transaction()]).unwrap();
+    let bytes = write_parquet(&batch).unwrap();
+    assert_eq!(&bytes[..4], b"PAR1");
+
+    let restored = read_parquet(bytes);
+    assert_eq!(restored.num_rows(), 1);
+    let date = restored
+        .column_by_name("date")
+        .unwrap()
+        .as_primitive::<TimestampMicrosecondType>();
+    assert_eq!(date.value(0), 1_768_473_000_000_000);
+}
+
+#[test]
+fn arrow_ipc_round_trip() {
+    let batch = accounts_batch(&[sample_account()]).unwrap();
+    let bytes = write_arrow_ipc(&batch).unwrap();
+    assert_eq!(&bytes[..6], b"ARROW1");
+
+    let mut reader = arrow_ipc::reader::FileReader::try_new(Cursor::new(bytes), None).unwrap();
+    let restored = reader.next().unwrap().unwrap();
+    assert_eq!(restored, batch);
+}
+
+#[test]
+fn categories_batch_counts() {
+    let batch = categories_batch(&[sample_category()]).unwrap();
+    let count = batch
+        .column_by_name("count")
+        .unwrap()
+        .as_primitive::<arrow_array::types::Int64Type>();
+    assert_eq!(count.value(0), 12);
+}
+
+#[test]
+fn full_dump_zip_contains_columnar_files() {
+    for format in [ColumnarFormat::Parquet, ColumnarFormat::ArrowIpc] {
+        let bytes = write_full_dump_zip(
+            &[sample_transaction()],
+            &[sample_account()],
+            &[sample_category()],
+            format,
+        )
+        .unwrap();
+        let mut archive = zip::ZipArchive::new(Cursor::new(bytes)).unwrap();
+        assert_eq!(archive.len(), 3);
+        let ext = format.extension();
+        for name in ["transactions", "accounts", "categories"] {
+            assert!(archive.by_name(&format!("{}.{}", name, ext)).is_ok());
+        }
+    }
+}
+
+#[test]
+fn empty_rows_still_write_schema() {
+    let batch = transactions_batch(&[]).unwrap();
+    let bytes = write_parquet(&batch).unwrap();
+    let builder = ParquetRecordBatchReaderBuilder::try_new(bytes::Bytes::from(bytes)).unwrap();
+    assert_eq!(builder.metadata().file_metadata().num_rows(), 0);
+    assert_eq!(builder.schema().fields().len(), 11);
+}
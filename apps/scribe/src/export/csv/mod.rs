@@ -57,5 +57,36 @@ pub fn write_full_dump_zip(
     Ok(cursor.into_inner())
 }
 
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Codec {
+    Gzip,
+    Zstd,
+}
+
+impl Codec {
+    pub fn parse(name: &str) -> Option<Self> {
+        match name {
+            "gzip" => Some(Self::Gzip),
+            "zstd" => Some(Self::Zstd),
+            _ => None,
+        }
+    }
+}
+
+const ZSTD_LEVEL: i32 = 3;
+
+/// Compress already-rendered CSV bytes for `csv_gz` / `csv_zst` downloads.
+pub fn compress(bytes: &[u8], codec: Codec) -> std::io::Result<Vec<u8>> {
+    match codec {
+        Codec::Gzip => {
+            let mut encoder =
+                flate2::write::GzEncoder::new(Vec::new(), flate2::Compression::default());
+            std::io::Write::write_all(&mut encoder, bytes)?;
+            encoder.finish()
+        }
+        Codec::Zstd => zstd::encode_all(bytes, ZSTD_LEVEL),
+    }
+}
+
 #[cfg(test)]
 mod tests;
@@ -216,3 +216,30 @@ fn csv_empty_optional_fields() {
     let lines: Vec<&str> = content.trim().split('\n').collect();
     assert_eq!(lines.len(), 2);
 }
+
+#[test]
+fn compress_gzip_round_trip() {
+    let bytes = write_transactions_csv(&[sample_transaction()]).unwrap();
+    let compressed = compress(&bytes, Codec::Gzip).unwrap();
+    assert_eq!(&compressed[..2], &[0x1f, 0x8b]);
+
+    let mut decoder = flate2::read::GzDecoder::new(&compressed[..]);
+    let mut restored = Vec::new();
+    std::io::Read::read_to_end(&mut decoder, &mut restored).unwrap();
+    assert_eq!(restored, bytes);
+}
+
+#[test]
+fn compress_zstd_round_trip() {
+    let bytes = write_transactions_csv(&[sample_transaction()]).unwrap();
+    let compressed = compress(&bytes, Codec::Zstd).unwrap();
+    assert_eq!(&compressed[..4], &[0x28, 0xb5, 0x2f, 0xfd]);
+    assert_eq!(zstd::decode_all(&compressed[..]).unwrap(), bytes);
+}
+
+#[test]
+fn codec_parse() {
+    assert_eq!(Codec::parse("gzip"), Some(Codec::Gzip));
+    assert_eq!(Codec::parse("zstd"), Some(Codec::Zstd));
+    assert_eq!(Codec::parse("brotli"), None);
+}
@@ -0,0 +1,153 @@
+use std::io::Cursor;
+use std::sync::Arc;
+
+use arrow_array::builder::{StringBuilder, TimestampMicrosecondBuilder};
+use arrow_array::{ArrayRef, RecordBatch};
+use arrow_schema::{ArrowError, DataType, Field, Schema};
+
+use crate::export::columnar::{self, parse_timestamp_micros, timestamp_type, ColumnarFormat};
+use crate::export::csv::{write_accounts_csv, write_categories_csv};
+use crate::models::{
+    AccountRow, CategoryRow, ChangedRow, TombstoneRow, TransactionRow, CHANGE_KEY_HEADERS,
+    TOMBSTONE_HEADERS, TRANSACTION_HEADERS,
+};
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum DeltaFormat {
+    Csv,
+    Columnar(ColumnarFormat),
+}
+
+impl DeltaFormat {
+    pub fn parse(name: &str) -> Option<Self> {
+        match name {
+            "csv" => Some(Self::Csv),
+            other => ColumnarFormat::parse(other).map(Self::Columnar),
+        }
+    }
+
+    pub fn extension(self) -> &'static str {
+        match self {
+            Self::Csv => "csv",
+            Self::Columnar(format) => format.extension(),
+        }
+    }
+}
+
+pub fn write_changes_csv(rows: &[ChangedRow]) -> Result<Vec<u8>, csv::Error> {
+    let mut wtr = csv::Writer::from_writer(Vec::new());
+    let headers: Vec<&str> = CHANGE_KEY_HEADERS
+        .iter()
+        .chain(TRANSACTION_HEADERS.iter())
+        .copied()
+        .collect();
+    wtr.write_record(&headers)?;
+    for row in rows {
+        wtr.write_record(row.to_csv_record())?;
+    }
+    Ok(wtr.into_inner().map_err(|e| e.into_error())?)
+}
+
+pub fn write_tombstones_csv(rows: &[TombstoneRow]) -> Result<Vec<u8>, csv::Error> {
+    let mut wtr = csv::Writer::from_writer(Vec::new());
+    wtr.write_record(TOMBSTONE_HEADERS)?;
+    for row in rows {
+        wtr.write_record(row.to_csv_record())?;
+    }
+    Ok(wtr.into_inner().map_err(|e| e.into_error())?)
+}
+
+/// Transactions batch with `id` and `updated_at` columns in front.
+pub fn changes_batch(rows: &[ChangedRow]) -> Result<RecordBatch, ArrowError> {
+    let mut id = StringBuilder::new();
+    let mut updated_at =
+        TimestampMicrosecondBuilder::with_capacity(rows.len()).with_timezone("UTC");
+    for row in rows {
+        id.append_value(&row.id);
+        updated_at.append_option(parse_timestamp_micros(&row.updated_at));
+    }
+
+    let tx_rows: Vec<TransactionRow> = rows.iter().map(|r| r.row.clone()).collect();
+    let base = columnar::transactions_batch(&tx_rows)?;
+
+    let mut fields = vec![
+        Field::new("id", DataType::Utf8, false),
+        Field::new("updated_at", timestamp_type(), true),
+    ];
+    fields.extend(base.schema().fields().iter().map(|f| f.as_ref().clone()));
+    let mut columns: Vec<ArrayRef> = vec![Arc::new(id.finish()), Arc::new(updated_at.finish())];
+    columns.extend(base.columns().iter().cloned());
+    RecordBatch::try_new(Arc::new(Schema::new(fields)), columns)
+}
+
+pub fn tombstones_batch(rows: &[TombstoneRow]) -> Result<RecordBatch, ArrowError> {
+    let mut id = StringBuilder::new();
+    let mut deleted_at =
+        TimestampMicrosecondBuilder::with_capacity(rows.len()).with_timezone("UTC");
+    for row in rows {
+        id.append_value(&row.id);
+        deleted_at.append_option(parse_timestamp_micros(&row.deleted_at));
+    }
+
+    let schema = Schema::new(vec![
+        Field::new("id", DataType::Utf8, false),
+        Field::new("deleted_at", timestamp_type(), true),
+    ]);
+    let columns: Vec<ArrayRef> = vec![Arc::new(id.finish()), Arc::new(deleted_at.finish())];
+    RecordBatch::try_new(Arc::new(schema), columns)
+}
+
+/// ZIP with `changes` and `deleted` files, plus `accounts` / `categories`
+/// snapshots when given (full-dump deltas).
+pub fn write_delta_zip(
+    changes: &[ChangedRow],
+    tombstones: &[TombstoneRow],
+    accounts: Option<&[AccountRow]>,
+    categories: Option<&[CategoryRow]>,
+    format: DeltaFormat,
+) -> Result<Vec<u8>, Box<dyn std::error::Error>> {
+    let buf = Cursor::new(Vec::new());
+    let mut zip = zip::ZipWriter::new(buf);
+    let method = match format {
+        DeltaFormat::Columnar(ColumnarFormat::Parquet) => zip::CompressionMethod::Stored,
+        _ => zip::CompressionMethod::Deflated,
+    };
+    let options = zip::write::SimpleFileOptions::default().compression_method(method);
+    let ext = format.extension();
+
+    let mut files: Vec<(&str, Vec<u8>)> = Vec::new();
+    match format {
+        DeltaFormat::Csv => {
+            files.push(("changes", write_changes_csv(changes)?));
+            files.push(("deleted", write_tombstones_csv(tombstones)?));
+            if let Some(rows) = accounts {
+                files.push(("accounts", write_accounts_csv(rows)?));
+            }
+            if let Some(rows) = categories {
+                files.push(("categories", write_categories_csv(rows)?));
+            }
+        }
+        DeltaFormat::Columnar(columnar_format) => {
+            let write = |batch: RecordBatch| columnar::write_batch(&batch, columnar_format);
+            files.push(("changes", write(changes_batch(changes)?)?));
+            files.push(("deleted", write(tombstones_batch(tombstones)?)?));
+            if let Some(rows) = accounts {
+                files.push(("accounts", write(columnar::accounts_batch(rows)?)?));
+            }
+            if let Some(rows) = categories {
+                files.push(("categories", write(columnar::categories_batch(rows)?)?));
+            }
+        }
+    }
+
+    for (name, bytes) in &files {
+        zip.start_file(format!("{}.{}", name, ext), options)?;
+        std::io::Write::write_all(&mut zip, bytes)?;
+    }
+
+    let cursor = zip.finish()?;
+    Ok(cursor.into_inner())
+}
+
+#[cfg(test)]
+mod tests;
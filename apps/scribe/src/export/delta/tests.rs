@@ -0,0 +1,111 @@
+use std::io::Cursor;
+
+use super::*;
+
+fn sample_change() -> ChangedRow {
+    ChangedRow {
+        id: "4f1c7c2e-0000-4000-8000-000000000001".to_string(),
+        updated_at: "2026-01-16T08:00:00+00:00".to_string(),
+        row: TransactionRow {
+            date: "2026-01-15T10:30:00+00:00".to_string(),
+            description: "Coffee at Blue Bottle".to_string(),
+            amount: 5.50,
+            currency: "NZD".to_string(),
+            category: "Food & Drink".to_string(),
+            category_type: "expense".to_string(),
+            account: "Checking".to_string(),
+            account_type: "checking".to_string(),
+            is_transfer: false,
+            transfer_direction: String::new(),
+            is_opening_balance: false,
+        },
+    }
+}
+
+fn sample_tombstone() -> TombstoneRow {
+    TombstoneRow {
+        id: "4f1c7c2e-0000-4000-8000-000000000002".to_string(),
+        deleted_at: "2026-01-16T09:00:00".to_string(),
+    }
+}
+
+fn sample_account() -> AccountRow {
+    AccountRow {
+        name: "Checking".to_string(),
+        account_type: "checking".to_string(),
+        balance: 1234.56,
+    }
+}
+
+#[test]
+fn changes_csv_prefixes_id_columns() {
+    let change = sample_change();
+    let bytes = write_changes_csv(&[change.clone()]).unwrap();
+    let content = String::from_utf8(bytes).unwrap();
+    let lines: Vec<&str> = content.trim().split('\n').collect();
+    assert!(lines[0].starts_with("ID,Updated At,Date,"));
+    assert!(lines[1].starts_with(&format!("{},{},", change.id, change.updated_at)));
+}
+
+#[test]
+fn tombstones_csv_has_id_and_deleted_at() {
+    let bytes = write_tombstones_csv(&[sample_tombstone()]).unwrap();
+    let content = String::from_utf8(bytes).unwrap();
+    assert_eq!(
+        content,
+        "ID,Deleted At\n4f1c7c2e-0000-4000-8000-000000000002,2026-01-16T09:00:00\n"
+    );
+}
+
+#[test]
+fn changes_batch_puts_identity_first() {
+    let batch = changes_batch(&[sample_change()]).unwrap();
+    let schema = batch.schema();
+    assert_eq!(schema.field(0).name(), "id");
+    assert_eq!(schema.field(1).name(), "updated_at");
+    assert_eq!(schema.field(2).name(), "date");
+    assert_eq!(batch.num_columns(), 13);
+}
+
+#[test]
+fn delta_zip_csv_without_snapshots() {
+    let bytes = write_delta_zip(
+        &[sample_change()],
+        &[sample_tombstone()],
+        None,
+        None,
+        DeltaFormat::Csv,
+    )
+    .unwrap();
+    let mut archive = zip::ZipArchive::new(Cursor::new(bytes)).unwrap();
+    assert_eq!(archive.len(), 2);
+    assert!(archive.by_name("changes.csv").is_ok());
+    assert!(archive.by_name("deleted.csv").is_ok());
+}
+
+#[test]
+fn delta_zip_parquet_with_snapshots() {
+    let bytes = write_delta_zip(
+        &[sample_change()],
+        &[],
+        Some(&[sample_account()]),
+        Some(&[]),
+        DeltaFormat::Columnar(ColumnarFormat::Parquet),
+    )
+    .unwrap();
+    let mut archive = zip::ZipArchive::new(Cursor::new(bytes)).unwrap();
+    assert_eq!(archive.len(), 4);
+    for name in ["changes", "deleted", "accounts", "categories"] {
+        assert!(archive.by_name(&format!("{}.parquet", name)).is_ok());
+    }
+}
+
+#[test]
+fn delta_format_parse() {
+    assert_eq!(DeltaFormat::parse("csv"), Some(DeltaFormat::Csv));
+    assert_eq!(
+        DeltaFormat::parse("arrow"),
+        Some(DeltaFormat::Columnar(ColumnarFormat::ArrowIpc))
+    );
+    assert_eq!(DeltaFormat::parse("pdf"), None);
+}
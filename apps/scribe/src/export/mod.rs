@@ -1,3 +1,5 @@
+pub mod columnar;
 pub mod csv;
+pub mod delta;
 pub mod pdf;
 pub mod xlsx;
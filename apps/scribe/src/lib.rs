@@ -4,7 +4,7 @@ use pyo3::types::PyDict;
 mod export;
 mod models;
 
-use models::{AccountRow, CategoryRow, TransactionRow};
+use models::{AccountRow, CategoryRow, ChangedRow, TombstoneRow, TransactionRow};
 
 /// Export transactions to CSV bytes.
 /// `rows` is a list of dicts with keys: date, description, amount, currency,
@@ -206,6 +206,140 @@ fn export_categories_csv(rows: Vec<Bound<'_, PyDict>>) -> PyResult<Vec<u8>> {
         .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))
 }
 
+/// Export a single scope ("transactions", "accounts" or "categories") as typed
+/// columnar bytes. `format` is "parquet" (zstd-compressed) or "arrow" (IPC file).
+/// Dates become UTC timestamps; names, types and currencies are dictionary-encoded.
+#[pyfunction]
+fn export_columnar(rows: Vec<Bound<'_, PyDict>>, scope: &str, format: &str) -> PyResult<Vec<u8>> {
+    let format = export::columnar::ColumnarFormat::parse(format).ok_or_else(|| {
+        pyo3::exceptions::PyValueError::new_err(format!("Unknown columnar format: {}", format))
+    })?;
+
+    let batch = match scope {
+        "transactions" => {
+            let typed_rows: Vec<TransactionRow> = rows
+                .iter()
+                .map(|d| TransactionRow::from_pydict(d))
+                .collect::<PyResult<Vec<_>>>()?;
+            export::columnar::transactions_batch(&typed_rows)
+        }
+        "accounts" => {
+            let typed_rows: Vec<AccountRow> = rows
+                .iter()
+                .map(|d| AccountRow::from_pydict(d))
+                .collect::<PyResult<Vec<_>>>()?;
+            export::columnar::accounts_batch(&typed_rows)
+        }
+        "categories" => {
+            let typed_rows: Vec<CategoryRow> = rows
+                .iter()
+                .map(|d| CategoryRow::from_pydict(d))
+                .collect::<PyResult<Vec<_>>>()?;
+            export::columnar::categories_batch(&typed_rows)
+        }
+        _ => {
+            return Err(pyo3::exceptions::PyValueError::new_err(format!(
+                "Unknown scope: {}",
+                scope
+            )))
+        }
+    }
+    .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))?;
+
+    export::columnar::write_batch(&batch, format)
+        .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))
+}
+
+/// Export full dump as a ZIP of Parquet or Arrow IPC files
+/// (transactions, accounts, categories).
+#[pyfunction]
+fn export_columnar_full_dump(
+    transactions: Vec<Bound<'_, PyDict>>,
+    accounts: Vec<Bound<'_, PyDict>>,
+    categories: Vec<Bound<'_, PyDict>>,
+    format: &str,
+) -> PyResult<Vec<u8>> {
+    let format = export::columnar::ColumnarFormat::parse(format).ok_or_else(|| {
+        pyo3::exceptions::PyValueError::new_err(format!("Unknown columnar format: {}", format))
+    })?;
+    let tx_rows: Vec<TransactionRow> = transactions
+        .iter()
+        .map(|d| TransactionRow::from_pydict(d))
+        .collect::<PyResult<Vec<_>>>()?;
+    let acc_rows: Vec<AccountRow> = accounts
+        .iter()
+        .map(|d| AccountRow::from_pydict(d))
+        .collect::<PyResult<Vec<_>>>()?;
+    let cat_rows: Vec<CategoryRow> = categories
+        .iter()
+        .map(|d| CategoryRow::from_pydict(d))
+        .collect::<PyResult<Vec<_>>>()?;
+
+    export::columnar::write_full_dump_zip(&tx_rows, &acc_rows, &cat_rows, format)
+        .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))
+}
+
+/// Compress CSV bytes produced by one of the `export_*csv` functions.
+/// `codec` is "gzip" or "zstd".
+#[pyfunction]
+fn compress_csv(data: &[u8], codec: &str) -> PyResult<Vec<u8>> {
+    let codec = export::csv::Codec::parse(codec).ok_or_else(|| {
+        pyo3::exceptions::PyValueError::new_err(format!("Unknown codec: {}", codec))
+    })?;
+    export::csv::compress(data, codec)
+        .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))
+}
+
+/// Export a delta (changes since a previous export) as a ZIP.
+/// `changes` are transaction dicts plus "id" and "updated_at"; `deleted` are
+/// dicts with "id" and "deleted_at". `accounts` / `categories` are included
+/// as snapshots when not None (full-dump deltas). `format` is "csv",
+/// "parquet" or "arrow".
+#[pyfunction]
+#[pyo3(signature = (changes, deleted, accounts, categories, format))]
+fn export_delta(
+    changes: Vec<Bound<'_, PyDict>>,
+    deleted: Vec<Bound<'_, PyDict>>,
+    accounts: Option<Vec<Bound<'_, PyDict>>>,
+    categories: Option<Vec<Bound<'_, PyDict>>>,
+    format: &str,
+) -> PyResult<Vec<u8>> {
+    let format = export::delta::DeltaFormat::parse(format).ok_or_else(|| {
+        pyo3::exceptions::PyValueError::new_err(format!("Unsupported delta format: {}", format))
+    })?;
+    let change_rows: Vec<ChangedRow> = changes
+        .iter()
+        .map(|d| ChangedRow::from_pydict(d))
+        .collect::<PyResult<Vec<_>>>()?;
+    let tombstone_rows: Vec<TombstoneRow> = deleted
+        .iter()
+        .map(|d| TombstoneRow::from_pydict(d))
+        .collect::<PyResult<Vec<_>>>()?;
+    let acc_rows: Option<Vec<AccountRow>> = accounts
+        .map(|rows| {
+            rows.iter()
+                .map(|d| AccountRow::from_pydict(d))
+                .collect::<PyResult<Vec<_>>>()
+        })
+        .transpose()?;
+    let cat_rows: Option<Vec<CategoryRow>> = categories
+        .map(|rows| {
+            rows.iter()
+                .map(|d| CategoryRow::from_pydict(d))
+                .collect::<PyResult<Vec<_>>>()
+        })
+        .transpose()?;
+
+    export::delta::write_delta_zip(
+        &change_rows,
+        &tombstone_rows,
+        acc_rows.as_deref(),
+        cat_rows.as_deref(),
+        format,
+    )
+    .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))
+}
+
 #[pymodule]
 fn scribe(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(export_csv, m)?)?;
@@ -214,5 +348,9 @@ fn scribe(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(export_csv_full_dump, m)?)?;
     m.add_function(wrap_pyfunction!(export_accounts_csv, m)?)?;
     m.add_function(wrap_pyfunction!(export_categories_csv, m)?)?;
+    m.add_function(wrap_pyfunction!(export_columnar, m)?)?;
+    m.add_function(wrap_pyfunction!(export_columnar_full_dump, m)?)?;
+    m.add_function(wrap_pyfunction!(compress_csv, m)?)?;
+    m.add_function(wrap_pyfunction!(export_delta, m)?)?;
     Ok(())
 }
@@ -21,6 +21,11 @@ pub const ACCOUNT_HEADERS: &[&str] = &["Name", "Type", "Balance"];
 
 pub const CATEGORY_HEADERS: &[&str] = &["Name", "Type", "Total", "Transaction Count"];
 
+// Delta exports prefix changed transactions with these, so they can be applied by id.
+pub const CHANGE_KEY_HEADERS: &[&str] = &["ID", "Updated At"];
+
+pub const TOMBSTONE_HEADERS: &[&str] = &["ID", "Deleted At"];
+
 #[derive(Debug, Clone, Serialize)]
 pub struct TransactionRow {
     pub date: String,
@@ -51,6 +56,19 @@ pub struct CategoryRow {
     pub count: i64,
 }
 
+#[derive(Debug, Clone, Serialize)]
+pub struct ChangedRow {
+    pub id: String,
+    pub updated_at: String,
+    pub row: TransactionRow,
+}
+
+#[derive(Debug, Clone, Serialize)]
+pub struct TombstoneRow {
+    pub id: String,
+    pub deleted_at: String,
+}
+
 impl TransactionRow {
     pub fn from_pydict(dict: &Bound<'_, PyDict>) -> PyResult<Self> {
         Ok(Self {
@@ -184,3 +202,44 @@ impl CategoryRow {
         ]
     }
 }
+
+impl ChangedRow {
+    pub fn from_pydict(dict: &Bound<'_, PyDict>) -> PyResult<Self> {
+        Ok(Self {
+            id: dict
+                .get_item("id")?
+                .map(|v| v.extract::<String>().unwrap_or_default())
+                .unwrap_or_default(),
+            updated_at: dict
+                .get_item("updated_at")?
+                .map(|v| v.extract::<String>().unwrap_or_default())
+                .unwrap_or_default(),
+            row: TransactionRow::from_pydict(dict)?,
+        })
+    }
+
+    pub fn to_csv_record(&self) -> Vec<String> {
+        let mut record = vec![self.id.clone(), self.updated_at.clone()];
+        record.extend(self.row.to_csv_record());
+        record
+    }
+}
+
+impl TombstoneRow {
+    pub fn from_pydict(dict: &Bound<'_, PyDict>) -> PyResult<Self> {
+        Ok(Self {
+            id: dict
+                .get_item("id")?
+                .map(|v| v.extract::<String>().unwrap_or_default())
+                .unwrap_or_default(),
+            deleted_at: dict
+                .get_item("deleted_at")?
+                .map(|v| v.extract::<String>().unwrap_or_default())
+                .unwrap_or_default(),
+        })
+    }
+
+    pub fn to_csv_record(&self) -> Vec<String> {
+        vec![self.id.clone(), self.deleted_at.clone()]
+    }
+}
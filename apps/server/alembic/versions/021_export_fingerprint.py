@@ -0,0 +1,41 @@
+"""Export fingerprints and transaction updated_at
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-19
+
+`transactions.updated_at` lets export fingerprints notice edits, not just
+inserts/deletes. `exports.fingerprint` identifies an export's request
+parameters + data version so identical requests can reuse the stored file.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "021"
+down_revision = "020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "transactions",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute("UPDATE transactions SET updated_at = inserted_at")
+
+    op.add_column("exports", sa.Column("fingerprint", sa.String(64), nullable=True))
+    op.create_index("ix_exports_user_fingerprint", "exports", ["user_id", "fingerprint"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_exports_user_fingerprint", table_name="exports")
+    op.drop_column("exports", "fingerprint")
+    op.drop_column("transactions", "updated_at")
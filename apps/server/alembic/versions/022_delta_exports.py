@@ -0,0 +1,56 @@
+"""Delta exports: transaction tombstones and export snapshots
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-19
+
+Delta exports include transactions changed since a previous export, found via
+`(user_id, updated_at)`, plus deletions recorded in `transaction_tombstones`.
+`exports.snapshot_at` is the data cut-off a later delta can start from.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "022"
+down_revision = "021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_transactions_user_updated_at", "transactions", ["user_id", "updated_at"])
+
+    op.create_table(
+        "transaction_tombstones",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Uuid(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_transaction_tombstones_user_deleted_at",
+        "transaction_tombstones",
+        ["user_id", "deleted_at"],
+    )
+
+    op.add_column("exports", sa.Column("snapshot_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("exports", sa.Column("delta_since", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("exports", "delta_since")
+    op.drop_column("exports", "snapshot_at")
+    op.drop_index("ix_transaction_tombstones_user_deleted_at", table_name="transaction_tombstones")
+    op.drop_table("transaction_tombstones")
+    op.drop_index("ix_transactions_user_updated_at", table_name="transactions")
@@ -0,0 +1,59 @@
+"""Recurring rules: next_due_utc for the scheduler
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-19
+
+`next_due_utc` is the UTC instant at which a rule's `next_due_at` begins in
+the owner's timezone. The scheduler sleeps until the earliest one and only
+loads rules whose instant has passed.
+"""
+
+from datetime import UTC, datetime, time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "023"
+down_revision = "022"
+branch_labels = None
+depends_on = None
+
+
+def _zone(name):
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "recurring_rules", sa.Column("next_due_utc", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index(
+        "ix_recurring_rules_active_next_due_utc",
+        "recurring_rules",
+        ["is_active", "next_due_utc"],
+    )
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT r.id, r.next_due_at, u.timezone FROM recurring_rules r "
+            "JOIN users u ON u.id = r.user_id"
+        )
+    ).all()
+    for rule_id, next_due_at, tz_name in rows:
+        due = datetime.combine(next_due_at, time(0), tzinfo=_zone(tz_name)).astimezone(UTC)
+        bind.execute(
+            sa.text("UPDATE recurring_rules SET next_due_utc = :due WHERE id = :id"),
+            {"due": due, "id": rule_id},
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recurring_rules_active_next_due_utc", table_name="recurring_rules")
+    op.drop_column("recurring_rules", "next_due_utc")
@@ -0,0 +1,68 @@
+"""Budgets: incrementally maintained progress table
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-19
+
+`budget_progress` holds each budget's spend per period and transaction
+currency, so listing budgets reads rows instead of aggregating the ledger.
+The backfill mirrors app.services.budget_progress.rebuild: periods are
+bucketed in the owner's timezone and custom budgets use their start_date.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "024"
+down_revision = "023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "budget_progress",
+        sa.Column(
+            "budget_id",
+            sa.Uuid(),
+            sa.ForeignKey("budgets.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("period_start", sa.Date(), primary_key=True),
+        sa.Column("currency", sa.String(3), primary_key=True),
+        sa.Column("spent", sa.Float(), nullable=False, server_default="0"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO budget_progress (budget_id, period_start, currency, spent)
+        SELECT b.id, p.period_start, t.currency, SUM(t.amount)
+        FROM budgets b
+        JOIN users u ON u.id = b.user_id
+        JOIN budget_categories bc ON bc.budget_id = b.id
+        JOIN transactions t ON t.category_id = bc.category_id AND t.user_id = b.user_id
+        JOIN categories c ON c.id = t.category_id AND c.type = b.budget_type
+        CROSS JOIN LATERAL (
+            SELECT (t.timestamp AT TIME ZONE COALESCE(u.timezone, 'UTC'))::date AS local_day
+        ) d
+        CROSS JOIN LATERAL (
+            SELECT CASE b.period_type
+                WHEN 'monthly' THEN date_trunc('month', d.local_day)::date
+                WHEN 'weekly' THEN date_trunc('week', d.local_day)::date
+                ELSE b.start_date
+            END AS period_start
+        ) p
+        WHERE NOT t.is_opening_balance
+          AND NOT t.is_transfer
+          AND (
+            b.period_type <> 'custom'
+            OR d.local_day BETWEEN b.start_date AND b.end_date
+          )
+        GROUP BY b.id, p.period_start, t.currency
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("budget_progress")
@@ -0,0 +1,34 @@
+"""Recompute budget_progress from the ledger.
+
+The table is kept current on every write, so this is only needed after
+changes made outside the app (manual SQL, restores) or to verify it:
+
+    uv run python -m app.commands.rebuild_budget_progress
+    uv run python -m app.commands.rebuild_budget_progress --user <user id>
+"""
+
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.services.budget_service import rebuild_progress
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--user", default=None, help="only rebuild this user's budgets")
+    parser.add_argument("--budget", action="append", default=None, help="budget id (repeatable)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_progress(db, user_id=args.user, budget_ids=args.budget)
+        db.commit()
+    finally:
+        db.close()
+    print(f"rebuilt {rebuilt} budget(s) in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
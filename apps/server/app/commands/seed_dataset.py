@@ -0,0 +1,608 @@
+"""Generate a deterministic synthetic dataset and load it into the database.
+
+Production-shaped data for benchmarks and EXPLAIN work: `--users` users, each
+with `--accounts` accounts, custom categories, merchants on realistic cadences
+(rent, salary, bills and subscriptions as recurring rules plus their past
+occurrences; groceries, coffee, fuel and the like as ad hoc spend), monthly
+transfers between accounts, trips abroad in other currencies, and budgets.
+
+    uv run python -m app.commands.seed_dataset --users 50 --months 24 --seed 7
+    uv run python -m app.commands.seed_dataset --users 200 --end 2025-12-31
+
+Each user is generated from its own `Random(f"{seed}:{index}")`, so ids, amounts
+and dates depend only on the seed, the user's index and the options - not on
+how many users are generated. Dates run back from `--end` (a fixed DEFAULT_END
+unless given), so a seed produces identical rows on any day. Users that already
+exist are skipped, so re-running a seed is a no-op. Transactions go through the
+set-based bulk loader (COPY on PostgreSQL), one commit per user.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as day_time
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    Account,
+    Budget,
+    BudgetCategory,
+    Category,
+    ExchangeRate,
+    RecurringRule,
+    Transaction,
+    User,
+)
+from app.services.account_service import SYSTEM_ACCOUNT_SPECS
+from app.services.bulk_loader import load_transactions
+from app.services.recurring_service import advance, due_instant
+
+# Mirrors the rows alembic 005 inserts, for databases built with create_all.
+SYSTEM_CATEGORIES = (
+    ("Income", "income", "income", "$", "#22c55e", "#4ade80"),
+    ("Savings", "savings", "savings", "S", "#10b981", "#34d399"),
+    ("Investment", "investment", "investment", "INV", "#a3e635", "#bef264"),
+    ("Housing", "housing", "expense", "H", "#6366f1", "#818cf8"),
+    ("Bills & Utilities", "bills-utilities", "expense", "B", "#eab308", "#facc15"),
+    ("Food & Dining", "food-dining", "expense", "F", "#f97316", "#fb923c"),
+    ("Transport", "transport", "expense", "T", "#0284c7", "#38bdf8"),
+    ("Travel", "travel", "expense", "TR", "#0ea5e9", "#7dd3fc"),
+    ("Health & Wellness", "health-wellness", "expense", "HW", "#ef4444", "#f87171"),
+    ("Lifestyle", "lifestyle", "expense", "L", "#a855f7", "#c084fc"),
+    ("Miscellaneous", "miscellaneous", "expense", "M", "#6b7280", "#9ca3af"),
+)
+
+# Approximate rates, only written for currencies missing from exchange_rates.
+RATES_TO_USD = {
+    "USD": 1.0,
+    "NZD": 1.68,
+    "AUD": 1.52,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "JPY": 151.0,
+    "BRL": 5.1,
+    "ARS": 880.0,
+    "COP": 3950.0,
+}
+HOME_CURRENCIES = ("NZD", "NZD", "AUD", "USD", "EUR", "GBP")
+TIMEZONES = {
+    "NZD": "Pacific/Auckland",
+    "AUD": "Australia/Sydney",
+    "USD": "America/New_York",
+    "EUR": "Europe/Berlin",
+    "GBP": "Europe/London",
+}
+
+EXTRA_ACCOUNTS = (
+    ("Credit Card", "checking"),
+    ("Emergency Fund", "savings"),
+    ("Brokerage", "investment"),
+    ("Joint Account", "checking"),
+    ("Holiday Fund", "savings"),
+    ("Retirement", "investment"),
+)
+
+
+class Bill(NamedTuple):
+    """A recurring payment: seeded as a recurring rule plus its past occurrences."""
+
+    name: str
+    category: str
+    interval_unit: str
+    interval_count: int
+    amount: tuple[float, float]  # in USD; converted to the user's currency
+    currency: str | None = None  # billed in this currency whatever the user's
+
+
+class Merchant(NamedTuple):
+    """Ad hoc spend: `per_week` visits on average, amounts drawn from `amount` (USD)."""
+
+    name: str
+    category: str
+    per_week: float
+    amount: tuple[float, float]
+
+
+BILLS = (
+    Bill("Power", "bills-utilities", "month", 1, (70, 220)),
+    Bill("Fibre Broadband", "bills-utilities", "month", 1, (55, 95)),
+    Bill("Mobile Plan", "bills-utilities", "month", 1, (20, 60)),
+    Bill("Water Rates", "bills-utilities", "month", 3, (90, 160)),
+    Bill("Netflix", "lifestyle", "month", 1, (15.49, 22.99), "USD"),
+    Bill("Spotify", "lifestyle", "month", 1, (10.99, 16.99), "USD"),
+    Bill("iCloud Storage", "lifestyle", "month", 1, (2.99, 9.99), "USD"),
+    Bill("Gym Membership", "health-wellness", "week", 2, (30, 55)),
+    Bill("Health Insurance", "health-wellness", "month", 1, (80, 240)),
+    Bill("Car Insurance", "transport", "year", 1, (600, 1400)),
+    Bill("Car Registration", "transport", "year", 1, (90, 180)),
+    Bill("Contents Insurance", "housing", "month", 1, (20, 45)),
+)
+
+MERCHANTS = (
+    Merchant("Countdown", "food-dining", 1.2, (35, 220)),
+    Merchant("Pak'nSave", "food-dining", 0.6, (40, 260)),
+    Merchant("Local Bakery", "food-dining", 0.8, (4, 18)),
+    Merchant("Cafe Mondo", "food-dining", 2.5, (4.5, 16)),
+    Merchant("Thai Orchid", "food-dining", 0.4, (28, 95)),
+    Merchant("Uber Eats", "food-dining", 0.5, (18, 60)),
+    Merchant("Z Energy", "transport", 0.7, (45, 120)),
+    Merchant("Uber", "transport", 0.4, (9, 45)),
+    Merchant("Metro Card Top-up", "transport", 0.5, (10, 40)),
+    Merchant("Chemist Warehouse", "health-wellness", 0.3, (8, 70)),
+    Merchant("Dentist", "health-wellness", 0.03, (90, 450)),
+    Merchant("Amazon", "lifestyle", 0.6, (12, 180)),
+    Merchant("Cinema", "lifestyle", 0.2, (15, 45)),
+    Merchant("Bunnings", "housing", 0.3, (10, 240)),
+    Merchant("Post Shop", "miscellaneous", 0.1, (3, 30)),
+)
+
+TRAVEL_MERCHANTS = (
+    Merchant("Hotel", "travel", 1.5, (90, 260)),
+    Merchant("Restaurant", "food-dining", 9.0, (8, 60)),
+    Merchant("Museum", "travel", 1.0, (10, 35)),
+    Merchant("Taxi", "transport", 3.0, (8, 40)),
+)
+
+# (name, type, merchants, visits per week, amount range in USD)
+CUSTOM_CATEGORIES = (
+    ("Coffee", "expense", ("Corner Roasters", "Espresso Bar"), 2.0, (4, 9)),
+    ("Pets", "expense", ("Vet Clinic", "Animates"), 0.3, (15, 180)),
+    ("Kids", "expense", ("School Shop", "Toyworld"), 0.4, (10, 120)),
+    ("Gifts", "expense", ("Gift Shop", "Florist"), 0.15, (20, 150)),
+    ("Hobbies", "expense", ("Bike Shop", "Craft Supplies"), 0.25, (12, 200)),
+    ("Education", "expense", ("Online Course", "Whitcoulls"), 0.1, (20, 300)),
+    ("Charity", "expense", ("Red Cross", "City Mission"), 0.1, (10, 60)),
+    ("Side Income", "income", ("Freelance Client", "Trade Me Sale"), 0.2, (50, 800)),
+)
+
+FIRST_NAMES = ("Aroha", "Ben", "Chloe", "Dev", "Ema", "Finn", "Grace", "Hemi", "Isla", "Jack")
+LAST_NAMES = ("Ngata", "Smith", "Patel", "Nguyen", "Brown", "Kaur", "Wilson", "Tane", "Lee")
+
+
+# Last day of generated history. Fixed so a seed gives the same rows on any day.
+DEFAULT_END = date(2026, 6, 30)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 20
+    accounts: int = 4
+    categories: int = 4
+    months: int = 12
+    budgets: int = 3
+    seed: int = 42
+    end: date = DEFAULT_END
+
+
+@dataclass
+class UserDataset:
+    """Insert rows for one user, keyed by column name."""
+
+    user: dict
+    accounts: list[dict]
+    categories: list[dict]
+    budgets: list[dict]
+    budget_categories: list[dict]
+    rules: list[dict]
+    transactions: list[dict]
+    # (from leg id, to leg id) for every transfer; linked after the load.
+    transfer_pairs: list[tuple[uuid.UUID, uuid.UUID]] = field(default_factory=list)
+
+
+@dataclass
+class SeedSummary:
+    users: int = 0
+    skipped: int = 0
+    accounts: int = 0
+    categories: int = 0
+    budgets: int = 0
+    rules: int = 0
+    transactions: int = 0
+    duplicates: int = 0
+    # Every user of the spec, skipped ones included, in index order.
+    user_ids: list[uuid.UUID] = field(default_factory=list)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _money(rng: random.Random, low: float, high: float, currency: str) -> float:
+    return round(rng.uniform(low, high) * RATES_TO_USD[currency], 2)
+
+
+def _at(day: date, zone: ZoneInfo, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, day_time(hour, minute), tzinfo=zone).astimezone(UTC)
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, 28))
+
+
+def generate_user(
+    spec: DatasetSpec, index: int, system_categories: dict[str, uuid.UUID], end: date
+) -> UserDataset:
+    """Rows for user `index` of `spec`; the same inputs always give the same rows."""
+    rng = random.Random(f"{spec.seed}:{index}")
+    currency = rng.choice(HOME_CURRENCIES)
+    tz_name = TIMEZONES[currency]
+    zone = ZoneInfo(tz_name)
+    start = _add_months(end, -spec.months)
+    user_id = _uuid(rng)
+
+    user = {
+        "id": user_id,
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "username": f"seed-{spec.seed}-{index}",
+        "preferred_currency": currency,
+        "timezone": tz_name,
+        "default_account_id": None,
+    }
+
+    specs = [(name, kind, True) for name, kind, _ in SYSTEM_ACCOUNT_SPECS]
+    specs += [(name, kind, False) for name, kind in EXTRA_ACCOUNTS]
+    accounts = [
+        {
+            "id": _uuid(rng),
+            "user_id": user_id,
+            "name": name,
+            "type": kind,
+            "is_system": is_system,
+            "display_order": order,
+        }
+        for order, (name, kind, is_system) in enumerate(specs[: max(spec.accounts, 1)])
+    ]
+    by_type = {}
+    for account in reversed(accounts):
+        by_type[account["type"]] = account["id"]
+    checking = accounts[0]["id"]
+    spending = [a["id"] for a in accounts if a["type"] == "checking"]
+
+    picked = rng.sample(CUSTOM_CATEGORIES, min(spec.categories, len(CUSTOM_CATEGORIES)))
+    categories, category_ids, custom_merchants = [], dict(system_categories), []
+    for order, (name, cat_type, names, per_week, amount) in enumerate(picked):
+        category_id = _uuid(rng)
+        category_ids[name] = category_id
+        categories.append(
+            {
+                "id": category_id,
+                "user_id": user_id,
+                "name": name,
+                "slug": name.lower().replace(" ", "-"),
+                "color_light": "#6B7280",
+                "color_dark": "#9CA3AF",
+                "type": cat_type,
+                "display_order": 20 + order,
+            }
+        )
+        custom_merchants += [Merchant(m, name, per_week / len(names), amount) for m in names]
+
+    transactions: list[dict] = []
+    transfer_pairs: list[tuple[uuid.UUID, uuid.UUID]] = []
+    rules: list[dict] = []
+
+    def add(day, amount, category, account, merchant, tx_currency=currency, **extra):
+        transactions.append(
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "account_id": account,
+                "category_id": category_ids[category] if category else None,
+                "amount": amount,
+                "currency": tx_currency,
+                "notes": merchant or "",
+                "merchant": merchant,
+                "timestamp": _at(day, zone, rng.randint(7, 21), rng.randint(0, 59)),
+                "hash": extra.pop("hash", None) or f"seed:{user_id}:{len(transactions)}",
+                **extra,
+            }
+        )
+        return transactions[-1]["id"]
+
+    def add_rule(kind, name, amount, category, unit, count, rule_currency=currency, to=None):
+        rule_id = _uuid(rng)
+        first = start + timedelta(days=rng.randrange(28 if unit != "week" else 7 * count))
+        occurrences, day = [], first
+        while day <= end:
+            occurrences.append(day)
+            day = advance(first, unit, count, day)
+        rules.append(
+            {
+                "id": rule_id,
+                "user_id": user_id,
+                "type": kind,
+                "name": name,
+                "amount": amount,
+                "currency": rule_currency,
+                "account_id": checking,
+                "to_account_id": to,
+                "category_id": category_ids[category] if category else None,
+                "merchant": None if kind == "transfer" else name,
+                "description": name,
+                "interval_unit": unit,
+                "interval_count": count,
+                "day_of_month": first.day if unit == "month" else None,
+                "day_of_week": first.weekday() if unit == "week" else None,
+                "start_date": first,
+                "end_date": None,
+                "next_due_at": day,
+                "next_due_utc": due_instant(day, zone),
+                "last_materialized_at": occurrences[-1] if occurrences else None,
+                "is_active": True,
+            }
+        )
+        # Same hashes the materializer writes, so the scheduler sees them as done.
+        for occurrence in occurrences:
+            if kind != "transfer":
+                add(
+                    occurrence,
+                    amount,
+                    category,
+                    checking,
+                    name,
+                    rule_currency,
+                    hash=f"rec:{rule_id}:{occurrence.isoformat()}",
+                    recurring_rule_id=rule_id,
+                )
+                continue
+            legs = [
+                add(
+                    occurrence,
+                    amount,
+                    None,
+                    account,
+                    None,
+                    notes=name,
+                    is_transfer=True,
+                    transfer_direction=direction,
+                    hash=f"rec:{rule_id}:{occurrence.isoformat()}:{direction}",
+                    recurring_rule_id=rule_id,
+                )
+                for account, direction in ((checking, "from"), (to, "to"))
+            ]
+            transfer_pairs.append((legs[0], legs[1]))
+
+    salary = _money(rng, 1800, 4200, currency)
+    if rng.random() < 0.5:
+        add_rule("income", "Salary", salary, "income", "week", 2)
+    else:
+        add_rule("income", "Salary", round(salary * 2.1, 2), "income", "month", 1)
+    add_rule("expense", "Rent", _money(rng, 380, 750, currency), "housing", "week", 1)
+    for bill in rng.sample(BILLS, rng.randint(4, 8)):
+        bill_currency = bill.currency or currency
+        amount = _money(rng, *bill.amount, bill_currency)
+        add_rule(
+            "expense",
+            bill.name,
+            amount,
+            bill.category,
+            bill.interval_unit,
+            bill.interval_count,
+            bill_currency,
+        )
+    for target in ("savings", "investment"):
+        if target in by_type:
+            amount = round(_money(rng, 100, 600, currency), -1)
+            add_rule("transfer", f"To {target}", amount, None, "month", 1, to=by_type[target])
+
+    # Trips abroad: ad hoc spend in the local currency, flights in the home one.
+    trips = []
+    for _ in range(max(1, spec.months // 6)):
+        away = rng.choice([c for c in RATES_TO_USD if c != currency])
+        leave = start + timedelta(days=rng.randrange(max((end - start).days - 14, 1)))
+        trips.append((leave, leave + timedelta(days=rng.randint(4, 12)), away))
+        add(
+            leave - timedelta(days=rng.randint(20, 90)),
+            _money(rng, 400, 1800, currency),
+            "travel",
+            rng.choice(spending),
+            "Air New Zealand",
+        )
+
+    everyday = MERCHANTS + tuple(custom_merchants)
+    day = start
+    while day <= end:
+        trip = next((t for t in trips if t[0] <= day <= t[1]), None)
+        tx_currency = trip[2] if trip else currency
+        for merchant in TRAVEL_MERCHANTS if trip else everyday:
+            visits = merchant.per_week / 7
+            while rng.random() < visits:
+                account = checking if merchant.category == "Side Income" else rng.choice(spending)
+                add(
+                    day,
+                    _money(rng, *merchant.amount, tx_currency),
+                    merchant.category,
+                    account,
+                    merchant.name,
+                    tx_currency,
+                )
+                visits -= 1
+        day += timedelta(days=1)
+
+    budgets, budget_categories = [], []
+    templates = [
+        ("Groceries & dining", "monthly", ["food-dining"], (500, 1100)),
+        ("Fun money", "weekly", ["lifestyle", "Coffee", "Hobbies"], (60, 180)),
+        ("Getting around", "monthly", ["transport"], (150, 400)),
+        ("Health", "monthly", ["health-wellness"], (80, 250)),
+        ("Holiday", "custom", ["travel"], (1500, 4000)),
+    ]
+    for name, period, names, amount in templates[: spec.budgets]:
+        budget_id = _uuid(rng)
+        leave, back, _ = trips[0]
+        budgets.append(
+            {
+                "id": budget_id,
+                "user_id": user_id,
+                "name": name,
+                "period_type": period,
+                "amount": round(_money(rng, *amount, currency), -1),
+                "currency": currency,
+                "budget_type": "expense",
+                "start_date": leave - timedelta(days=7) if period == "custom" else None,
+                "end_date": back if period == "custom" else None,
+                "is_active": True,
+            }
+        )
+        budget_categories += [
+            {"budget_id": budget_id, "category_id": category_ids[n]}
+            for n in names
+            if n in category_ids
+        ]
+
+    return UserDataset(
+        user=user,
+        accounts=accounts,
+        categories=categories,
+        budgets=budgets,
+        budget_categories=budget_categories,
+        rules=rules,
+        transactions=transactions,
+        transfer_pairs=transfer_pairs,
+    )
+
+
+def ensure_reference_data(db: Session) -> dict[str, uuid.UUID]:
+    """Add missing system categories and exchange rates; return system ids by slug."""
+    existing = dict(db.query(Category.slug, Category.id).filter(Category.user_id.is_(None)))
+    missing = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": None,
+            "name": name,
+            "slug": slug,
+            "type": cat_type,
+            "alias": alias,
+            "color_light": light,
+            "color_dark": dark,
+            "is_system": True,
+            "display_order": order,
+        }
+        for order, (name, slug, cat_type, alias, light, dark) in enumerate(SYSTEM_CATEGORIES)
+        if slug not in existing
+    ]
+    if missing:
+        db.execute(insert(Category), missing)
+        existing.update({row["slug"]: row["id"] for row in missing})
+
+    have = {code for (code,) in db.query(ExchangeRate.currency_code)}
+    now = datetime.now(UTC)
+    rates = [
+        {"currency_code": code, "rate_to_usd": rate, "updated_at": now}
+        for code, rate in RATES_TO_USD.items()
+        if code not in have
+    ]
+    if rates:
+        db.execute(insert(ExchangeRate), rates)
+    db.commit()
+    return existing
+
+
+def seed(db: Session, spec: DatasetSpec) -> SeedSummary:
+    """Generate and load every user of `spec`, committing per user."""
+    system_categories = ensure_reference_data(db)
+    summary = SeedSummary()
+    for index in range(spec.users):
+        data = generate_user(spec, index, system_categories, spec.end)
+        user_id = data.user["id"]
+        summary.user_ids.append(user_id)
+        if db.query(User.id).filter(User.id == user_id).first():
+            summary.skipped += 1
+            continue
+
+        db.execute(insert(User), [data.user])
+        db.execute(insert(Account), data.accounts)
+        db.execute(
+            update(User).where(User.id == user_id).values(default_account_id=data.accounts[0]["id"])
+        )
+        for model, rows in (
+            (Category, data.categories),
+            (Budget, data.budgets),
+            (BudgetCategory, data.budget_categories),
+            (RecurringRule, data.rules),
+        ):
+            if rows:
+                db.execute(insert(model), rows)
+
+        # Budgets exist before the load, so their progress is kept by the loader.
+        result = load_transactions(db, data.transactions)
+        inserted = {row["id"] for row in result.inserted}
+        links = []
+        for from_id, to_id in data.transfer_pairs:
+            if from_id in inserted and to_id in inserted:
+                links.append({"id": from_id, "linked_transaction_id": to_id})
+                links.append({"id": to_id, "linked_transaction_id": from_id})
+        if links:
+            db.execute(update(Transaction), links)
+        db.commit()
+
+        summary.users += 1
+        summary.accounts += len(data.accounts)
+        summary.categories += len(data.categories)
+        summary.budgets += len(data.budgets)
+        summary.rules += len(data.rules)
+        summary.transactions += len(result.inserted)
+        summary.duplicates += result.duplicates
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--users", type=int, default=DatasetSpec.users)
+    parser.add_argument("--accounts", type=int, default=DatasetSpec.accounts, help="per user")
+    parser.add_argument("--categories", type=int, default=DatasetSpec.categories, help="per user")
+    parser.add_argument("--months", type=int, default=DatasetSpec.months, help="history length")
+    parser.add_argument("--budgets", type=int, default=DatasetSpec.budgets, help="per user")
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    parser.add_argument(
+        "--end", type=date.fromisoformat, default=DatasetSpec.end, help="last day (ISO)"
+    )
+    parser.add_argument(
+        "--create-tables",
+        action="store_true",
+        help="create missing tables first (scratch SQLite; use alembic for PostgreSQL)",
+    )
+    args = parser.parse_args()
+
+    from app.database import SessionLocal, engine
+    from app.db.models import Base
+
+    if args.create_tables:
+        Base.metadata.create_all(engine)
+    spec = DatasetSpec(
+        users=args.users,
+        accounts=args.accounts,
+        categories=args.categories,
+        months=args.months,
+        budgets=args.budgets,
+        seed=args.seed,
+        end=args.end,
+    )
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        summary = seed(db, spec)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"seeded {summary.users} user(s) ({summary.skipped} already present): "
+        f"{summary.accounts} accounts, {summary.categories} categories, "
+        f"{summary.budgets} budgets, {summary.rules} recurring rules, "
+        f"{summary.transactions} transactions in {elapsed:.2f}s "
+        f"({summary.transactions / elapsed if elapsed else 0:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
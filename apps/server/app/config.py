@@ -2,6 +2,9 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings
 
+# Environments that get dev-only routes (email preview, open metrics) and defaults.
+DEV_ENVS = {"local", "development", "dev", "test"}
+
 
 class Settings(BaseSettings):
     DATABASE_URL: str
@@ -10,6 +13,10 @@ class Settings(BaseSettings):
     API_PORT: int = 5784
     ENV: str = "production"
 
+    # SQLAlchemy connection pool per worker process (PostgreSQL only)
+    DB_POOL_SIZE: int = 15
+    DB_MAX_OVERFLOW: int = 25
+
     # OAuth (Google)
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
@@ -32,12 +39,53 @@ class Settings(BaseSettings):
     AWS_REGION: str = "ap-southeast-2"
     S3_BUCKET_NAME: str = "cofr-data"
 
+    # Export worker pool (separate from the default executor)
+    EXPORT_WORKERS: int = 2
+    EXPORT_QUEUE_SIZE: int = 16
+    EXPORT_MAX_PER_USER: int = 2
+    # Delta exports restart this far before the previous snapshot, to catch writes
+    # that committed after it; keep it above the longest write transaction
+    EXPORT_DELTA_OVERLAP_SECONDS: int = 300
+
+    # Statement import pool and limits
+    IMPORT_WORKERS: int = 1
+    IMPORT_QUEUE_SIZE: int = 8
+    IMPORT_MAX_PER_USER: int = 1
+    IMPORT_MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024
+    IMPORT_CHUNK_ROWS: int = 1000
+    RESTORE_MAX_UPLOAD_BYTES: int = 500 * 1024 * 1024
+    RESTORE_CHUNK_ROWS: int = 10000
+
+    # Server-Timing response headers (db/app time per request); unset = dev environments only
+    SERVER_TIMING: bool | None = None
+
+    # Request access log: fraction of requests logged (server errors and likely N+1s
+    # always are) and how many request body bytes to include (0 = none)
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_REQUEST_BODY_BYTES: int = 0
+
+    # Bearer token required by GET /internal/metrics (empty = dev environments only)
+    METRICS_TOKEN: str = ""
+
+    # Max items per POST /expenses/bulk request
+    EXPENSE_BULK_MAX_ITEMS: int = 500
+
+    # Background jobs. Leader-only jobs run in one worker, elected via advisory locks.
+    RATES_REFRESH_INTERVAL_SECONDS: int = 86400
+    EXPORT_CLEANUP_INTERVAL_SECONDS: int = 300
+    BACKGROUND_JITTER_SECONDS: float = 30.0
+    BACKGROUND_LEADER_POLL_SECONDS: float = 60.0
+
     # URLs
     API_URL: str = "http://localhost:5784"
     FRONTEND_URL: str = "http://localhost:5173"
 
     model_config = {"env_file": ".env", "case_sensitive": True, "extra": "ignore"}
 
+    @property
+    def is_dev(self) -> bool:
+        return self.ENV.lower() in DEV_ENVS
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -7,8 +7,8 @@ _kwargs = {"echo": False, "pool_pre_ping": True}
 
 if not settings.DATABASE_URL.startswith("sqlite"):
     _kwargs.update(
-        pool_size=15,
-        max_overflow=25,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
         pool_recycle=1800,
         pool_timeout=30,
     )
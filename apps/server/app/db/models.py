@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     SmallInteger,
     String,
@@ -137,6 +138,8 @@ class Account(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # Delta exports scan a user's rows changed since a point in time.
+    __table_args__ = (Index("ix_transactions_user_updated_at", "user_id", "updated_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(SaUuid, primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(SaUuid, ForeignKey("users.id"), index=True)
@@ -156,6 +159,9 @@ class Transaction(Base):
             DateTime(timezone=True), server_default=func.now(), nullable=False
         )
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
     hash: Mapped[str | None] = mapped_column(String, unique=True, index=True, nullable=True)
     is_opening_balance: Mapped[bool] = mapped_column(
         Boolean, default=False, server_default=text("false")
@@ -178,8 +184,23 @@ class Transaction(Base):
     recurring_rule: Mapped["RecurringRule | None"] = relationship(back_populates="transactions")
 
 
+class TransactionTombstone(Base):
+    """A deleted transaction, kept so delta exports can report the deletion."""
+
+    __tablename__ = "transaction_tombstones"
+    __table_args__ = (Index("ix_transaction_tombstones_user_deleted_at", "user_id", "deleted_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(SaUuid, primary_key=True)  # the deleted transaction's id
+    user_id: Mapped[uuid.UUID] = mapped_column(SaUuid, ForeignKey("users.id", ondelete="CASCADE"))
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class RecurringRule(Base):
     __tablename__ = "recurring_rules"
+    # The scheduler asks "which active rules are due by now?" and "when is the next one?".
+    __table_args__ = (Index("ix_recurring_rules_active_next_due_utc", "is_active", "next_due_utc"),)
 
     id: Mapped[uuid.UUID] = mapped_column(SaUuid, primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -207,6 +228,8 @@ class RecurringRule(Base):
     start_date: Mapped[date] = mapped_column(Date)
     end_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     next_due_at: Mapped[date] = mapped_column(Date)
+    # Start of next_due_at in the owner's timezone, as a UTC instant.
+    next_due_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     last_materialized_at: Mapped[date | None] = mapped_column(Date, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default=text("true"))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -263,6 +286,11 @@ class Export(Base):
     scope: Mapped[str] = mapped_column(String(20))
     file_size: Mapped[int] = mapped_column(Integer)
     s3_key: Mapped[str] = mapped_column(String(255))
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Data cut-off of this export; a later delta export can start from it.
+    snapshot_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Set for delta exports: changes since this instant are included.
+    delta_since: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
@@ -331,6 +359,9 @@ class Budget(Base):
     categories: Mapped[list["BudgetCategory"]] = relationship(
         back_populates="budget", cascade="all, delete-orphan"
     )
+    progress: Mapped[list["BudgetProgress"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class BudgetCategory(Base):
@@ -346,6 +377,24 @@ class BudgetCategory(Base):
     budget: Mapped["Budget"] = relationship(back_populates="categories")
 
 
+class BudgetProgress(Base):
+    """Running spend of one budget in one period, per transaction currency.
+
+    Maintained incrementally by app.services.budget_progress on every write
+    that touches a counted transaction. Weekly/monthly budgets have one row
+    per period start (local to the owner); custom budgets use their start_date.
+    """
+
+    __tablename__ = "budget_progress"
+
+    budget_id: Mapped[uuid.UUID] = mapped_column(
+        SaUuid, ForeignKey("budgets.id", ondelete="CASCADE"), primary_key=True
+    )
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    spent: Mapped[float] = mapped_column(Float, default=0.0)
+
+
 class EmailSuppression(Base):
     __tablename__ = "email_suppressions"
 
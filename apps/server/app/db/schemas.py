@@ -2,6 +2,8 @@ from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.config import settings
+
 # ── Category Schemas ──
 
 
@@ -214,6 +216,31 @@ class RecurringResponse(BaseModel):
     is_converted: bool = False
 
 
+class UpcomingOccurrence(BaseModel):
+    rule_id: str
+    due_date: date
+    type: str
+    name: str
+    amount: float  # in the response currency
+    original_amount: float
+    original_currency: str
+    account_name: str
+    to_account_name: str | None = None
+    category_name: str | None = None
+    category_color_light: str | None = None
+    category_color_dark: str | None = None
+
+
+class UpcomingRecurringResponse(BaseModel):
+    occurrences: list[UpcomingOccurrence]
+    start_date: date
+    end_date: date
+    # True when the window held more occurrences than the requested limit.
+    truncated: bool = False
+    currency: str = Field(default="USD", pattern="^[A-Z]{3}$")
+    is_converted: bool = False
+
+
 class DashboardBootstrapResponse(BaseModel):
     preferred_currency: str = Field(default="USD", pattern="^[A-Z]{3}$")
     expenses: ExpensesResponse
@@ -225,6 +252,8 @@ class DashboardBootstrapResponse(BaseModel):
     weekday_heatmap: WeekdayHeatmapResponse
     account_trend: AccountTrendResponse
     recurring: RecurringResponse
+    upcoming_recurring: UpcomingRecurringResponse
+    budget_history: list["BudgetHistoryResponse"] = Field(default_factory=list)
 
 
 class ExpenseCreateRequest(BaseModel):
@@ -249,6 +278,25 @@ class ExpenseUpdateRequest(BaseModel):
     account_id: str | None = None
 
 
+class ExpenseBulkCreateRequest(BaseModel):
+    items: list[ExpenseCreateRequest] = Field(
+        min_length=1, max_length=settings.EXPENSE_BULK_MAX_ITEMS
+    )
+
+
+class ExpenseBulkItemResult(BaseModel):
+    index: int
+    status: str  # created | error
+    expense: ExpenseSchema | None = None
+    error: str | None = None
+
+
+class ExpenseBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[ExpenseBulkItemResult]
+
+
 class UserProfileResponse(BaseModel):
     email_verified: bool
 
@@ -353,7 +401,7 @@ class RecurringRuleDeleteResponse(BaseModel):
 
 
 class ExportCreateRequest(BaseModel):
-    format: str = Field(pattern=r"^(csv|xlsx|pdf)$")
+    format: str = Field(pattern=r"^(csv|csv_gz|csv_zst|xlsx|pdf|parquet|arrow)$")
     scope: str = Field(pattern=r"^(transactions|accounts|categories|full_dump)$")
     name: str | None = Field(default=None, max_length=120)
     start_date: datetime | None = None
@@ -361,6 +409,14 @@ class ExportCreateRequest(BaseModel):
     account_id: str | None = None
     category_id: str | None = None
     currency: str | None = Field(default=None, pattern="^[A-Z]{3}$")
+    # Delta export: only transactions changed (and deleted) since a previous
+    # export's snapshot or an explicit instant. Use one or the other.
+    since_export_id: str | None = None
+    since: datetime | None = None
+
+    @property
+    def is_delta(self) -> bool:
+        return self.since_export_id is not None or self.since is not None
 
 
 class ExportJobResponse(BaseModel):
@@ -371,6 +427,36 @@ class ExportJobResponse(BaseModel):
     created_at: datetime
     error: str | None = None
     export_id: str | None = None
+    reused: bool = False
+
+
+class ExportQueueStats(BaseModel):
+    workers: int
+    running: int
+    queue_depth: int
+    max_queue: int
+    max_per_user: int
+    user_in_flight: int
+    avg_wait_seconds: float
+    max_wait_seconds: float
+    avg_run_seconds: float
+
+
+class ImportJobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    format: str
+    filename: str
+    created_at: datetime
+    completed_at: datetime | None = None
+    error: str | None = None
+    rows_read: int = 0
+    rows_inserted: int = 0
+    rows_duplicate: int = 0
+    rows_failed: int = 0
+    errors: list[str] = Field(default_factory=list)
+    resumable: bool = False
 
 
 class ExportRecordSchema(BaseModel):
@@ -380,6 +466,8 @@ class ExportRecordSchema(BaseModel):
     name: str
     format: str
     scope: str
+    extension: str
+    delta_since: datetime | None = None
     file_size: int
     created_at: datetime
     expires_at: datetime
@@ -1,5 +1,5 @@
-import asyncio
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as _pkg_version
 
@@ -10,7 +10,9 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from app.config import settings
 from app.database import engine
-from app.middleware import log_requests
+from app.metrics import install_pool_metrics
+from app.middleware import RequestLoggingMiddleware
+from app.query_stats import install_query_tracking
 from app.routers import (
     account,
     accounts,
@@ -21,20 +23,23 @@ from app.routers import (
     exchange_rates,
     expenses,
     exports,
+    imports,
+    internal,
     local_auth,
     oauth,
     recurring,
     transfers,
     webhooks,
 )
+from app.services.background_tasks import BackgroundCoordinator, PeriodicTask
+from app.services.export_pool import export_pool
+from app.services.import_service import import_pool
 
 try:
     _APP_VERSION = _pkg_version("cofr-server")
 except PackageNotFoundError:
     _APP_VERSION = "dev"
 
-_DEV_EMAIL_ENVS = {"local", "development", "dev", "test"}
-
 
 def _traces_sampler(sampling_context: dict) -> float:
     if sampling_context.get("asgi_scope", {}).get("path") == "/health":
@@ -55,64 +60,99 @@ if settings.ENV == "production" and settings.SENTRY_DSN:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
-    from app.database import SessionLocal
-    from app.services.exchange_rates import refresh_rates_in_db
+    from app.services.recurring_service import schedule_wake_event
 
-    # Initial refresh on startup
-    refresh_rates_in_db(SessionLocal())
-    # Startup catch-up for any recurring rules missed while the server was down.
-    from app.services.recurring_service import materialize_all_due
-
-    with SessionLocal() as session:
-        materialize_all_due(session)
-    # Schedule daily refresh
-    task = asyncio.create_task(_daily_rates_refresh_loop())
-    cleanup_task = asyncio.create_task(_export_cleanup_loop())
-    recurring_task = asyncio.create_task(_recurring_materialize_loop())
+    # Startup warmup (rates refresh, recurring catch-up) is the first pass of
+    # each job: it runs in the background so /health and traffic are served
+    # immediately, and with several workers only the elected leader does it.
+    coordinator = BackgroundCoordinator(
+        engine, leader_poll_seconds=settings.BACKGROUND_LEADER_POLL_SECONDS
+    )
+    coordinator.add(
+        PeriodicTask(
+            name="rates_refresh",
+            fn=_refresh_rates,
+            interval=settings.RATES_REFRESH_INTERVAL_SECONDS,
+            jitter=settings.BACKGROUND_JITTER_SECONDS,
+        )
+    )
+    coordinator.add(
+        PeriodicTask(
+            name="recurring_materialize",
+            fn=_materialize_recurring,
+            interval=_RECURRING_MAX_SLEEP_SECONDS,
+            jitter=settings.BACKGROUND_JITTER_SECONDS,
+            wake=schedule_wake_event(),
+        )
+    )
+    # Export and import jobs live in process memory, so every worker cleans up its own.
+    coordinator.add(
+        PeriodicTask(
+            name="export_cleanup",
+            fn=_cleanup_exports,
+            interval=settings.EXPORT_CLEANUP_INTERVAL_SECONDS,
+            initial_delay=settings.EXPORT_CLEANUP_INTERVAL_SECONDS,
+            leader_only=False,
+        )
+    )
+    coordinator.start()
+    app.state.background = coordinator
     yield
-    task.cancel()
-    cleanup_task.cancel()
-    recurring_task.cancel()
+    await coordinator.stop()
+    export_pool.shutdown()
+    import_pool.shutdown()
     engine.dispose()
 
 
-async def _daily_rates_refresh_loop():
-    """Refresh exchange rates every 24 hours."""
+# After a failed fetch (provider down, no network at boot) retry well before
+# the next daily refresh; the DB keeps serving the last known rates meanwhile.
+_RATES_RETRY_SECONDS = 300
+
+
+def _refresh_rates() -> float | None:
     from app.database import SessionLocal
     from app.services.exchange_rates import refresh_rates_in_db
 
-    while True:
-        await asyncio.sleep(86400)
-        refresh_rates_in_db(SessionLocal())
+    with SessionLocal() as session:
+        return None if refresh_rates_in_db(session) else _RATES_RETRY_SECONDS
+
+
+def _cleanup_exports() -> None:
+    from app.services import export_service, import_service
 
+    export_service.cleanup_expired_jobs()
+    import_service.cleanup_expired_jobs()
 
-async def _export_cleanup_loop():
-    """Clean up expired export jobs every 5 minutes."""
-    from app.services.export_service import cleanup_expired_jobs
 
-    while True:
-        await asyncio.sleep(300)
-        cleanup_expired_jobs()
+# Bounds on how long the recurring scheduler sleeps between passes. The floor
+# stops a rule that keeps failing from spinning the loop; the ceiling re-reads
+# the schedule periodically in case a write happened on another worker.
+_RECURRING_MIN_SLEEP_SECONDS = 30
+_RECURRING_MAX_SLEEP_SECONDS = 3600
 
 
-async def _recurring_materialize_loop():
-    """Materialize due recurring rules every hour.
+def _seconds_until(instant: datetime | None) -> float:
+    if instant is None:
+        return _RECURRING_MAX_SLEEP_SECONDS
+    delay = (instant - datetime.now(UTC)).total_seconds()
+    return min(max(delay, _RECURRING_MIN_SLEEP_SECONDS), _RECURRING_MAX_SLEEP_SECONDS)
 
-    Hourly polling (not daily) is needed because rules are due in each user's
-    local timezone. A user crossing midnight in Auckland is several hours
-    before a user in London. The query is cheap and indexed.
+
+def _materialize_recurring() -> float:
+    """Materialize recurring rules whose due instant has passed.
+
+    Rules are due at local midnight in each owner's timezone, stored as
+    `next_due_utc`. Returns the delay until the earliest remaining one, which
+    the coordinator uses as the next sleep. Creating, editing or resuming a
+    rule (or changing timezone) wakes the job so it can re-plan.
     """
     from app.database import SessionLocal
-    from app.services.recurring_service import materialize_all_due
+    from app.services.recurring_service import materialize_all_due, next_due_instant
 
-    while True:
-        await asyncio.sleep(3600)
-        try:
-            with SessionLocal() as session:
-                materialize_all_due(session)
-        except Exception:
-            # Keep the loop alive even if one pass fails; Sentry will capture.
-            pass
+    with SessionLocal() as session:
+        # Startup catch-up also fills in rules that have no next_due_utc yet.
+        materialize_all_due(session)
+        return _seconds_until(next_due_instant(session))
 
 
 app = FastAPI(
@@ -136,8 +176,10 @@ app.add_middleware(
     expose_headers=["baggage", "sentry-trace"],
 )
 
-# Add request logging for debugging
-app.middleware("http")(log_requests)
+# Request logging, query counting and metrics
+install_query_tracking()
+install_pool_metrics(engine)
+app.add_middleware(RequestLoggingMiddleware)
 
 
 @app.get("/health")
@@ -156,7 +198,9 @@ app.include_router(exchange_rates.router)
 app.include_router(local_auth.router)
 app.include_router(webhooks.router)
 app.include_router(exports.router)
+app.include_router(imports.router)
 app.include_router(dashboard.router)
 app.include_router(budgets.router)
-if settings.ENV.lower() in _DEV_EMAIL_ENVS:
+app.include_router(internal.router)
+if settings.is_dev:
     app.include_router(dev_email.router)
@@ -0,0 +1,242 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Event metrics (request latency, in-flight requests, DB pool checkouts, cache
+lookups, job and background-loop durations) are recorded here as they happen.
+State that already lives elsewhere (pool occupancy, queue depths, rate-limiter
+tables) is read at scrape time by the `/internal/metrics` router. Values are
+per worker process: with several uvicorn workers each scrape reports the
+worker that served it.
+"""
+
+import math
+import threading
+from collections.abc import Iterable, Iterator
+from weakref import WeakSet
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Request latency buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Export/import jobs and background passes run for seconds to minutes.
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values, strict=True)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> Iterator[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+        """Yield (suffix, label names, label values, value) for every series."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            yield "", self.labels, values, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per series: non-cumulative bucket counts, then sum.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, (list(c), t[0])) for k, (c, t) in self._series.items())
+        bucket_names = self.labels + ("le",)
+        for values, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts, strict=True):
+                cumulative += n
+                yield "_bucket", bucket_names, values + (_format_value(bound),), cumulative
+            yield "_sum", self.labels, values, total
+            yield "_count", self.labels, values, cumulative
+
+
+# ── Event metrics ────────────────────────────────────────────────────────
+
+REQUEST_DURATION = Histogram(
+    "cofr_http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge("cofr_http_requests_in_flight", "Requests currently being served.")
+
+DB_POOL_CHECKOUTS = Counter(
+    "cofr_db_pool_checkouts_total", "Connections checked out of the SQLAlchemy pool."
+)
+DB_POOL_OVERFLOW_CHECKOUTS = Counter(
+    "cofr_db_pool_overflow_checkouts_total",
+    "Checkouts served by an overflow connection (pool_size exceeded).",
+)
+DB_POOL_EXHAUSTED_CHECKOUTS = Counter(
+    "cofr_db_pool_exhausted_checkouts_total",
+    "Checkouts that took the last connection; the next checkout waits up to pool_timeout.",
+)
+DB_POOL_CONNECTS = Counter("cofr_db_pool_connects_total", "New DBAPI connections opened.")
+DB_POOL_INVALIDATIONS = Counter(
+    "cofr_db_pool_invalidations_total", "Pooled connections invalidated (e.g. dropped by the DB)."
+)
+
+CACHE_LOOKUPS = Counter(
+    "cofr_cache_lookups_total", "In-process cache lookups by result.", ("cache", "result")
+)
+
+JOB_WAIT = Histogram(
+    "cofr_job_wait_seconds",
+    "Time jobs spent queued before a worker picked them up.",
+    ("pool",),
+    buckets=JOB_BUCKETS,
+)
+JOB_DURATION = Histogram(
+    "cofr_job_duration_seconds", "Export/import job run time.", ("pool",), buckets=JOB_BUCKETS
+)
+BACKGROUND_RUN_DURATION = Histogram(
+    "cofr_background_run_duration_seconds",
+    "Duration of background task passes.",
+    ("task",),
+    buckets=JOB_BUCKETS,
+)
+
+REGISTRY: list[Metric] = [
+    REQUEST_DURATION,
+    REQUESTS_IN_FLIGHT,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_OVERFLOW_CHECKOUTS,
+    DB_POOL_EXHAUSTED_CHECKOUTS,
+    DB_POOL_CONNECTS,
+    DB_POOL_INVALIDATIONS,
+    CACHE_LOOKUPS,
+    JOB_WAIT,
+    JOB_DURATION,
+    BACKGROUND_RUN_DURATION,
+]
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render(metrics: Iterable[Metric]) -> str:
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+_instrumented_engines: WeakSet[Engine] = WeakSet()
+
+
+def install_pool_metrics(engine: Engine) -> None:
+    """Count checkouts, new connections and pool pressure for `engine`."""
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        pool = engine.pool
+        # SQLite's StaticPool/SingletonThreadPool have no size limits to report.
+        if not hasattr(pool, "overflow"):
+            return
+        checked_out = pool.checkedout()
+        if checked_out > pool.size():
+            DB_POOL_OVERFLOW_CHECKOUTS.inc()
+        # max_overflow=-1 means unbounded; such a pool never makes checkouts wait.
+        max_overflow = pool._max_overflow
+        if max_overflow >= 0 and checked_out >= pool.size() + max_overflow:
+            DB_POOL_EXHAUSTED_CHECKOUTS.inc()
+
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTS.inc()
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.inc()
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "invalidate", on_invalidate)
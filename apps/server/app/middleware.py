@@ -1,36 +1,110 @@
 """Request logging middleware"""
 
+import json
 import logging
+import random
 import time
 
-from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import REQUEST_DURATION, REQUESTS_IN_FLIGHT
+from app.query_stats import track_queries
 
 logger = logging.getLogger(__name__)
 
 
-async def log_requests(request: Request, call_next):
-    """Log all requests with timing"""
-    start_time = time.time()
+def server_timing_enabled() -> bool:
+    if settings.SERVER_TIMING is not None:
+        return settings.SERVER_TIMING
+    return settings.is_dev
+
+
+class RequestLoggingMiddleware:
+    """Log each request as one JSON line with timing, SQL statement counts and likely N+1s.
+
+    Pure ASGI: bodies stream through untouched. With LOG_REQUEST_BODY_BYTES set,
+    the first that many bytes are copied into the log record as they pass.
+    LOG_SAMPLE_RATE thins out the access log; server errors and requests with a
+    likely N+1 are always logged.
+    """
 
-    logger.info("→ %s %s", request.method, request.url.path)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    if request.method in ("POST", "OPTIONS"):
-        body = await request.body()
-        logger.debug("  Body: %s", body)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Reconstruct request so FastAPI can parse it
-        async def receive():
-            return {"type": "http.request", "body": body}
+        start_time = time.perf_counter()
+        status = 500
+        timing = server_timing_enabled()
+        capture_limit = settings.LOG_REQUEST_BODY_BYTES
+        captured = bytearray()
+        truncated = False
 
-        request._receive = receive
+        async def capturing_receive() -> Message:
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                room = capture_limit - len(captured)
+                captured.extend(chunk[:room])
+                truncated = truncated or len(chunk) > room
+            return message
 
-    logger.debug("  Query: %s", dict(request.query_params))
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timing:
+                    db_ms = stats.db_seconds * 1000
+                    app_ms = max((time.perf_counter() - start_time) * 1000 - db_ms, 0.0)
+                    header = f'db;dur={db_ms:.1f};desc="{stats.statements} queries"'
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", f"{header}, app;dur={app_ms:.1f}"
+                    )
+            await send(message)
 
-    response = await call_next(request)
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            with track_queries() as stats:
+                await self.app(
+                    scope, capturing_receive if capture_limit > 0 else receive, send_wrapper
+                )
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            duration = time.perf_counter() - start_time
+            # Label by route template so ids in the path don't create a series per resource.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.observe(
+                duration, method=scope["method"], route=route, status=str(status)
+            )
 
-    duration = time.time() - start_time
-    logger.info(
-        "← %s %s %d (%.3fs)", request.method, request.url.path, response.status_code, duration
-    )
+            repeated = stats.repeated()
+            for shape, count in repeated:
+                logger.warning(
+                    "Likely N+1 in %s %s: %d× %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    shape[:300],
+                )
 
-    return response
+            sampled = settings.LOG_SAMPLE_RATE >= 1 or random.random() < settings.LOG_SAMPLE_RATE
+            if logger.isEnabledFor(logging.INFO) and (sampled or status >= 500 or repeated):
+                record = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route,
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 1),
+                    "queries": stats.statements,
+                    "db_ms": round(stats.db_seconds * 1000, 1),
+                }
+                if capture_limit > 0:
+                    record["body"] = captured.decode("utf-8", errors="replace")
+                    record["body_truncated"] = truncated
+                logger.info(json.dumps(record, ensure_ascii=False))
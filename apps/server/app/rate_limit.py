@@ -28,6 +28,11 @@ class RateLimiter:
         """Record an event unconditionally (call after is_allowed returned True)."""
         self._store[key].append(time.time())
 
+    def size(self) -> tuple[int, int]:
+        """(keys, recorded timestamps) currently held. Keys are only pruned on access."""
+        store = dict(self._store)
+        return len(store), sum(len(times) for times in store.values())
+
 
 # Singleton for email-related rate limiting (verification, password reset)
 email_rate_limiter = RateLimiter()
@@ -14,6 +14,7 @@ from app.db.models import (
     Category,
     Export,
     Transaction,
+    TransactionTombstone,
     User,
     UserCategoryPreference,
 )
@@ -217,9 +218,21 @@ async def update_preferences(
         user.session_timeout_minutes = data.session_timeout_minutes
     if data.default_account_id is not None:
         user.default_account_id = data.default_account_id
+    timezone_changed = "timezone" in data.model_fields_set and data.timezone != user.timezone
     if "timezone" in data.model_fields_set:
         user.timezone = data.timezone
+    if timezone_changed:
+        # Recurring rules fire at local midnight; move their due instants with the user.
+        from app.services import recurring_service
+        from app.services.budget_service import rebuild_progress
+
+        recurring_service.reschedule_user_rules(db, user.id, user.timezone)
+        # Budget periods are local too: re-bucket the user's progress rows.
+        db.flush()
+        rebuild_progress(db, user_id=user.id)
     db.commit()
+    if timezone_changed:
+        recurring_service.notify_schedule_changed()
 
     if data.preferred_currency is not None:
         from app.services.dashboard_analytics_service import invalidate_user_cache
@@ -309,6 +322,7 @@ async def delete_account(
     db.flush()
     db.query(Export).filter(Export.user_id == user_id).delete()
     db.query(Transaction).filter(Transaction.user_id == user_id).delete()
+    db.query(TransactionTombstone).filter(TransactionTombstone.user_id == user_id).delete()
     db.query(Account).filter(Account.user_id == user_id).delete()
     db.query(UserCategoryPreference).filter(UserCategoryPreference.user_id == user_id).delete()
     db.query(Category).filter(Category.user_id == user_id).delete()
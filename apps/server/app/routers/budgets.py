@@ -9,7 +9,7 @@ from app.db.schemas import (
     BudgetSchema,
     BudgetUpdateRequest,
 )
-from app.services.budget_service import BudgetService
+from app.services.budget_service import MAX_HISTORY_PERIODS, BudgetService
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
@@ -53,7 +53,7 @@ async def delete_budget(
 @router.get("/{budget_id}/history", response_model=BudgetHistoryResponse)
 async def get_budget_history(
     budget_id: str,
-    periods: int = Query(default=6, ge=1, le=24),
+    periods: int = Query(default=6, ge=1, le=MAX_HISTORY_PERIODS),
     user_id: str = Depends(get_user_id),
     db: Session = Depends(get_db),
 ):
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
@@ -16,11 +16,14 @@ from app.db.schemas import (
     MonthlyTrendResponse,
     RecurringResponse,
     SparklineResponse,
+    UpcomingRecurringResponse,
     WeekdayHeatmapResponse,
 )
+from app.services.budget_service import MAX_HISTORY_PERIODS, BudgetService
 from app.services.dashboard_analytics_service import DashboardAnalyticsService
 from app.services.dashboard_service import DashboardService
 from app.services.expense_service import ExpenseService
+from app.services.recurring_service import get_upcoming
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -72,6 +75,8 @@ async def get_dashboard_bootstrap(
     weeks: int = Query(default=8, ge=1, le=26),
     days: int = Query(default=90, ge=7, le=365),
     lookback_days: int = Query(default=120, ge=30, le=365),
+    upcoming_days: int = Query(default=30, ge=1, le=366),
+    budget_periods: int = Query(default=6, ge=1, le=MAX_HISTORY_PERIODS),
     widget_type: list[str] = Query(default=[]),
     user_id: str = Depends(get_user_id),
     db: Session = Depends(get_db),
@@ -91,6 +96,8 @@ async def get_dashboard_bootstrap(
     wants_weekday_heatmap = "weekday_heatmap" in requested_widgets
     wants_account_trend = "account_trend" in requested_widgets
     wants_recurring = "recurring_subscriptions" in requested_widgets
+    wants_upcoming_recurring = "upcoming_recurring" in requested_widgets
+    wants_budget_history = "budget_history" in requested_widgets
 
     parsed_start_date = datetime.fromisoformat(start_date)
     parsed_end_date = datetime.fromisoformat(end_date)
@@ -208,6 +215,21 @@ async def get_dashboard_bootstrap(
             currency=currency,
         )
 
+    upcoming_recurring = UpcomingRecurringResponse(
+        occurrences=[],
+        start_date=date.today(),
+        end_date=date.today() + timedelta(days=upcoming_days),
+        currency=display_currency,
+    )
+    if wants_upcoming_recurring:
+        upcoming_recurring = get_upcoming(
+            db, user_id, days=upcoming_days, currency=display_currency
+        )
+
+    budget_history = []
+    if wants_budget_history:
+        budget_history = await BudgetService(db).get_all_histories(user_id, budget_periods)
+
     return DashboardBootstrapResponse(
         preferred_currency=preferred_currency,
         expenses=expenses,
@@ -219,6 +241,8 @@ async def get_dashboard_bootstrap(
         weekday_heatmap=weekday_heatmap,
         account_trend=account_trend,
         recurring=recurring,
+        upcoming_recurring=upcoming_recurring,
+        budget_history=budget_history,
     )
 
 
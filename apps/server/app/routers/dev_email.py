@@ -9,13 +9,12 @@ from app.email.templates import render_template
 
 router = APIRouter(prefix="/dev/email-preview", tags=["Dev Email Preview"])
 
-_ALLOWED_ENVS = {"local", "development", "dev", "test"}
 _TemplateName = Literal["verification", "welcome", "password_reset"]
 _SAMPLE_PERSON = "alice"
 
 
 def _ensure_preview_enabled() -> None:
-    if settings.ENV.lower() not in _ALLOWED_ENVS:
+    if not settings.is_dev:
         raise HTTPException(status_code=404, detail="Not found")
 
 
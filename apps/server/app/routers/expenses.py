@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from app.auth.dependencies import get_user_id
 from app.database import get_db
 from app.db.schemas import (
+    ExpenseBulkCreateRequest,
+    ExpenseBulkCreateResponse,
     ExpenseCreateRequest,
     ExpenseDeleteResponse,
     ExpenseSchema,
@@ -141,6 +143,17 @@ async def create_expense(
     return await service.create_expense(user_id, data)
 
 
+@router.post("/bulk", response_model=ExpenseBulkCreateResponse)
+async def create_expenses_bulk(
+    data: ExpenseBulkCreateRequest,
+    user_id: str = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Create many expenses at once. Invalid items are reported per index and skipped."""
+    service = ExpenseService(db)
+    return await service.create_expenses_bulk(user_id, data.items)
+
+
 @router.get("/{expense_id}", response_model=ExpenseSchema)
 async def get_expense(
     expense_id: str,
@@ -20,15 +20,31 @@ from app.db.schemas import (
     ExportCreateRequest,
     ExportHistoryResponse,
     ExportJobResponse,
+    ExportQueueStats,
     ExportRecordSchema,
 )
+from app.services.export_pool import ExportPoolSaturated, export_pool
 from app.services.export_service import (
+    CSV_CODECS,
+    DELTA_FORMATS,
+    DELTA_SCOPES,
+    TERMINAL_STATUSES,
     USER_STORAGE_CAP_BYTES,
+    ExportJob,
     ExportService,
+    compute_export_fingerprint,
     create_job,
+    create_reused_job,
+    discard_job,
+    export_extension,
+    find_matching_job,
+    find_reusable_export,
     get_job,
     get_user_storage_bytes,
     is_rust_available,
+    job_event,
+    job_events,
+    resolve_delta_since,
 )
 
 router = APIRouter(prefix="/exports", tags=["exports"])
@@ -38,11 +54,18 @@ _optional_bearer = HTTPBearer(auto_error=False)
 
 MEDIA_TYPES = {
     "csv": "text/csv",
+    "csv.gz": "application/gzip",
+    "csv.zst": "application/zstd",
     "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     "pdf": "application/pdf",
     "zip": "application/zip",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
 }
 
+# SSE comment line sent while a job is idle so proxies keep the connection open.
+SSE_HEARTBEAT_SECONDS = 15
+
 _UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._ -]+")
 _SEPARATOR_RUNS = re.compile(r"[- ]+")
 
@@ -64,10 +87,8 @@ def _resolve_user_id(
     return None
 
 
-def _export_extension(fmt: str, scope: str) -> str:
-    if fmt == "csv" and scope == "full_dump":
-        return "zip"
-    return fmt
+def _sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
 
 
 def _sanitize_filename_stem(name: str) -> str:
@@ -78,8 +99,8 @@ def _sanitize_filename_stem(name: str) -> str:
     return sanitized or "export"
 
 
-def _build_export_filename(name: str, fmt: str, scope: str) -> str:
-    return f"{_sanitize_filename_stem(name)}.{_export_extension(fmt, scope)}"
+def _build_export_filename(name: str, fmt: str, scope: str, delta: bool = False) -> str:
+    return f"{_sanitize_filename_stem(name)}.{export_extension(fmt, scope, delta)}"
 
 
 def _as_utc(value: datetime) -> datetime:
@@ -118,6 +139,8 @@ async def export_history(
             name=r.name,
             format=r.format,
             scope=r.scope,
+            extension=export_extension(r.format, r.scope, r.delta_since is not None),
+            delta_since=r.delta_since,
             file_size=r.file_size,
             created_at=r.created_at,
             expires_at=r.expires_at,
@@ -156,7 +179,9 @@ async def download_export_record(
     if not s3_mod.is_s3_available():
         raise HTTPException(status_code=503, detail="Download service unavailable")
 
-    filename = _build_export_filename(record.name, record.format, record.scope)
+    filename = _build_export_filename(
+        record.name, record.format, record.scope, record.delta_since is not None
+    )
     url = s3_mod.presign_download(record.s3_key, filename)
     return RedirectResponse(url=url, status_code=307)
 
@@ -203,6 +228,36 @@ async def start_export(
             detail="PDF export is not supported for full data dump. Use CSV or XLSX.",
         )
 
+    if request.format in CSV_CODECS and request.scope == "full_dump":
+        raise HTTPException(
+            status_code=400,
+            detail="Full data dumps are already zipped. Use CSV, Parquet or Arrow instead.",
+        )
+
+    delta_since = None
+    if request.is_delta:
+        if request.since is not None and request.since_export_id is not None:
+            raise HTTPException(status_code=400, detail="Use either since or since_export_id.")
+        if request.scope not in DELTA_SCOPES or request.format not in DELTA_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail="Delta exports support transactions or full backup as CSV, Parquet or Arrow.",
+            )
+        try:
+            delta_since = resolve_delta_since(db, user_id, request)
+        except LookupError:
+            raise HTTPException(status_code=404, detail="Base export not found") from None
+
+    # Identical request over unchanged data: hand back the existing result.
+    fingerprint = compute_export_fingerprint(db, user_id, request)
+    job = find_matching_job(user_id, fingerprint)
+    if job is None and s3_mod.is_s3_available():
+        record = find_reusable_export(db, user_id, fingerprint)
+        if record is not None:
+            job = create_reused_job(user_id, record)
+    if job is not None:
+        return _job_response(job)
+
     # Check per-user storage cap
     if s3_mod.is_s3_available():
         total = get_user_storage_bytes(db, user_id)
@@ -212,21 +267,36 @@ async def start_export(
                 detail="Export storage limit reached (100 MB). Delete old exports to free space.",
             )
 
-    job = create_job(user_id, request)
+    job = create_job(user_id, request, fingerprint, delta_since)
+
+    try:
+        export_pool.submit(user_id, _run_export_sync, job.id, user_id, request)
+    except ExportPoolSaturated as exc:
+        discard_job(job.id)
+        raise HTTPException(
+            status_code=429,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from None
+
+    return _job_response(job)
 
-    asyncio.get_running_loop().run_in_executor(None, _run_export_sync, job.id, user_id, request)
 
+def _job_response(job: ExportJob) -> ExportJobResponse:
     return ExportJobResponse(
         job_id=job.id,
         status=job.status,
         format=job.format,
         scope=job.scope,
         created_at=job.created_at,
+        error=job.error,
+        export_id=job.export_id,
+        reused=job.reused,
     )
 
 
 def _run_export_sync(job_id: str, user_id: str, request: ExportCreateRequest):
-    """Blocking export worker - runs in thread pool with its own DB session."""
+    """Blocking export worker - runs in the export pool with its own DB session."""
     db = SessionLocal()
     try:
         service = ExportService(db)
@@ -235,6 +305,14 @@ def _run_export_sync(job_id: str, user_id: str, request: ExportCreateRequest):
         db.close()
 
 
+@router.get("/queue")
+async def export_queue_stats(user_id: str = Depends(get_user_id)):
+    return ExportQueueStats(
+        **export_pool.stats(),
+        user_in_flight=export_pool.user_in_flight(user_id),
+    )
+
+
 @router.get("/{job_id}/status")
 async def export_status(
     job_id: str,
@@ -244,15 +322,7 @@ async def export_status(
     if not job or job.user_id != user_id:
         raise HTTPException(status_code=404, detail="Export job not found")
 
-    return ExportJobResponse(
-        job_id=job.id,
-        status=job.status,
-        format=job.format,
-        scope=job.scope,
-        created_at=job.created_at,
-        error=job.error,
-        export_id=job.export_id,
-    )
+    return _job_response(job)
 
 
 @router.get("/{job_id}/stream")
@@ -265,31 +335,32 @@ async def export_stream(
         raise HTTPException(status_code=404, detail="Export job not found")
 
     async def event_generator():
-        last_status = None
-        while True:
+        # Subscribe before reading the current state so no transition is missed.
+        queue = job_events.subscribe(job_id)
+        try:
             current_job = get_job(job_id)
             if not current_job:
-                yield f"data: {json.dumps({'status': 'error', 'error': 'Job not found'})}\n\n"
-                break
-
-            if current_job.status != last_status:
-                last_status = current_job.status
-                event = {
-                    "status": current_job.status,
-                    "job_id": current_job.id,
-                }
-                if current_job.error:
-                    event["error"] = current_job.error
-                if current_job.file_size:
-                    event["file_size"] = current_job.file_size
-                if current_job.export_id:
-                    event["export_id"] = current_job.export_id
-                yield f"data: {json.dumps(event)}\n\n"
-
-            if current_job.status in ("done", "error"):
-                break
-
-            await asyncio.sleep(0.5)
+                yield _sse({"status": "error", "error": "Job not found"})
+                return
+            yield _sse(job_event(current_job))
+            if current_job.status in TERMINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    if get_job(job_id) is None:
+                        yield _sse({"status": "error", "error": "Job not found"})
+                        return
+                    yield ": heartbeat\n\n"
+                    continue
+
+                yield _sse(event)
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            job_events.unsubscribe(job_id, queue)
 
     return StreamingResponse(
         event_generator(),
@@ -328,19 +399,20 @@ async def export_download(
     if job.expires_at <= datetime.now(UTC):
         raise HTTPException(status_code=410, detail="Export has expired")
 
-    if not job.file_path:
-        raise HTTPException(status_code=500, detail="Export file missing")
-
-    # If S3 upload succeeded, redirect to pre-signed URL
+    # If S3 upload succeeded (or the job reuses a stored export), redirect to pre-signed URL
+    delta = job.delta_since is not None
     if job.s3_key and s3_mod.is_s3_available():
-        filename = _build_export_filename(job.name, job.format, job.scope)
+        filename = _build_export_filename(job.name, job.format, job.scope, delta)
         url = s3_mod.presign_download(job.s3_key, filename)
         return RedirectResponse(url=url, status_code=307)
 
+    if not job.file_path:
+        raise HTTPException(status_code=500, detail="Export file missing")
+
     # Fallback: serve temp file directly (dev/test or S3 upload failed)
-    suffix = _export_extension(job.format, job.scope)
+    suffix = export_extension(job.format, job.scope, delta)
     media_type = MEDIA_TYPES.get(suffix, "application/octet-stream")
-    filename = _build_export_filename(job.name, job.format, job.scope)
+    filename = _build_export_filename(job.name, job.format, job.scope, delta)
 
     return FileResponse(
         path=job.file_path,
@@ -0,0 +1,215 @@
+import json
+import os
+import tempfile
+import uuid
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.dependencies import get_user_id
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.db.models import Account
+from app.db.schemas import ImportJobResponse
+from app.services.export_pool import ExportPoolSaturated
+from app.services.import_service import (
+    MAPPABLE_FIELDS,
+    STATEMENT_FORMATS,
+    ImportJob,
+    ImportOptions,
+    ImportService,
+    create_job,
+    discard_job,
+    get_job,
+    import_pool,
+    update_job,
+)
+from app.services.restore_service import RestoreService
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def _parse_columns(raw: str | None) -> dict[str, str]:
+    if not raw:
+        return {}
+    try:
+        columns = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="columns must be a JSON object") from None
+    if not isinstance(columns, dict) or not all(
+        isinstance(v, str) and k in MAPPABLE_FIELDS for k, v in columns.items()
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"columns maps {', '.join(MAPPABLE_FIELDS)} to header names",
+        )
+    return columns
+
+
+async def _spool_upload(file: UploadFile, suffix: str, max_bytes: int) -> str:
+    """Copy the upload to a temp file in chunks, enforcing the size cap.
+
+    File I/O runs in the threadpool so a large upload never blocks the event loop.
+    """
+    size = 0
+    out = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, prefix="cofr-import-", suffix=suffix, delete=False
+    )
+    try:
+        while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail="Upload is too large")
+            await run_in_threadpool(out.write, chunk)
+        await run_in_threadpool(out.close)
+    except BaseException:
+        await run_in_threadpool(_discard_spool, out)
+        raise
+    return out.name
+
+
+def _discard_spool(out) -> None:
+    out.close()
+    os.unlink(out.name)
+
+
+@router.post("/statements", status_code=202)
+async def import_statement(
+    file: UploadFile = File(...),
+    account_id: str = Form(...),
+    currency: str | None = Form(None, min_length=3, max_length=3),
+    date_format: str | None = Form(None),
+    columns: str | None = Form(None),
+    expense_category_id: str | None = Form(None),
+    income_category_id: str | None = Form(None),
+    user_id: str = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    filename = file.filename or "statement"
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    fmt = STATEMENT_FORMATS.get(extension)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Upload a .csv, .ofx or .qfx statement")
+
+    try:
+        uuid.UUID(account_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Account not found") from None
+    account = db.query(Account).filter(Account.id == account_id, Account.user_id == user_id).first()
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    options = ImportOptions(
+        account_id=str(account.id),
+        format=fmt,
+        currency=currency.upper() if currency else None,
+        date_format=date_format or None,
+        columns=_parse_columns(columns),
+        expense_category_id=expense_category_id or None,
+        income_category_id=income_category_id or None,
+    )
+    path = await _spool_upload(file, f".{extension}", settings.IMPORT_MAX_UPLOAD_BYTES)
+    job = create_job(user_id, "statement", fmt, filename, path)
+    _submit(job, _run_import_sync, job.id, options)
+    return _job_response(job)
+
+
+@router.post("/full-dump", status_code=202)
+async def restore_full_dump(
+    file: UploadFile = File(...),
+    user_id: str = Depends(get_user_id),
+):
+    filename = file.filename or "backup.zip"
+    if not filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Upload a full backup CSV export (.zip)")
+
+    path = await _spool_upload(file, ".zip", settings.RESTORE_MAX_UPLOAD_BYTES)
+    job = create_job(user_id, "full_dump", "zip", filename, path)
+    _submit(job, _run_restore_sync, job.id)
+    return _job_response(job)
+
+
+@router.post("/{job_id}/resume", status_code=202)
+async def resume_import(job_id: str, user_id: str = Depends(get_user_id)):
+    job = get_job(job_id)
+    if not job or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if not _is_resumable(job):
+        raise HTTPException(status_code=409, detail="Only a failed restore can be resumed")
+
+    # Picks up after the last committed chunk (rows_read); counters carry on.
+    update_job(job, status="pending", completed_at=None)
+    try:
+        import_pool.submit(user_id, _run_restore_sync, job.id)
+    except ExportPoolSaturated as exc:
+        job.status = "error"
+        raise _saturated(exc) from None
+    return _job_response(job)
+
+
+def _saturated(exc: ExportPoolSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=exc.detail,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _submit(job: ImportJob, fn, *args) -> None:
+    try:
+        import_pool.submit(job.user_id, fn, *args)
+    except ExportPoolSaturated as exc:
+        discard_job(job.id)
+        raise _saturated(exc) from None
+
+
+def _is_resumable(job: ImportJob) -> bool:
+    return job.kind == "full_dump" and job.status == "error" and job.path is not None
+
+
+def _job_response(job: ImportJob) -> ImportJobResponse:
+    return ImportJobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        format=job.format,
+        filename=job.filename,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+        error=job.error,
+        rows_read=job.rows_read,
+        rows_inserted=job.rows_inserted,
+        rows_duplicate=job.rows_duplicate,
+        rows_failed=job.rows_failed,
+        errors=list(job.errors),
+        resumable=_is_resumable(job),
+    )
+
+
+def _run_import_sync(job_id: str, options: ImportOptions):
+    """Blocking import worker - runs in the import pool with its own DB session."""
+    db = SessionLocal()
+    try:
+        ImportService(db).run_import(job_id, options)
+    finally:
+        db.close()
+
+
+def _run_restore_sync(job_id: str):
+    """Blocking restore worker - runs in the import pool with its own DB session."""
+    db = SessionLocal()
+    try:
+        RestoreService(db).run_restore(job_id)
+    finally:
+        db.close()
+
+
+@router.get("/{job_id}")
+async def import_status(job_id: str, user_id: str = Depends(get_user_id)):
+    job = get_job(job_id)
+    if not job or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return _job_response(job)
@@ -0,0 +1,118 @@
+import secrets
+
+import anyio.to_thread
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.database import engine
+from app.metrics import REGISTRY, Counter, Gauge, Metric, render
+from app.rate_limit import auth_rate_limiter, email_rate_limiter
+from app.services.export_pool import export_pool
+from app.services.import_service import import_pool
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _ensure_metrics_access(authorization: str | None) -> None:
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.is_dev:
+            raise HTTPException(status_code=404, detail="Not found")
+        return
+    if not authorization or not secrets.compare_digest(authorization, f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+def _db_pool_metrics() -> list[Metric]:
+    pool = engine.pool
+    # SQLite pools (tests, local dev) have no size or overflow to report.
+    if not hasattr(pool, "overflow"):
+        return []
+    size = Gauge("cofr_db_pool_size", "Configured pool_size.")
+    checked_out = Gauge("cofr_db_pool_checked_out", "Connections currently checked out.")
+    checked_in = Gauge("cofr_db_pool_checked_in", "Idle connections in the pool.")
+    overflow = Gauge("cofr_db_pool_overflow", "Overflow connections currently open.")
+    size.set(pool.size())
+    checked_out.set(pool.checkedout())
+    checked_in.set(pool.checkedin())
+    overflow.set(max(pool.overflow(), 0))
+    return [size, checked_out, checked_in, overflow]
+
+
+def _threadpool_metrics() -> list[Metric]:
+    """Occupancy of the default executor FastAPI runs sync routes and dependencies on."""
+    stats = anyio.to_thread.current_default_thread_limiter().statistics()
+    size = Gauge("cofr_threadpool_size", "Default thread pool capacity.")
+    busy = Gauge("cofr_threadpool_busy", "Default thread pool threads in use.")
+    waiting = Gauge("cofr_threadpool_queue_depth", "Calls waiting for a default pool thread.")
+    size.set(stats.total_tokens)
+    busy.set(stats.borrowed_tokens)
+    waiting.set(stats.tasks_waiting)
+    return [size, busy, waiting]
+
+
+def _job_pool_metrics() -> list[Metric]:
+    workers = Gauge("cofr_job_workers", "Worker threads per job pool.", ("pool",))
+    running = Gauge("cofr_job_running", "Jobs currently running.", ("pool",))
+    queued = Gauge("cofr_job_queue_depth", "Jobs admitted and waiting for a worker.", ("pool",))
+    max_queue = Gauge("cofr_job_max_queue", "Queue depth at which submits are rejected.", ("pool",))
+    for pool in (export_pool, import_pool):
+        stats = pool.stats()
+        workers.set(stats["workers"], pool=pool.kind)
+        running.set(stats["running"], pool=pool.kind)
+        queued.set(stats["queue_depth"], pool=pool.kind)
+        max_queue.set(stats["max_queue"], pool=pool.kind)
+    return [workers, running, queued, max_queue]
+
+
+def _rate_limiter_metrics() -> list[Metric]:
+    keys = Gauge(
+        "cofr_rate_limiter_keys", "Keys held by each in-memory rate limiter.", ("limiter",)
+    )
+    entries = Gauge(
+        "cofr_rate_limiter_entries", "Timestamps held by each rate limiter.", ("limiter",)
+    )
+    for name, limiter in (("auth", auth_rate_limiter), ("email", email_rate_limiter)):
+        key_count, entry_count = limiter.size()
+        keys.set(key_count, limiter=name)
+        entries.set(entry_count, limiter=name)
+    return [keys, entries]
+
+
+def _background_metrics(request: Request) -> list[Metric]:
+    coordinator = getattr(request.app.state, "background", None)
+    if coordinator is None:
+        return []
+    runs = Counter("cofr_background_runs_total", "Background task passes.", ("task",))
+    failures = Counter("cofr_background_failures_total", "Failed passes.", ("task",))
+    skipped = Counter("cofr_background_skipped_total", "Passes skipped as a follower.", ("task",))
+    leader = Gauge("cofr_background_is_leader", "1 if this worker leads the task.", ("task",))
+    last = Gauge("cofr_background_last_duration_seconds", "Duration of the latest pass.", ("task",))
+    for name, stats in coordinator.stats().items():
+        runs.set(stats["runs"], task=name)
+        failures.set(stats["failures"], task=name)
+        skipped.set(stats["skipped"], task=name)
+        leader.set(int(stats["is_leader"]), task=name)
+        last.set(stats["last_duration_seconds"], task=name)
+    return [runs, failures, skipped, leader, last]
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(
+    request: Request, authorization: str | None = Header(default=None)
+) -> PlainTextResponse:
+    """Prometheus scrape endpoint for this worker process."""
+    _ensure_metrics_access(authorization)
+
+    collected = [
+        *REGISTRY,
+        *_db_pool_metrics(),
+        *_threadpool_metrics(),
+        *_job_pool_metrics(),
+        *_rate_limiter_metrics(),
+        *_background_metrics(request),
+    ]
+    return PlainTextResponse(render(collected), media_type=_CONTENT_TYPE)
@@ -1,6 +1,6 @@
 import logging
+from functools import lru_cache
 
-from authlib.integrations.starlette_client import OAuth
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
@@ -15,17 +15,24 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth/oauth", tags=["OAuth"])
 
-oauth = OAuth()
 
-# Register providers conditionally
-if settings.GOOGLE_CLIENT_ID:
-    oauth.register(
-        name="google",
-        client_id=settings.GOOGLE_CLIENT_ID,
-        client_secret=settings.GOOGLE_CLIENT_SECRET,
-        server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-        client_kwargs={"scope": "openid email profile"},
-    )
+@lru_cache(maxsize=1)
+def _oauth():
+    """Build the OAuth registry on first use; authlib is only needed on these routes."""
+    from authlib.integrations.starlette_client import OAuth
+
+    oauth = OAuth()
+    # Register providers conditionally
+    if settings.GOOGLE_CLIENT_ID:
+        oauth.register(
+            name="google",
+            client_id=settings.GOOGLE_CLIENT_ID,
+            client_secret=settings.GOOGLE_CLIENT_SECRET,
+            server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
+            client_kwargs={"scope": "openid email profile"},
+        )
+    return oauth
+
 
 SUPPORTED_PROVIDERS = {"google"}
 
@@ -45,7 +52,7 @@ async def oauth_login(provider: str, request: Request):
             f"{settings.FRONTEND_URL}/login?error=Provider+{provider}+not+configured"
         )
 
-    client = oauth.create_client(provider)
+    client = _oauth().create_client(provider)
     redirect_uri = f"{settings.API_URL}/auth/oauth/{provider}/callback"
     response = await client.authorize_redirect(request, redirect_uri)
     response.headers["Cache-Control"] = "no-store"
@@ -60,7 +67,7 @@ async def oauth_callback(provider: str, request: Request, db: Session = Depends(
             f"{settings.FRONTEND_URL}/login?error=Provider+{provider}+not+configured"
         )
 
-    client = oauth.create_client(provider)
+    client = _oauth().create_client(provider)
 
     try:
         token = await client.authorize_access_token(request)
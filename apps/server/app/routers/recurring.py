@@ -1,3 +1,5 @@
+from datetime import date
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
@@ -11,14 +13,19 @@ from app.db.schemas import (
     RecurringRuleDeleteResponse,
     RecurringRuleSchema,
     RecurringRuleUpdateRequest,
+    UpcomingRecurringResponse,
 )
 from app.services.expense_service import ExpenseService
 from app.services.recurring_service import (
     advance,
     get_rule_history,
+    get_upcoming,
     list_rules,
     materialize_rule,
+    notify_schedule_changed,
+    reschedule_rule,
     to_schema,
+    to_schemas,
     user_today,
 )
 
@@ -99,7 +106,20 @@ async def list_recurring_rules(
     user_id: str = Depends(get_user_id),
     db: Session = Depends(get_db),
 ):
-    return [to_schema(db, rule) for rule in list_rules(db, user_id)]
+    return to_schemas(db, list_rules(db, user_id))
+
+
+@router.get("/upcoming", response_model=UpcomingRecurringResponse)
+async def get_upcoming_occurrences(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    currency: str | None = Query(default=None, pattern="^[A-Z]{3}$"),
+    limit: int = Query(default=200, ge=1, le=2000),
+    user_id: str = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Every upcoming occurrence of the user's active rules in a date window."""
+    return get_upcoming(db, user_id, start=start_date, end=end_date, currency=currency, limit=limit)
 
 
 @router.post("/", response_model=RecurringRuleSchema, status_code=201)
@@ -108,19 +128,21 @@ async def create_recurring_rule(
     user_id: str = Depends(get_user_id),
     db: Session = Depends(get_db),
 ):
+    user = db.query(User).filter(User.id == user_id).first()
     rule = _validate_and_build(db, user_id, data)
+    reschedule_rule(db, rule, user.timezone if user else None)
     db.add(rule)
     db.commit()
     db.refresh(rule)
 
     # Materialize immediately if start_date <= today (user-local)
-    user = db.query(User).filter(User.id == user_id).first()
     today = user_today(user)
     if rule.next_due_at <= today:
         materialize_rule(db, rule, today=today)
         db.commit()
         db.refresh(rule)
 
+    notify_schedule_changed()
     return to_schema(db, rule)
 
 
@@ -240,9 +262,11 @@ async def update_recurring_rule(
             )
         else:
             rule.next_due_at = rule.start_date
+    reschedule_rule(db, rule)
 
     db.commit()
     db.refresh(rule)
+    notify_schedule_changed()
     return to_schema(db, rule)
 
 
@@ -260,8 +284,12 @@ async def pause_recurring_rule(
     if not rule:
         raise HTTPException(status_code=404, detail="Recurring rule not found")
     rule.is_active = not rule.is_active
+    if rule.is_active:
+        reschedule_rule(db, rule)
     db.commit()
     db.refresh(rule)
+    if rule.is_active:
+        notify_schedule_changed()
     return to_schema(db, rule)
 
 
@@ -302,5 +330,5 @@ async def get_recurring_rule_history(
 
     rows, total = get_rule_history(db, user_id, rule_id, limit=limit, offset=offset)
     service = ExpenseService(db)
-    expenses: list[ExpenseSchema] = [service._to_schema(tx) for tx in rows]
+    expenses: list[ExpenseSchema] = service._to_schemas(rows)
     return ExpensesResponse(expenses=expenses, total_count=total, limit=limit, offset=offset)
@@ -0,0 +1,234 @@
+"""Periodic background jobs, coordinated across worker processes.
+
+Every uvicorn worker runs the same lifespan, so without coordination each one
+would refresh rates and materialize recurring rules on its own. Jobs marked
+`leader_only` run in at most one process at a time: the worker holding the
+job's Postgres advisory lock is its leader. Locks are session-level and live
+on one dedicated connection, so leadership lasts until the process exits or
+the connection drops, at which point another worker takes over on its next
+poll. On SQLite (tests, local dev) there is a single process and every worker
+is the leader.
+
+Job functions are synchronous and run in a thread. A job may return a number
+of seconds to override its next delay (used by the recurring scheduler, which
+sleeps until the next rule is due).
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import Connection, Engine, text
+
+from app.metrics import BACKGROUND_RUN_DURATION
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAMESPACE = "cofr:background:"
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name."""
+    digest = hashlib.blake2b(f"{_LOCK_NAMESPACE}{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class AdvisoryLocks:
+    """Session-level advisory locks held on a single dedicated connection."""
+
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        self._conn: Connection | None = None
+        self._held: set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._engine.dialect.name == "postgresql"
+
+    def try_acquire(self, key: int) -> bool:
+        """Return True if this process holds `key` (acquiring it if free)."""
+        if not self.enabled:
+            return True
+        with self._lock:
+            try:
+                conn = self._connection()
+                if key in self._held:
+                    # Cheap liveness check: a dropped connection has lost its locks.
+                    conn.execute(text("SELECT 1"))
+                    return True
+                acquired = conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+                ).scalar()
+            except Exception:
+                logger.warning("Advisory lock connection failed; dropping leadership")
+                self._reset_locked()
+                return False
+            if acquired:
+                self._held.add(key)
+            return bool(acquired)
+
+    def release_all(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute(text("SELECT pg_advisory_unlock_all()"))
+                except Exception:
+                    pass
+            self._reset_locked()
+
+    def _connection(self) -> Connection:
+        if self._conn is None:
+            self._conn = self._engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        return self._conn
+
+    def _reset_locked(self) -> None:
+        self._held.clear()
+        if self._conn is not None:
+            try:
+                self._conn.invalidate()
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+@dataclass
+class PeriodicTask:
+    name: str
+    fn: Callable[[], float | None]
+    interval: float
+    # Random extra delay, up to this many seconds, added to every sleep.
+    jitter: float = 0.0
+    initial_delay: float = 0.0
+    leader_only: bool = True
+    # Setting this event cuts the current sleep short.
+    wake: asyncio.Event | None = None
+
+
+@dataclass
+class TaskStats:
+    runs: int = 0
+    failures: int = 0
+    # Passes skipped because another worker holds the job's lock.
+    skipped: int = 0
+    is_leader: bool = False
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    last_run_at: datetime | None = None
+    last_error: str | None = None
+
+
+class BackgroundCoordinator:
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        leader_poll_seconds: float = 60.0,
+        locks: AdvisoryLocks | None = None,
+    ):
+        self.leader_poll_seconds = leader_poll_seconds
+        self._locks = locks or AdvisoryLocks(engine)
+        self._tasks: dict[str, PeriodicTask] = {}
+        self._stats: dict[str, TaskStats] = {}
+        self._handles: list[asyncio.Task] = []
+
+    def add(self, task: PeriodicTask) -> None:
+        if task.name in self._tasks:
+            raise ValueError(f"Background task {task.name!r} already registered")
+        self._tasks[task.name] = task
+        self._stats[task.name] = TaskStats()
+
+    def start(self) -> None:
+        for task in self._tasks.values():
+            self._handles.append(asyncio.create_task(self._loop(task), name=f"bg:{task.name}"))
+
+    async def stop(self) -> None:
+        for handle in self._handles:
+            handle.cancel()
+        await asyncio.gather(*self._handles, return_exceptions=True)
+        self._handles.clear()
+        await asyncio.to_thread(self._locks.release_all)
+
+    async def run_once(self, name: str) -> bool:
+        """Run one pass of `name` if this worker leads it. Returns True if it ran."""
+        ran, _ = await self._pass(self._tasks[name])
+        return ran
+
+    async def _loop(self, task: PeriodicTask) -> None:
+        delay = task.initial_delay
+        while True:
+            await self._sleep(task, delay)
+            ran, result = await self._pass(task)
+            if not ran:
+                # Follower: poll for leadership more often than the job runs.
+                delay = min(task.interval, self.leader_poll_seconds)
+            elif isinstance(result, int | float):
+                delay = float(result)
+            else:
+                delay = task.interval
+
+    async def _pass(self, task: PeriodicTask) -> tuple[bool, object]:
+        stats = self._stats[task.name]
+        if task.leader_only:
+            stats.is_leader = await asyncio.to_thread(self._locks.try_acquire, lock_key(task.name))
+            if not stats.is_leader:
+                stats.skipped += 1
+                return False, None
+
+        started = time.monotonic()
+        stats.last_run_at = datetime.now(UTC)
+        result = None
+        try:
+            result = await asyncio.to_thread(task.fn)
+        except Exception as exc:
+            stats.failures += 1
+            stats.last_error = f"{type(exc).__name__}: {exc}"
+            logger.exception("Background task %s failed", task.name)
+        else:
+            stats.last_error = None
+        finally:
+            duration = time.monotonic() - started
+            stats.runs += 1
+            stats.last_duration = duration
+            stats.total_duration += duration
+            stats.max_duration = max(stats.max_duration, duration)
+            BACKGROUND_RUN_DURATION.observe(duration, task=task.name)
+            logger.debug("Background task %s finished in %.3fs", task.name, duration)
+        return True, result
+
+    async def _sleep(self, task: PeriodicTask, delay: float) -> None:
+        if task.jitter:
+            delay += random.uniform(0, task.jitter)
+        if task.wake is None:
+            await asyncio.sleep(delay)
+            return
+        try:
+            await asyncio.wait_for(task.wake.wait(), timeout=delay)
+        except TimeoutError:
+            pass
+        task.wake.clear()
+
+    def stats(self) -> dict[str, dict]:
+        """Per-task counters and timings, keyed by task name."""
+        return {
+            name: {
+                "runs": s.runs,
+                "failures": s.failures,
+                "skipped": s.skipped,
+                "is_leader": s.is_leader,
+                "last_duration_seconds": s.last_duration,
+                "max_duration_seconds": s.max_duration,
+                "avg_duration_seconds": s.total_duration / s.runs if s.runs else 0.0,
+                "last_run_at": s.last_run_at.isoformat() if s.last_run_at else None,
+                "last_error": s.last_error,
+            }
+            for name, s in self._stats.items()
+        }
@@ -1,11 +1,14 @@
-from datetime import UTC, date, datetime, timedelta
+import uuid
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
+from typing import NamedTuple
 
 from fastapi import HTTPException
-from sqlalchemy import case, func
 from sqlalchemy import false as sa_false
+from sqlalchemy import func
 from sqlalchemy.orm import Session, selectinload
 
-from app.db.models import Budget, BudgetCategory, Category, ExchangeRate, Transaction, User
+from app.db.models import Budget, BudgetCategory, BudgetProgress, Category, Transaction, User
 from app.db.schemas import (
     BudgetCreateRequest,
     BudgetHistoryPeriod,
@@ -13,19 +16,27 @@ from app.db.schemas import (
     BudgetSchema,
     BudgetUpdateRequest,
 )
+from app.services.exchange_rates import get_rates_from_db
 
+# Upper bound on history periods (a year of weekly budgets).
+MAX_HISTORY_PERIODS = 52
 
-def _current_period(period_type: str, tz: str | None) -> tuple[date, date]:
-    """Compute current period start/end in user's local date."""
+
+def _zone(tz: str | None):
     try:
         from zoneinfo import ZoneInfo
 
-        zone = ZoneInfo(tz) if tz else UTC
+        return ZoneInfo(tz) if tz else UTC
     except Exception:
-        zone = UTC
+        return UTC
+
+
+def _local_today(tz: str | None) -> date:
+    return datetime.now(_zone(tz)).date()
 
-    today = datetime.now(zone).date()
 
+def _period_bounds(period_type: str, today: date) -> tuple[date, date]:
+    """Start/end of the weekly or monthly period containing `today`."""
     if period_type == "monthly":
         start = today.replace(day=1)
         # Last day of this month
@@ -45,38 +56,25 @@ def _current_period(period_type: str, tz: str | None) -> tuple[date, date]:
     return today, today
 
 
-def _period_start_for_offset(period_type: str, tz: str | None, offset: int) -> tuple[date, date]:
-    """Compute period start/end going back `offset` periods from the current one."""
-    try:
-        from zoneinfo import ZoneInfo
+def _budget_period(budget: Budget, today: date) -> tuple[date, date]:
+    if budget.period_type == "custom":
+        return budget.start_date or today, budget.end_date or today
+    return _period_bounds(budget.period_type, today)
 
-        zone = ZoneInfo(tz) if tz else UTC
-    except Exception:
-        zone = UTC
 
-    today = datetime.now(zone).date()
+def _add_months(d: date, months: int) -> date:
+    month_index = d.year * 12 + d.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
 
-    if period_type == "monthly":
-        # Walk back `offset` months
-        month = today.month - offset
-        year = today.year
-        while month <= 0:
-            month += 12
-            year -= 1
-        start = date(year, month, 1)
-        if month == 12:
-            end = date(year, 12, 31)
-        else:
-            end = date(year, month + 1, 1) - timedelta(days=1)
-        return start, end
 
-    if period_type == "weekly":
-        start_of_this_week = today - timedelta(days=today.weekday())
-        start = start_of_this_week - timedelta(weeks=offset)
-        end = start + timedelta(days=6)
-        return start, end
-
-    return today, today
+def _history_periods(period_type: str, today: date, periods: int) -> list[tuple[date, date]]:
+    """The last `periods` weekly/monthly periods up to the current one, oldest first."""
+    current, _ = _period_bounds(period_type, today)
+    if period_type == "monthly":
+        starts = [_add_months(current, -i) for i in range(periods - 1, -1, -1)]
+    else:
+        starts = [current - timedelta(weeks=i) for i in range(periods - 1, -1, -1)]
+    return [_period_bounds(period_type, start) for start in starts]
 
 
 def _period_label(period_type: str, start: date) -> str:
@@ -87,52 +85,330 @@ def _period_label(period_type: str, start: date) -> str:
     return start.strftime("%d %b %Y")
 
 
-def _compute_spent(
-    db: Session,
-    user_id: str,
-    category_ids: list[str],
-    budget_type: str,
-    budget_currency: str,
-    period_start: date,
-    period_end: date,
-) -> float:
-    """Sum transactions for the given categories, converted to budget_currency."""
-    if not category_ids:
-        return 0.0
+class CountedTransaction(NamedTuple):
+    """The fields of a transaction that budgets count."""
 
-    start_dt = datetime(period_start.year, period_start.month, period_start.day, tzinfo=UTC)
-    end_dt = datetime(period_end.year, period_end.month, period_end.day, 23, 59, 59, tzinfo=UTC)
+    user_id: uuid.UUID
+    category_id: uuid.UUID
+    timestamp: datetime
+    currency: str
+    amount: float
 
-    target_rate = (
-        db.query(ExchangeRate.rate_to_usd)
-        .filter(ExchangeRate.currency_code == budget_currency)
-        .scalar_subquery()
-    )
 
-    converted = case(
-        (
-            ExchangeRate.rate_to_usd.isnot(None),
-            Transaction.amount / ExchangeRate.rate_to_usd * target_rate,
-        ),
-        else_=Transaction.amount,
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def counted_transaction(tx) -> CountedTransaction | None:
+    """What `tx` (an ORM Transaction or an insert-row dict) contributes to budgets.
+
+    None for rows budgets ignore: opening balances, transfers, uncategorized.
+    """
+    if isinstance(tx, CountedTransaction) or tx is None:
+        return tx
+    get = tx.get if isinstance(tx, dict) else lambda key: getattr(tx, key, None)
+    if get("is_opening_balance") or get("is_transfer") or get("category_id") is None:
+        return None
+    return CountedTransaction(
+        user_id=_as_uuid(get("user_id")),
+        category_id=_as_uuid(get("category_id")),
+        timestamp=get("timestamp"),
+        currency=get("currency") or "USD",
+        amount=float(get("amount") or 0),
     )
 
-    result = (
-        db.query(func.coalesce(func.sum(converted), 0))
+
+def _progress_period(period_type: str, start: date | None, end: date | None, day: date):
+    """Key of the budget_progress row a transaction on local `day` lands in, or None."""
+    if period_type == "custom":
+        if start and end and start <= day <= end:
+            return start
+        return None
+    return _period_bounds(period_type, day)[0]
+
+
+def _local_day(ts: datetime, zone) -> date:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.astimezone(zone).date()
+
+
+def _add_progress(db: Session, totals: dict[tuple[uuid.UUID, date, str], float]) -> None:
+    """Add `totals` to budget_progress rows, creating missing rows (one statement)."""
+    rows = [
+        {"budget_id": budget_id, "period_start": start, "currency": ccy, "spent": amount}
+        for (budget_id, start, ccy), amount in totals.items()
+        if amount
+    ]
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = BudgetProgress.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.budget_id, table.c.period_start, table.c.currency],
+        set_={"spent": table.c.spent + stmt.excluded.spent},
+    )
+    db.execute(stmt, rows)
+
+
+def record_transaction_changes(db: Session, removed=(), added=()) -> None:
+    """Apply transaction writes to budget_progress, in the caller's DB transaction.
+
+    `removed` are the rows as they were before the write (deleted rows, or the
+    old version of updated rows) and `added` the rows as they are after it
+    (created rows, or the new version). Items may be ORM transactions, insert
+    row dicts or CountedTransaction snapshots. Costs one query to find the
+    budgets covering the categories involved, plus one upsert if any do.
+    """
+    changes = [(tx, -1.0) for tx in map(counted_transaction, removed) if tx] + [
+        (tx, 1.0) for tx in map(counted_transaction, added) if tx
+    ]
+    if not changes:
+        return
+    budgets = (
+        db.query(
+            Budget.id,
+            Budget.user_id,
+            Budget.period_type,
+            Budget.start_date,
+            Budget.end_date,
+            BudgetCategory.category_id,
+            User.timezone,
+        )
+        .join(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+        .join(Category, Category.id == BudgetCategory.category_id)
+        .join(User, User.id == Budget.user_id)
+        .filter(
+            BudgetCategory.category_id.in_({tx.category_id for tx, _ in changes}),
+            Budget.user_id.in_({tx.user_id for tx, _ in changes}),
+            Category.type == Budget.budget_type,
+        )
+        .all()
+    )
+    if not budgets:
+        return
+    covering = defaultdict(list)
+    for b in budgets:
+        covering[(b.user_id, b.category_id)].append(b)
+
+    totals: dict[tuple[uuid.UUID, date, str], float] = defaultdict(float)
+    for tx, sign in changes:
+        for b in covering.get((tx.user_id, tx.category_id), ()):
+            day = _local_day(tx.timestamp, _zone(b.timezone))
+            start = _progress_period(b.period_type, b.start_date, b.end_date, day)
+            if start is not None:
+                totals[(b.id, start, tx.currency)] += sign * tx.amount
+    _add_progress(db, totals)
+
+
+def rebuild_progress(
+    db: Session,
+    *,
+    user_id: str | uuid.UUID | None = None,
+    budget_ids: list | None = None,
+    chunk_size: int = 500,
+) -> int:
+    """Recompute budget_progress from the ledger. Returns the number of budgets rebuilt.
+
+    Scoped to `budget_ids`, or to one user's budgets, or everything. Used when
+    membership changes (a budget's categories, period or type, the owner's
+    timezone) and by `python -m app.commands.rebuild_budget_progress`.
+    """
+    query = db.query(
+        Budget.id, Budget.period_type, Budget.start_date, Budget.end_date, User.timezone
+    ).join(User, User.id == Budget.user_id)
+    if budget_ids is not None:
+        query = query.filter(Budget.id.in_([_as_uuid(b) for b in budget_ids]))
+    if user_id is not None:
+        query = query.filter(Budget.user_id == _as_uuid(user_id))
+    budgets = query.order_by(Budget.id).all()
+
+    for i in range(0, len(budgets), chunk_size):
+        chunk = {b.id: b for b in budgets[i : i + chunk_size]}
+        db.query(BudgetProgress).filter(BudgetProgress.budget_id.in_(chunk)).delete(
+            synchronize_session=False
+        )
+        rows = (
+            db.query(
+                BudgetCategory.budget_id,
+                Transaction.timestamp,
+                Transaction.currency,
+                Transaction.amount,
+            )
+            .join(Budget, Budget.id == BudgetCategory.budget_id)
+            .join(
+                Transaction,
+                (Transaction.category_id == BudgetCategory.category_id)
+                & (Transaction.user_id == Budget.user_id),
+            )
+            .join(Category, Category.id == Transaction.category_id)
+            .filter(
+                BudgetCategory.budget_id.in_(chunk),
+                Category.type == Budget.budget_type,
+                Transaction.is_opening_balance == sa_false(),
+                Transaction.is_transfer == sa_false(),
+            )
+            .yield_per(5000)
+        )
+        totals: dict[tuple[uuid.UUID, date, str], float] = defaultdict(float)
+        for budget_id, ts, ccy, amount in rows:
+            b = chunk[budget_id]
+            day = _local_day(ts, _zone(b.timezone))
+            start = _progress_period(b.period_type, b.start_date, b.end_date, day)
+            if start is not None:
+                totals[(budget_id, start, ccy)] += float(amount or 0)
+        _add_progress(db, totals)
+    return len(budgets)
+
+
+def rebuild_category_budgets(db: Session, category_ids: list) -> int:
+    """Rebuild progress of the budgets tracking any of `category_ids`.
+
+    Budgets only count categories of their own type, so changing a category's
+    type changes which budgets its existing transactions belong to.
+    """
+    if not category_ids:
+        return 0
+    budget_ids = [
+        budget_id
+        for (budget_id,) in db.query(BudgetCategory.budget_id)
+        .filter(BudgetCategory.category_id.in_([_as_uuid(c) for c in category_ids]))
+        .distinct()
+    ]
+    if not budget_ids:
+        return 0
+    return rebuild_progress(db, budget_ids=budget_ids)
+
+
+def _progress_spent(
+    db: Session, keys: list[tuple[Budget, date]], rates: dict[str, float] | None = None
+) -> list[float]:
+    """Spend of each (budget, period start) from budget_progress, in one query.
+
+    Rows are per transaction currency; they are converted to the budget's
+    currency against one rates snapshot, loaded only if needed.
+    """
+    if not keys:
+        return []
+    rows = (
+        db.query(
+            BudgetProgress.budget_id,
+            BudgetProgress.period_start,
+            BudgetProgress.currency,
+            BudgetProgress.spent,
+        )
+        .filter(
+            BudgetProgress.budget_id.in_({b.id for b, _ in keys}),
+            BudgetProgress.period_start.in_({start for _, start in keys}),
+        )
+        .all()
+    )
+    index = {(b.id, start): i for i, (b, start) in enumerate(keys)}
+    currencies = [b.currency for b, _ in keys]
+    matched = [
+        (index[(bid, start)], ccy, spent)
+        for bid, start, ccy, spent in rows
+        if (bid, start) in index
+    ]
+    if rates is None and any(ccy != currencies[i] for i, ccy, _ in matched):
+        rates = get_rates_from_db(db)
+
+    totals = [0.0] * len(keys)
+    for i, ccy, spent in matched:
+        totals[i] += _convert(float(spent or 0), ccy, currencies[i], rates or {})
+    return totals
+
+
+def _convert(amount: float, from_ccy: str, to_ccy: str, rates: dict[str, float]) -> float:
+    """Convert via USD; amounts in currencies without a rate are taken as-is."""
+    if from_ccy == to_ccy:
+        return amount
+    src, dst = rates.get(from_ccy), rates.get(to_ccy)
+    if not src or not dst:
+        return amount
+    return amount / src * dst
+
+
+def _spent_by_bucket(
+    db: Session,
+    user_id: str,
+    budgets: list[Budget],
+    period_type: str,
+    tz: str | None,
+    first: date,
+    last: date,
+    rates: dict[str, float] | None = None,
+) -> dict[tuple[str, date], float]:
+    """Spend per (budget id, period start) for weekly or monthly `budgets`, in one query.
+
+    Each transaction is bucketed by the start of the period containing its
+    timestamp in the user's timezone. PostgreSQL buckets and sums in SQL
+    (`date_trunc` on the local timestamp, Monday-based weeks); SQLite has no
+    timezone support, so its rows are bucketed the same way in Python. Only
+    periods starting in [first, last] are covered. Amounts are converted to
+    each budget's currency with one rates snapshot.
+    """
+    if not budgets:
+        return {}
+    zone = _zone(tz)
+    _, last_end = _period_bounds(period_type, last)
+    lower = datetime.combine(first, time(0), tzinfo=zone).astimezone(UTC)
+    upper = datetime.combine(last_end + timedelta(days=1), time(0), tzinfo=zone).astimezone(UTC)
+    currencies = {str(b.id): b.currency for b in budgets}
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if postgres:
+        local_ts = func.timezone(str(zone), Transaction.timestamp)
+        bucket = func.date_trunc("month" if period_type == "monthly" else "week", local_ts)
+        columns = (
+            BudgetCategory.budget_id,
+            bucket,
+            Transaction.currency,
+            func.sum(Transaction.amount),
+        )
+    else:
+        columns = (
+            BudgetCategory.budget_id,
+            Transaction.timestamp,
+            Transaction.currency,
+            Transaction.amount,
+        )
+    query = (
+        db.query(*columns)
+        .join(Budget, Budget.id == BudgetCategory.budget_id)
+        .join(Transaction, Transaction.category_id == BudgetCategory.category_id)
         .join(Category, Transaction.category_id == Category.id)
-        .outerjoin(ExchangeRate, ExchangeRate.currency_code == Transaction.currency)
         .filter(
+            BudgetCategory.budget_id.in_([b.id for b in budgets]),
             Transaction.user_id == user_id,
-            Transaction.category_id.in_(category_ids),
-            Category.type == budget_type,
-            Transaction.timestamp >= start_dt,
-            Transaction.timestamp <= end_dt,
+            Category.type == Budget.budget_type,
+            Transaction.timestamp >= lower,
+            Transaction.timestamp < upper,
             Transaction.is_opening_balance == sa_false(),
             Transaction.is_transfer == sa_false(),
         )
-        .scalar()
     )
-    return float(result or 0)
+    if postgres:
+        query = query.group_by(BudgetCategory.budget_id, bucket, Transaction.currency)
+    rows = query.all()
+
+    if rates is None and any(ccy != currencies[str(bid)] for bid, _, ccy, _ in rows):
+        rates = get_rates_from_db(db)
+
+    totals: dict[tuple[str, date], float] = defaultdict(float)
+    for budget_id, when, ccy, amount in rows:
+        if postgres:
+            start = when.date() if isinstance(when, datetime) else when
+        else:
+            ts = when if when.tzinfo else when.replace(tzinfo=UTC)
+            start, _ = _period_bounds(period_type, ts.astimezone(zone).date())
+        key = (str(budget_id), start)
+        totals[key] += _convert(float(amount or 0), ccy, currencies[str(budget_id)], rates or {})
+    return totals
 
 
 def _budget_to_schema(
@@ -180,7 +456,6 @@ class BudgetService:
         return budget
 
     async def get_budgets(self, user_id: str) -> list[BudgetSchema]:
-        tz = self._user_timezone(user_id)
         budgets = (
             self.db.query(Budget)
             .options(selectinload(Budget.categories))
@@ -188,22 +463,19 @@ class BudgetService:
             .order_by(Budget.created_at)
             .all()
         )
-
-        result = []
-        for b in budgets:
-            if b.period_type == "custom":
-                period_start = b.start_date or date.today()
-                period_end = b.end_date or date.today()
-            else:
-                period_start, period_end = _current_period(b.period_type, tz)
-
-            cat_ids = [str(bc.category_id) for bc in b.categories]
-            spent = _compute_spent(
-                self.db, user_id, cat_ids, b.budget_type, b.currency, period_start, period_end
-            )
-            result.append(_budget_to_schema(b, cat_ids, spent, period_start, period_end))
-
-        return result
+        return self._evaluate(user_id, budgets)
+
+    def _evaluate(self, user_id: str, budgets: list[Budget]) -> list[BudgetSchema]:
+        """Schemas for `budgets` with current-period spend, read from budget_progress."""
+        today = _local_today(self._user_timezone(user_id))
+        periods = [_budget_period(b, today) for b in budgets]
+        spent = _progress_spent(
+            self.db, [(b, start) for b, (start, _) in zip(budgets, periods, strict=True)]
+        )
+        return [
+            _budget_to_schema(b, [str(bc.category_id) for bc in b.categories], total, start, end)
+            for b, total, (start, end) in zip(budgets, spent, periods, strict=True)
+        ]
 
     async def create_budget(self, user_id: str, data: BudgetCreateRequest) -> BudgetSchema:
         if data.period_type == "custom":
@@ -230,27 +502,12 @@ class BudgetService:
 
         for cid in data.category_ids:
             self.db.add(BudgetCategory(budget_id=budget.id, category_id=cid))
+        self.db.flush()
+        rebuild_progress(self.db, budget_ids=[budget.id])
 
         self.db.commit()
         self.db.refresh(budget)
-
-        tz = self._user_timezone(user_id)
-        if budget.period_type == "custom":
-            period_start = budget.start_date or date.today()
-            period_end = budget.end_date or date.today()
-        else:
-            period_start, period_end = _current_period(budget.period_type, tz)
-
-        spent = _compute_spent(
-            self.db,
-            user_id,
-            data.category_ids,
-            budget.budget_type,
-            budget.currency,
-            period_start,
-            period_end,
-        )
-        return _budget_to_schema(budget, data.category_ids, spent, period_start, period_end)
+        return self._evaluate(user_id, [budget])[0]
 
     async def update_budget(
         self, user_id: str, budget_id: str, data: BudgetUpdateRequest
@@ -285,32 +542,21 @@ class BudgetService:
                 detail="start_date and end_date are required for custom budgets",
             )
 
+        membership = (
+            data.category_ids,
+            data.period_type,
+            data.budget_type,
+            data.start_date,
+            data.end_date,
+        )
+        if any(field is not None for field in membership):
+            self.db.flush()
+            rebuild_progress(self.db, budget_ids=[budget.id])
+
         budget.updated_at = datetime.now(UTC)
         self.db.commit()
         self.db.refresh(budget)
-
-        tz = self._user_timezone(user_id)
-        if budget.period_type == "custom":
-            period_start = budget.start_date or date.today()
-            period_end = budget.end_date or date.today()
-        else:
-            period_start, period_end = _current_period(budget.period_type, tz)
-
-        cat_ids = (
-            data.category_ids
-            if data.category_ids is not None
-            else [str(bc.category_id) for bc in budget.categories]
-        )
-        spent = _compute_spent(
-            self.db,
-            user_id,
-            cat_ids,
-            budget.budget_type,
-            budget.currency,
-            period_start,
-            period_end,
-        )
-        return _budget_to_schema(budget, cat_ids, spent, period_start, period_end)
+        return self._evaluate(user_id, [budget])[0]
 
     async def delete_budget(self, user_id: str, budget_id: str) -> None:
         budget = (
@@ -325,21 +571,12 @@ class BudgetService:
         self, user_id: str, budget_id: str, periods: int = 6
     ) -> BudgetHistoryResponse:
         budget = self._load_budget(user_id, budget_id)
-        cat_ids = [str(bc.category_id) for bc in budget.categories]
         tz = self._user_timezone(user_id)
 
         if budget.period_type == "custom":
             period_start = budget.start_date or date.today()
             period_end = budget.end_date or date.today()
-            spent = _compute_spent(
-                self.db,
-                user_id,
-                cat_ids,
-                budget.budget_type,
-                budget.currency,
-                period_start,
-                period_end,
-            )
+            spent = _progress_spent(self.db, [(budget, period_start)])[0]
             return BudgetHistoryResponse(
                 budget_id=str(budget.id),
                 budget_name=budget.name,
@@ -356,32 +593,61 @@ class BudgetService:
                 ],
             )
 
-        history: list[BudgetHistoryPeriod] = []
-        for i in range(periods - 1, -1, -1):
-            p_start, p_end = _period_start_for_offset(budget.period_type, tz, i)
-            spent = _compute_spent(
-                self.db,
-                user_id,
-                cat_ids,
-                budget.budget_type,
-                budget.currency,
-                p_start,
-                p_end,
-            )
-            history.append(
-                BudgetHistoryPeriod(
-                    period_label=_period_label(budget.period_type, p_start),
-                    period_start=p_start,
-                    period_end=p_end,
-                    budgeted=budget.amount,
-                    spent=spent,
+        return self._histories(user_id, [budget], periods, tz)[0]
+
+    def _histories(
+        self, user_id: str, budgets: list[Budget], periods: int, tz: str | None
+    ) -> list[BudgetHistoryResponse]:
+        """Histories for weekly/monthly `budgets`: one spend query per period type."""
+        today = _local_today(tz)
+        spent: dict[tuple[str, date], float] = {}
+        bounds: dict[str, list[tuple[date, date]]] = {}
+        for period_type in {b.period_type for b in budgets}:
+            bounds[period_type] = _history_periods(period_type, today, periods)
+            spent.update(
+                _spent_by_bucket(
+                    self.db,
+                    user_id,
+                    [b for b in budgets if b.period_type == period_type],
+                    period_type,
+                    tz,
+                    bounds[period_type][0][0],
+                    bounds[period_type][-1][0],
                 )
             )
 
-        return BudgetHistoryResponse(
-            budget_id=str(budget.id),
-            budget_name=budget.name,
-            currency=budget.currency,
-            budget_type=budget.budget_type,
-            periods=history,
+        return [
+            BudgetHistoryResponse(
+                budget_id=str(b.id),
+                budget_name=b.name,
+                currency=b.currency,
+                budget_type=b.budget_type,
+                periods=[
+                    BudgetHistoryPeriod(
+                        period_label=_period_label(b.period_type, p_start),
+                        period_start=p_start,
+                        period_end=p_end,
+                        budgeted=b.amount,
+                        spent=spent.get((str(b.id), p_start), 0.0),
+                    )
+                    for p_start, p_end in bounds[b.period_type]
+                ],
+            )
+            for b in budgets
+        ]
+
+    async def get_all_histories(
+        self, user_id: str, periods: int = 6
+    ) -> list[BudgetHistoryResponse]:
+        """History of every active weekly/monthly budget, for the dashboard widget."""
+        budgets = (
+            self.db.query(Budget)
+            .filter(
+                Budget.user_id == user_id,
+                Budget.is_active,
+                Budget.period_type != "custom",
+            )
+            .order_by(Budget.created_at)
+            .all()
         )
+        return self._histories(user_id, budgets, periods, self._user_timezone(user_id))
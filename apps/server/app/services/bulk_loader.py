@@ -0,0 +1,281 @@
+"""Set-based bulk loading of transactions (imports, restores, seeding).
+
+On PostgreSQL rows are streamed with `COPY ... FROM STDIN` into a temporary
+staging table, then merged into `transactions` with a single
+INSERT ... SELECT that resolves account and category references, skips
+hashes already present (`ON CONFLICT (hash) DO NOTHING`) and fills
+`inserted_at`. Nothing is built per row on the ORM side, so a load costs a
+handful of statements whatever its size.
+
+On SQLite (tests, local dev) references are resolved in Python and rows go
+through one executemany insert with the same conflict handling.
+
+Rows are dicts keyed by `transactions` columns. Instead of `account_id` a row
+may give `account_ref` (the account name); instead of `category_id` it may
+give `category_ref` (slug or name) plus `category_type`. User categories win
+over system ones with the same name. Rows whose references do not resolve are
+skipped and counted. Budget progress is updated for the inserted rows; the
+caller commits.
+"""
+
+import csv
+import io
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Category, Transaction
+from app.services.budget_service import record_transaction_changes
+
+STAGING_TABLE = "_bulk_transactions"
+
+# Staging columns and their PostgreSQL types, in COPY order.
+STAGING_COLUMNS = (
+    ("ord", "bigint"),
+    ("id", "uuid"),
+    ("user_id", "uuid"),
+    ("account_id", "uuid"),
+    ("account_ref", "text"),
+    ("category_id", "uuid"),
+    ("category_ref", "text"),
+    ("category_type", "text"),
+    ("amount", "double precision"),
+    ("currency", "text"),
+    ("notes", "text"),
+    ("merchant", "text"),
+    ("timestamp", "timestamptz"),
+    ("inserted_at", "timestamptz"),
+    ("hash", "text"),
+    ("is_opening_balance", "boolean"),
+    ("is_transfer", "boolean"),
+    ("transfer_direction", "text"),
+    ("recurring_rule_id", "uuid"),
+)
+_STAGED = [name for name, _ in STAGING_COLUMNS]
+
+# Columns handed back for each inserted row (enough for budget progress and
+# for callers that re-link rows by hash).
+RETURNED_COLUMNS = (
+    "id",
+    "hash",
+    "user_id",
+    "category_id",
+    "timestamp",
+    "currency",
+    "amount",
+    "is_opening_balance",
+    "is_transfer",
+)
+
+_MERGE_SQL = f"""
+INSERT INTO transactions (
+    id, user_id, account_id, category_id, amount, currency, notes, merchant,
+    "timestamp", inserted_at, updated_at, hash, is_opening_balance, is_transfer,
+    transfer_direction, recurring_rule_id
+)
+SELECT
+    s.id, s.user_id, COALESCE(s.account_id, a.id), COALESCE(s.category_id, c.id),
+    s.amount, COALESCE(s.currency, 'USD'), COALESCE(s.notes, ''), s.merchant,
+    s."timestamp", COALESCE(s.inserted_at, now()), now(), s.hash,
+    COALESCE(s.is_opening_balance, false), COALESCE(s.is_transfer, false),
+    s.transfer_direction, s.recurring_rule_id
+FROM {STAGING_TABLE} s
+LEFT JOIN accounts a
+    ON s.account_id IS NULL AND a.user_id = s.user_id AND a.name = s.account_ref
+LEFT JOIN LATERAL (
+    SELECT cat.id FROM categories cat
+    WHERE s.category_id IS NULL
+      AND cat.type = s.category_type
+      AND ((cat.user_id = s.user_id AND cat.deleted_at IS NULL) OR cat.user_id IS NULL)
+      AND (cat.slug = s.category_ref OR lower(cat.name) = lower(s.category_ref))
+    ORDER BY cat.user_id IS NULL
+    LIMIT 1
+) c ON s.category_ref IS NOT NULL
+WHERE COALESCE(s.account_id, a.id) IS NOT NULL
+  AND (s.category_ref IS NULL OR COALESCE(s.category_id, c.id) IS NOT NULL)
+ORDER BY s.ord
+ON CONFLICT (hash) DO NOTHING
+RETURNING {", ".join(f'"{c}"' for c in RETURNED_COLUMNS)}
+"""
+
+_UNRESOLVED_SQL = f"""
+SELECT count(*) FROM {STAGING_TABLE} s
+WHERE (s.account_id IS NULL AND NOT EXISTS (
+        SELECT 1 FROM accounts a WHERE a.user_id = s.user_id AND a.name = s.account_ref))
+   OR (s.category_id IS NULL AND s.category_ref IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM categories c
+        WHERE c.type = s.category_type
+          AND ((c.user_id = s.user_id AND c.deleted_at IS NULL) OR c.user_id IS NULL)
+          AND (c.slug = s.category_ref OR lower(c.name) = lower(s.category_ref))))
+"""
+
+
+@dataclass
+class LoadResult:
+    inserted: list[dict] = field(default_factory=list)
+    # Rows skipped because their hash already exists (or repeats within the load).
+    duplicates: int = 0
+    # Rows skipped because their account or category reference did not resolve.
+    unresolved: int = 0
+
+    @property
+    def staged(self) -> int:
+        return len(self.inserted) + self.duplicates + self.unresolved
+
+
+def _staging_row(ord_: int, row: dict) -> tuple:
+    values = {**row, "ord": ord_, "id": row.get("id") or uuid.uuid4()}
+    return tuple(values.get(name) for name in _STAGED)
+
+
+class _CopyStream(io.TextIOBase):
+    """File-like view of rows as COPY CSV, produced as COPY reads it."""
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        # QUOTE_NOTNULL: None is written bare (NULL to COPY), '' stays an empty string.
+        self._writer = csv.writer(self._buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n")
+        self._pending = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            batch = [row for _, row in zip(range(500), self._rows, strict=False)]
+            if not batch:
+                break
+            self._writer.writerows(batch)
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        if size < 0:
+            size = len(self._pending)
+        out, self._pending = self._pending[:size], self._pending[size:]
+        return out
+
+
+def _load_postgres(db: Session, rows: Iterator[dict]) -> LoadResult:
+    conn = db.connection()
+    columns = ", ".join(f'"{name}" {kind}' for name, kind in STAGING_COLUMNS)
+    conn.execute(
+        text(f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ({columns}) ON COMMIT DELETE ROWS")
+    )
+    conn.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+    quoted = ", ".join(f'"{name}"' for name in _STAGED)
+    staged = 0
+
+    def staging_rows():
+        nonlocal staged
+        for staged, row in enumerate(rows, start=1):  # noqa: B007
+            yield _staging_row(staged, row)
+
+    # psycopg2 reads the stream in blocks, so rows are never all in memory at once.
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({quoted}) FROM STDIN WITH (FORMAT csv)",
+            _CopyStream(staging_rows()),
+        )
+    inserted = [dict(r._mapping) for r in conn.execute(text(_MERGE_SQL))]
+    unresolved = conn.execute(text(_UNRESOLVED_SQL)).scalar() or 0
+    conn.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+    return LoadResult(
+        inserted=inserted,
+        duplicates=staged - len(inserted) - unresolved,
+        unresolved=unresolved,
+    )
+
+
+def _load_sqlite(db: Session, rows: Iterator[dict]) -> LoadResult:
+    from sqlalchemy.dialects.sqlite import insert as upsert
+
+    rows = list(rows)
+    user_ids = {row["user_id"] for row in rows}
+    accounts = {}
+    if any(not row.get("account_id") for row in rows):
+        accounts = {
+            (str(a.user_id), a.name): a.id
+            for a in db.query(Account).filter(Account.user_id.in_(user_ids))
+        }
+    categories: dict[tuple[str, str, str], uuid.UUID] = {}
+    if any(not row.get("category_id") and row.get("category_ref") for row in rows):
+        visible = (
+            db.query(Category)
+            .filter(
+                (Category.user_id.in_(user_ids) & Category.deleted_at.is_(None))
+                | Category.user_id.is_(None)
+            )
+            .order_by(Category.user_id.is_(None))
+        )
+        for c in visible:
+            for user_id in [str(c.user_id)] if c.user_id else map(str, user_ids):
+                categories.setdefault((user_id, c.type, c.slug), c.id)
+                categories.setdefault((user_id, c.type, c.name.lower()), c.id)
+
+    now = datetime.now(UTC)
+    resolved = []
+    unresolved = 0
+    for row in rows:
+        user_id = str(row["user_id"])
+        account_id = row.get("account_id") or accounts.get((user_id, row.get("account_ref")))
+        category_id = row.get("category_id")
+        if category_id is None and row.get("category_ref"):
+            ref, cat_type = row["category_ref"], row.get("category_type")
+            category_id = categories.get((user_id, cat_type, ref)) or categories.get(
+                (user_id, cat_type, ref.lower())
+            )
+            if category_id is None:
+                unresolved += 1
+                continue
+        if account_id is None:
+            unresolved += 1
+            continue
+        resolved.append(
+            {
+                "id": row.get("id") or uuid.uuid4(),
+                "user_id": row["user_id"],
+                "account_id": account_id,
+                "category_id": category_id,
+                "amount": row["amount"],
+                "currency": row.get("currency") or "USD",
+                "notes": row.get("notes") or "",
+                "merchant": row.get("merchant"),
+                "timestamp": row["timestamp"],
+                "inserted_at": row.get("inserted_at") or now,
+                "updated_at": now,
+                "hash": row.get("hash"),
+                "is_opening_balance": bool(row.get("is_opening_balance")),
+                "is_transfer": bool(row.get("is_transfer")),
+                "transfer_direction": row.get("transfer_direction"),
+                "recurring_rule_id": row.get("recurring_rule_id"),
+            }
+        )
+    if not resolved:
+        return LoadResult(unresolved=unresolved)
+
+    table = Transaction.__table__
+    stmt = upsert(table).on_conflict_do_nothing(index_elements=[table.c.hash])
+    inserted_ids = {i for (i,) in db.execute(stmt.returning(table.c.id), resolved)}
+    inserted = [
+        {key: row[key] for key in RETURNED_COLUMNS} for row in resolved if row["id"] in inserted_ids
+    ]
+    return LoadResult(
+        inserted=inserted,
+        duplicates=len(resolved) - len(inserted),
+        unresolved=unresolved,
+    )
+
+
+def load_transactions(db: Session, rows: Iterable[dict]) -> LoadResult:
+    """Insert `rows` into transactions in one set-based load; see the module docstring."""
+    if db.get_bind().dialect.name == "postgresql":
+        result = _load_postgres(db, iter(rows))
+    else:
+        result = _load_sqlite(db, iter(rows))
+    record_transaction_changes(db, added=result.inserted)
+    return result
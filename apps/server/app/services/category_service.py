@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.db.models import Category, RecurringRule, UserCategoryPreference
 from app.db.schemas import CategoryCreateRequest, CategorySchema, CategoryUpdateRequest
+from app.services.budget_service import rebuild_category_budgets
 
 
 class CategoryService:
@@ -44,7 +45,7 @@ class CategoryService:
 
     async def create_category(self, user_id: str, data: CategoryCreateRequest) -> CategorySchema:
         """Create a custom category (max 20 per user). If a soft-deleted category with the same slug exists, restores it."""
-        slug = _generate_slug(data.name)
+        slug = generate_slug(data.name)
 
         existing = (
             self.db.query(Category)
@@ -55,6 +56,7 @@ class CategoryService:
         if existing:
             if existing.deleted_at is not None:
                 # Restore the soft-deleted category with updated fields
+                type_changed = existing.type != data.type
                 existing.deleted_at = None
                 existing.name = data.name
                 existing.color_light = data.color_light
@@ -62,6 +64,9 @@ class CategoryService:
                 existing.type = data.type
                 existing.alias = data.alias.upper() if data.alias else None
                 existing.is_active = True
+                if type_changed:
+                    self.db.flush()
+                    rebuild_category_budgets(self.db, [existing.id])
                 self.db.commit()
                 self.db.refresh(existing)
                 return _to_schema(existing, existing.is_active)
@@ -118,11 +123,12 @@ class CategoryService:
 
         if data.name is not None:
             category.name = data.name
-            category.slug = _generate_slug(data.name)
+            category.slug = generate_slug(data.name)
         if data.color_light is not None:
             category.color_light = data.color_light
         if data.color_dark is not None:
             category.color_dark = data.color_dark
+        type_changed = data.type is not None and data.type != category.type
         if data.type is not None:
             category.type = data.type
         if data.alias is not None:
@@ -135,6 +141,9 @@ class CategoryService:
                 )
             category.alias = alias_upper
 
+        if type_changed:
+            self.db.flush()
+            rebuild_category_budgets(self.db, [category.id])
         self.db.commit()
         self.db.refresh(category)
         return _to_schema(category, category.is_active)
@@ -198,7 +207,7 @@ class CategoryService:
         return {"is_active": new_state}
 
 
-def _generate_slug(name: str) -> str:
+def generate_slug(name: str) -> str:
     slug = name.lower().strip()
     slug = re.sub(r"[^a-z0-9\s-]", "", slug)
     slug = re.sub(r"[\s]+", "-", slug)
@@ -25,6 +25,7 @@ from app.db.schemas import (
     WeekdayHeatmapCell,
     WeekdayHeatmapResponse,
 )
+from app.metrics import record_cache_lookup
 
 _user_cache: dict[str, tuple[str, datetime]] = {}
 _user_cache_lock = threading.Lock()
@@ -41,8 +42,10 @@ def _get_user_currency(user_id: str, db: Session) -> tuple[str, bool]:
         if cached:
             currency, cached_at = cached
             if (now - cached_at).total_seconds() < USER_CACHE_TTL_SECONDS:
+                record_cache_lookup("dashboard_user_currency", hit=True)
                 return currency, True
 
+    record_cache_lookup("dashboard_user_currency", hit=False)
     user = db.query(User).filter(User.id == user_id).first()
     currency = user.preferred_currency if user else "USD"
 
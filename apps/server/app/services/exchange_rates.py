@@ -6,6 +6,7 @@ import httpx
 from sqlalchemy.orm import Session
 
 from app.db.models import ExchangeRate
+from app.metrics import record_cache_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,7 @@ def get_rates_from_db(db: Session, use_cache: bool = True) -> dict[str, float]:
     """
     if use_cache:
         cached = _get_cached_rates()
+        record_cache_lookup("exchange_rates", hit=cached is not None)
         if cached is not None:
             return cached
 
@@ -1,15 +1,25 @@
 import threading
+import uuid
 from datetime import UTC, datetime
 
 from fastapi import HTTPException
-from sqlalchemy import case, func, or_
+from sqlalchemy import case, func, insert, or_
 from sqlalchemy import false as sa_false
 from sqlalchemy.orm import Session, joinedload
 
-from app.db.models import Account, Category, ExchangeRate, Transaction, User
+from app.db.models import (
+    Account,
+    Category,
+    ExchangeRate,
+    Transaction,
+    TransactionTombstone,
+    User,
+)
 from app.db.schemas import (
     AccountBalance,
     CategoryTotal,
+    ExpenseBulkCreateResponse,
+    ExpenseBulkItemResult,
     ExpenseCreateRequest,
     ExpenseSchema,
     ExpenseUpdateRequest,
@@ -18,6 +28,8 @@ from app.db.schemas import (
     SparklinePoint,
     SparklineResponse,
 )
+from app.metrics import record_cache_lookup
+from app.services.budget_service import counted_transaction, record_transaction_changes
 
 _user_cache: dict[str, tuple[str, datetime]] = {}
 _user_cache_lock = threading.Lock()
@@ -34,8 +46,10 @@ def _get_user_currency(user_id: str, db: Session) -> str:
         if cached:
             currency, cached_at = cached
             if (now - cached_at).total_seconds() < USER_CACHE_TTL_SECONDS:
+                record_cache_lookup("expense_user_currency", hit=True)
                 return currency
 
+    record_cache_lookup("expense_user_currency", hit=False)
     user = db.query(User).filter(User.id == user_id).first()
     currency = user.preferred_currency if user else "USD"
 
@@ -55,6 +69,37 @@ def invalidate_user_cache(user_id: str | None = None) -> None:
             _user_cache.clear()
 
 
+def _parse_uuid(value) -> uuid.UUID | None:
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _bulk_error(index: int, error: str) -> ExpenseBulkItemResult:
+    return ExpenseBulkItemResult(index=index, status="error", error=error)
+
+
+def _row_to_schema(row, category: Category, account: Account) -> ExpenseSchema:
+    """ExpenseSchema for a freshly inserted (non-transfer) row."""
+    return ExpenseSchema(
+        id=str(row.id),
+        amount=row.amount,
+        category_id=str(row.category_id),
+        category_name=category.name,
+        category_color_light=category.color_light,
+        category_color_dark=category.color_dark,
+        category_type=category.type,
+        description=row.notes or "",
+        merchant=row.merchant,
+        created_at=row.timestamp,
+        currency=row.currency,
+        is_opening_balance=row.is_opening_balance,
+        account_id=str(row.account_id),
+        account_name=account.name,
+    )
+
+
 class ExpenseService:
     def __init__(self, db: Session):
         self.db = db
@@ -82,8 +127,7 @@ class ExpenseService:
             return [], 0
 
         total = rows[0]._total
-        expenses = [self._to_schema(tx) for tx, _ in rows]
-        return expenses, total
+        return self._to_schemas([tx for tx, _ in rows]), total
 
     async def get_expenses(
         self,
@@ -704,11 +748,89 @@ class ExpenseService:
             is_opening_balance=data.is_opening_balance,
         )
         self.db.add(transaction)
+        record_transaction_changes(self.db, added=[transaction])
         self.db.commit()
         self.db.refresh(transaction)
 
         return self._to_schema(transaction)
 
+    async def create_expenses_bulk(
+        self, user_id: str, items: list[ExpenseCreateRequest]
+    ) -> ExpenseBulkCreateResponse:
+        """Create many expenses in one DB transaction, reporting a result per item.
+
+        Categories and accounts referenced by any item are validated with one
+        query each; items that fail validation are reported and skipped, the
+        rest go in as one multi-row INSERT ... RETURNING.
+        """
+        category_ids = {_parse_uuid(item.category_id) for item in items} - {None}
+        categories = {
+            c.id: c
+            for c in self.db.query(Category).filter(
+                Category.id.in_(category_ids),
+                ((Category.user_id == user_id) & Category.deleted_at.is_(None))
+                | Category.user_id.is_(None),
+            )
+        }
+        accounts = {
+            a.id: a
+            for a in self.db.query(Account)
+            .filter(Account.user_id == user_id)
+            .order_by(Account.display_order)
+        }
+        default_account = None
+        if any(not item.account_id for item in items):
+            default_id = self.db.query(User.default_account_id).filter(User.id == user_id).scalar()
+            default_account = accounts.get(default_id) or next(iter(accounts.values()), None)
+
+        now = datetime.now(UTC)
+        results: list[ExpenseBulkItemResult] = []
+        rows: list[dict] = []
+        for index, item in enumerate(items):
+            category = categories.get(_parse_uuid(item.category_id))
+            account = (
+                accounts.get(_parse_uuid(item.account_id)) if item.account_id else default_account
+            )
+            if category is None:
+                results.append(_bulk_error(index, "Category not found"))
+            elif account is None:
+                results.append(_bulk_error(index, "Account not found"))
+            else:
+                rows.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": _parse_uuid(user_id),
+                        "amount": item.amount,
+                        "category_id": category.id,
+                        "account_id": account.id,
+                        "notes": item.description,
+                        "merchant": item.merchant or None,
+                        "timestamp": item.created_at or now,
+                        "currency": item.currency,
+                        "is_opening_balance": item.is_opening_balance,
+                    }
+                )
+                results.append(ExpenseBulkItemResult(index=index, status="created"))
+
+        if rows:
+            table = Transaction.__table__
+            inserted = self.db.execute(
+                insert(table).returning(*table.c, sort_by_parameter_order=True), rows
+            ).all()
+            record_transaction_changes(self.db, added=rows)
+            self.db.commit()
+            created = iter(inserted)
+            for result in results:
+                if result.status == "created":
+                    row = next(created)
+                    result.expense = _row_to_schema(
+                        row, categories[row.category_id], accounts[row.account_id]
+                    )
+
+        return ExpenseBulkCreateResponse(
+            created=len(rows), failed=len(items) - len(rows), results=results
+        )
+
     async def update_expense(
         self, user_id: str, expense_id: str, data: ExpenseUpdateRequest
     ) -> ExpenseSchema:
@@ -720,6 +842,7 @@ class ExpenseService:
         )
         if not transaction:
             raise HTTPException(status_code=404, detail="Expense not found")
+        before = counted_transaction(transaction)
 
         if data.amount is not None:
             transaction.amount = data.amount
@@ -738,6 +861,9 @@ class ExpenseService:
         if data.account_id is not None:
             transaction.account_id = data.account_id
 
+        after = counted_transaction(transaction)
+        if after != before:
+            record_transaction_changes(self.db, removed=[before], added=[after])
         self.db.commit()
         self.db.refresh(transaction)
 
@@ -766,23 +892,46 @@ class ExpenseService:
                 transaction.linked_transaction_id = None
                 self.db.flush()
                 self.db.delete(linked)
+                self.db.add(TransactionTombstone(id=linked.id, user_id=linked.user_id))
 
+        record_transaction_changes(self.db, removed=[transaction])
         self.db.delete(transaction)
+        self.db.add(TransactionTombstone(id=transaction.id, user_id=transaction.user_id))
         self.db.commit()
         return True
 
-    def _to_schema(self, transaction: Transaction) -> ExpenseSchema:
+    def _linked_account_names(self, transactions: list[Transaction]) -> dict:
+        """Account name of the other leg of each outgoing transfer, in one query."""
+        linked_ids = [
+            tx.linked_transaction_id
+            for tx in transactions
+            if tx.is_transfer and tx.transfer_direction == "from" and tx.linked_transaction_id
+        ]
+        if not linked_ids:
+            return {}
+        return dict(
+            self.db.query(Transaction.id, Account.name)
+            .join(Account, Transaction.account_id == Account.id)
+            .filter(Transaction.id.in_(linked_ids))
+            .all()
+        )
+
+    def _to_schemas(self, transactions: list[Transaction]) -> list[ExpenseSchema]:
+        """Convert transactions (with category/account loaded) without a query per row."""
+        linked_names = self._linked_account_names(transactions)
+        return [self._to_schema(tx, linked_names) for tx in transactions]
+
+    def _to_schema(
+        self, transaction: Transaction, linked_account_names: dict | None = None
+    ) -> ExpenseSchema:
         """Convert a Transaction ORM object to ExpenseSchema"""
         cat = transaction.category_rel
         account = transaction.account_rel
+        if linked_account_names is None:
+            linked_account_names = self._linked_account_names([transaction])
         linked_account_name = None
         if transaction.is_transfer and transaction.transfer_direction == "from":
-            linked_account_name = (
-                self.db.query(Account.name)
-                .join(Transaction, Transaction.account_id == Account.id)
-                .filter(Transaction.id == transaction.linked_transaction_id)
-                .scalar()
-            )
+            linked_account_name = linked_account_names.get(transaction.linked_transaction_id)
         return ExpenseSchema(
             id=str(transaction.id),
             amount=transaction.amount,
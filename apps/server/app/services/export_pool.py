@@ -0,0 +1,132 @@
+"""Bounded worker pool for export jobs.
+
+Exports render on their own ThreadPoolExecutor so a few large dumps can never
+starve the default executor that FastAPI uses for sync dependencies and file
+responses. Admission is bounded twice: globally (workers + waiting queue) and
+per user (max jobs in flight). A rejected submit raises `ExportPoolSaturated`
+carrying a Retry-After estimate derived from recent job durations.
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.metrics import JOB_DURATION, JOB_WAIT
+
+# Used for Retry-After until the pool has finished at least one job.
+_DEFAULT_RUN_SECONDS = 5.0
+_MAX_RETRY_AFTER_SECONDS = 300
+_SAMPLE_SIZE = 100
+
+
+class ExportPoolSaturated(Exception):
+    """Raised when an export cannot be admitted. `retry_after` is in seconds."""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class ExportWorkerPool:
+    def __init__(self, workers: int, max_queue: int, max_per_user: int, kind: str = "export"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        # Job noun used in rejection messages and worker thread names.
+        self.kind = kind
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=kind)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._in_flight: dict[str, int] = defaultdict(int)
+        self._waits: deque[float] = deque(maxlen=_SAMPLE_SIZE)
+        self._runs: deque[float] = deque(maxlen=_SAMPLE_SIZE)
+
+    def submit(self, user_id: str, fn: Callable, *args) -> None:
+        """Admit `fn(*args)` for `user_id` or raise ExportPoolSaturated."""
+        with self._lock:
+            if self._in_flight[user_id] >= self.max_per_user:
+                raise ExportPoolSaturated(
+                    f"Too many {self.kind}s in progress (limit {self.max_per_user}). "
+                    "Wait for one to finish.",
+                    self._retry_after_locked(1),
+                )
+            if self._queued >= self.max_queue:
+                raise ExportPoolSaturated(
+                    f"{self.kind.capitalize()} queue is full. Try again shortly.",
+                    self._retry_after_locked(self._queued + 1),
+                )
+            self._in_flight[user_id] += 1
+            self._queued += 1
+
+        try:
+            self._executor.submit(self._run, user_id, time.monotonic(), fn, args)
+        except RuntimeError:
+            # Executor shut down (app stopping) - undo the reservation.
+            with self._lock:
+                self._queued -= 1
+                self._release_user_locked(user_id)
+            raise
+
+    def _run(self, user_id: str, enqueued_at: float, fn: Callable, args: tuple) -> None:
+        started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._waits.append(started_at - enqueued_at)
+        JOB_WAIT.observe(started_at - enqueued_at, pool=self.kind)
+        try:
+            fn(*args)
+        finally:
+            duration = time.monotonic() - started_at
+            with self._lock:
+                self._running -= 1
+                self._runs.append(duration)
+                self._release_user_locked(user_id)
+            JOB_DURATION.observe(duration, pool=self.kind)
+
+    def _release_user_locked(self, user_id: str) -> None:
+        self._in_flight[user_id] -= 1
+        if self._in_flight[user_id] <= 0:
+            del self._in_flight[user_id]
+
+    def _retry_after_locked(self, jobs_ahead: int) -> int:
+        avg_run = sum(self._runs) / len(self._runs) if self._runs else _DEFAULT_RUN_SECONDS
+        estimate = math.ceil(avg_run * jobs_ahead / max(self.workers, 1))
+        return max(1, min(estimate, _MAX_RETRY_AFTER_SECONDS))
+
+    def user_in_flight(self, user_id: str) -> int:
+        with self._lock:
+            return self._in_flight.get(user_id, 0)
+
+    def stats(self) -> dict:
+        """Snapshot of pool load. Wait/run figures cover the last 100 jobs."""
+        with self._lock:
+            waits = list(self._waits)
+            runs = list(self._runs)
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queue_depth": self._queued,
+                "max_queue": self.max_queue,
+                "max_per_user": self.max_per_user,
+                "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+                "max_wait_seconds": max(waits, default=0.0),
+                "avg_run_seconds": sum(runs) / len(runs) if runs else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton used by the exports router; sized from settings.
+export_pool = ExportWorkerPool(
+    workers=settings.EXPORT_WORKERS,
+    max_queue=settings.EXPORT_QUEUE_SIZE,
+    max_per_user=settings.EXPORT_MAX_PER_USER,
+)
@@ -1,27 +1,52 @@
+import asyncio
+import hashlib
+import importlib.util
+import json
 import os
 import tempfile
+import threading
 import uuid
+from collections import defaultdict
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 
 import sentry_sdk
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, joinedload
 
-from app.db.models import Account, Category, ExchangeRate, Export, Transaction, User
+from app.config import settings
+from app.db.models import (
+    Account,
+    Category,
+    ExchangeRate,
+    Export,
+    Transaction,
+    TransactionTombstone,
+    User,
+)
 from app.db.schemas import ExportCreateRequest
 
-try:
-    import scribe
+# The Rust extension is loaded on the first export rather than at startup;
+# checking that it is installed does not import it.
+scribe = None
+_RUST_AVAILABLE = importlib.util.find_spec("scribe") is not None
+
+
+def _scribe():
+    global scribe
+    if scribe is None:
+        import scribe as module
+
+        scribe = module
+    return scribe
 
-    _RUST_AVAILABLE = True
-except ImportError:
-    scribe = None
-    _RUST_AVAILABLE = False
 
 JOB_TTL_MINUTES = 30
 EXPORT_RETENTION_DAYS = 180
 USER_STORAGE_CAP_BYTES = 100 * 1024 * 1024  # 100 MB
+PROGRESS_BATCH_ROWS = 1000
+TERMINAL_STATUSES = ("done", "error")
 
 _SCOPE_LABELS = {
     "transactions": "Transactions",
@@ -31,12 +56,157 @@ _SCOPE_LABELS = {
 }
 
 
+COLUMNAR_FORMATS = ("parquet", "arrow")
+# Compressed CSV variants map to the codec scribe.compress_csv expects.
+CSV_CODECS = {"csv_gz": "gzip", "csv_zst": "zstd"}
+_FORMAT_EXTENSIONS = {"csv_gz": "csv.gz", "csv_zst": "csv.zst"}
+DELTA_FORMATS = ("csv", *COLUMNAR_FORMATS)
+DELTA_SCOPES = ("transactions", "full_dump")
+
+
+def export_extension(fmt: str, scope: str, delta: bool = False) -> str:
+    """File extension (no leading dot). Multi-file full dumps and deltas are zipped."""
+    if delta or (scope == "full_dump" and fmt in ("csv", *COLUMNAR_FORMATS)):
+        return "zip"
+    return _FORMAT_EXTENSIONS.get(fmt, fmt)
+
+
 def generate_default_name(fmt: str, scope: str) -> str:
     label = _SCOPE_LABELS.get(scope, scope.replace("_", " ").title())
     month = datetime.now(UTC).strftime("%b %Y")
     return f"{label} - {month}"
 
 
+def compute_export_fingerprint(db: Session, user_id: str, request: ExportCreateRequest) -> str:
+    """Hash of the request parameters plus a cheap version of the data they cover.
+
+    The data version is the row count and max inserted_at/updated_at of the
+    matching transactions, the user's account/category names (they appear in
+    rows) and preferred currency, and - for balance exports - the exchange-rate
+    refresh time plus the same version over all of the user's transactions,
+    since balances ignore the request filters. Any insert, edit, delete,
+    rename or currency change therefore yields a new fingerprint.
+    """
+    params = request.model_dump(mode="json", exclude={"name"})
+
+    def tx_version(*filters) -> list[str]:
+        row = (
+            db.query(
+                func.count(Transaction.id),
+                func.max(Transaction.inserted_at),
+                func.max(Transaction.updated_at),
+            )
+            .filter(Transaction.user_id == user_id, *filters)
+            .one()
+        )
+        return [str(v) for v in row]
+
+    preferred_currency = db.query(User.preferred_currency).filter(User.id == user_id).scalar()
+    accounts = (
+        db.query(Account.id, Account.name, Account.type)
+        .filter(Account.user_id == user_id)
+        .order_by(Account.id)
+        .all()
+    )
+    categories = (
+        db.query(Category.id, Category.name, Category.type)
+        .filter((Category.user_id == user_id) | Category.user_id.is_(None))
+        .order_by(Category.id)
+        .all()
+    )
+    rates_version = balances_version = None
+    if request.scope in ("accounts", "full_dump"):
+        rates_version = db.query(func.max(ExchangeRate.updated_at)).scalar()
+        balances_version = tx_version()
+
+    payload = json.dumps(
+        {
+            "user_id": str(user_id),
+            "params": params,
+            "transactions": tx_version(*_request_filters(request)),
+            "balances": balances_version,
+            "preferred_currency": preferred_currency,
+            "accounts": [[str(v) for v in row] for row in accounts],
+            "categories": [[str(v) for v in row] for row in categories],
+            "rates": str(rates_version),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _request_filters(request: ExportCreateRequest) -> list:
+    filters = []
+    if request.start_date:
+        filters.append(Transaction.timestamp >= request.start_date)
+    if request.end_date:
+        filters.append(Transaction.timestamp <= request.end_date)
+    if request.account_id:
+        filters.append(Transaction.account_id == request.account_id)
+    if request.category_id:
+        filters.append(Transaction.category_id == request.category_id)
+    if request.currency:
+        filters.append(Transaction.currency == request.currency)
+    return filters
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def resolve_delta_since(db: Session, user_id: str, request: ExportCreateRequest) -> datetime | None:
+    """Lower bound (UTC) for a delta export, or None for a regular export.
+
+    `since_export_id` may name a finished in-memory job or a stored export; its
+    snapshot is used. Raises LookupError if it does not belong to the user.
+
+    updated_at is stamped when the writing transaction starts, so a write that
+    began before a snapshot but committed after it carries an earlier time.
+    The bound therefore starts EXPORT_DELTA_OVERLAP_SECONDS before the previous
+    snapshot: re-sending rows the previous export already had is harmless
+    (consumers upsert by id), missing one for good is not.
+    """
+    if request.since is not None:
+        return _as_utc(request.since).replace(microsecond=0)
+    if request.since_export_id is None:
+        return None
+
+    overlap = timedelta(seconds=settings.EXPORT_DELTA_OVERLAP_SECONDS)
+    job = _jobs.get(request.since_export_id)
+    if job and job.user_id == user_id and job.status == "done" and job.snapshot_at:
+        return job.snapshot_at.replace(microsecond=0) - overlap
+
+    try:
+        export_id = uuid.UUID(request.since_export_id)
+    except ValueError:
+        raise LookupError("Export not found") from None
+    record = db.query(Export).filter(Export.id == export_id, Export.user_id == user_id).first()
+    if record is None:
+        raise LookupError("Export not found")
+    return _as_utc(record.snapshot_at or record.created_at).replace(microsecond=0) - overlap
+
+
+def _db_now(db: Session) -> datetime:
+    """Current time on the database clock, the one that stamps updated_at/deleted_at."""
+    return _as_utc(db.execute(select(func.now())).scalar_one())
+
+
+def find_reusable_export(db: Session, user_id: str, fingerprint: str) -> Export | None:
+    """Most recent non-expired stored export with the same fingerprint."""
+    return (
+        db.query(Export)
+        .filter(
+            Export.user_id == user_id,
+            Export.fingerprint == fingerprint,
+            Export.expires_at > datetime.now(UTC),
+        )
+        .order_by(Export.created_at.desc())
+        .first()
+    )
+
+
 def get_user_storage_bytes(db: Session, user_id: str) -> int:
     result = (
         db.query(func.coalesce(func.sum(Export.file_size), 0))
@@ -61,6 +231,11 @@ class ExportJob:
     file_size: int | None = None
     s3_key: str | None = None
     export_id: str | None = None
+    rows: int | None = None  # progress: rows collected so far / rows being rendered
+    fingerprint: str | None = None
+    reused: bool = False
+    snapshot_at: datetime | None = None  # data cut-off (DB clock), set when querying starts
+    delta_since: datetime | None = None
     expires_at: datetime = field(
         default_factory=lambda: datetime.now(UTC) + timedelta(minutes=JOB_TTL_MINUTES)
     )
@@ -70,11 +245,83 @@ class ExportJob:
 _jobs: dict[str, ExportJob] = {}
 
 
+class JobEventBroker:
+    """In-process fan-out of job state changes to SSE watchers.
+
+    Jobs run on export-pool threads while watchers live on the event loop, so
+    `publish` hands events over with `call_soon_threadsafe`. An idle watcher is
+    just a parked asyncio.Queue - nothing polls the registry.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = (
+            defaultdict(set)
+        )
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[job_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subs = self._subscribers.get(job_id)
+            if subs is None:
+                return
+            subs.difference_update({s for s in subs if s[1] is queue})
+            if not subs:
+                del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: dict) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subs:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # watcher's loop already closed
+
+    def watcher_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+job_events = JobEventBroker()
+
+
+def job_event(job: ExportJob) -> dict:
+    """SSE payload for the job's current state."""
+    event: dict = {"status": job.status, "job_id": job.id}
+    if job.error:
+        event["error"] = job.error
+    if job.file_size:
+        event["file_size"] = job.file_size
+    if job.export_id:
+        event["export_id"] = job.export_id
+    if job.rows is not None:
+        event["rows"] = job.rows
+    return event
+
+
+def update_job(job: ExportJob, **changes) -> None:
+    """Apply state changes to a job and notify its watchers."""
+    for key, value in changes.items():
+        setattr(job, key, value)
+    job_events.publish(job.id, job_event(job))
+
+
 def get_job(job_id: str) -> ExportJob | None:
     return _jobs.get(job_id)
 
 
-def create_job(user_id: str, request: ExportCreateRequest) -> ExportJob:
+def create_job(
+    user_id: str,
+    request: ExportCreateRequest,
+    fingerprint: str | None = None,
+    delta_since: datetime | None = None,
+) -> ExportJob:
     name = request.name or generate_default_name(request.format, request.scope)
     job = ExportJob(
         id=str(uuid.uuid4()),
@@ -84,11 +331,56 @@ def create_job(user_id: str, request: ExportCreateRequest) -> ExportJob:
         scope=request.scope,
         name=name,
         created_at=datetime.now(UTC),
+        fingerprint=fingerprint,
+        delta_since=delta_since,
+    )
+    _jobs[job.id] = job
+    return job
+
+
+def create_reused_job(user_id: str, record: Export) -> ExportJob:
+    """Register an already-finished job that points at a stored export."""
+    now = datetime.now(UTC)
+    job = ExportJob(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        status="done",
+        format=record.format,
+        scope=record.scope,
+        name=record.name,
+        created_at=now,
+        completed_at=now,
+        file_size=record.file_size,
+        s3_key=record.s3_key,
+        export_id=str(record.id),
+        fingerprint=record.fingerprint,
+        reused=True,
+        snapshot_at=record.snapshot_at,
+        delta_since=record.delta_since,
     )
     _jobs[job.id] = job
     return job
 
 
+def find_matching_job(user_id: str, fingerprint: str) -> ExportJob | None:
+    """A live (running, or finished and still downloadable) job for the same export."""
+    now = datetime.now(UTC)
+    for job in list(_jobs.values()):
+        if (
+            job.user_id == user_id
+            and job.fingerprint == fingerprint
+            and job.status != "error"
+            and job.expires_at > now
+        ):
+            return job
+    return None
+
+
+def discard_job(job_id: str) -> None:
+    """Drop a job that was never scheduled (e.g. rejected by the worker pool)."""
+    _jobs.pop(job_id, None)
+
+
 def cleanup_expired_jobs():
     now = datetime.now(UTC)
     expired = [jid for jid, job in _jobs.items() if job.expires_at < now]
@@ -117,15 +409,21 @@ class ExportService:
 
         try:
             # Phase 1: Query data
-            job.status = "querying"
-            data = self._collect_data(user_id, request)
+            update_job(job, status="querying", rows=0, snapshot_at=_db_now(self.db))
+            data = self._collect_data(
+                user_id,
+                request,
+                progress=lambda n: update_job(job, rows=n),
+                since=job.delta_since,
+            )
 
             # Phase 2: Render via Rust
-            job.status = "rendering"
-            file_bytes = self._serialize(data, request)
+            update_job(job, status="rendering", rows=sum(len(v) for v in data.values()))
+            delta = job.delta_since is not None
+            file_bytes = self._serialize(data, request, delta=delta)
 
             # Phase 3: Write to temp file
-            suffix = self._file_suffix(request.format, request.scope)
+            suffix = self._file_suffix(request.format, request.scope, delta)
             with tempfile.NamedTemporaryFile(
                 delete=False, suffix=suffix, prefix="cofr-export-"
             ) as f:
@@ -153,6 +451,9 @@ class ExportService:
                             scope=job.scope,
                             file_size=len(file_bytes),
                             s3_key=s3_key,
+                            fingerprint=job.fingerprint,
+                            snapshot_at=job.snapshot_at,
+                            delta_since=job.delta_since,
                             expires_at=datetime.now(UTC) + timedelta(days=EXPORT_RETENTION_DAYS),
                         )
                         self.db.add(record)
@@ -162,12 +463,10 @@ class ExportService:
             except Exception as s3_err:
                 sentry_sdk.capture_exception(s3_err)
 
-            job.status = "done"
-            job.completed_at = datetime.now(UTC)
+            update_job(job, status="done", completed_at=datetime.now(UTC))
 
         except Exception as e:
-            job.status = "error"
-            job.error = str(e)
+            update_job(job, status="error", error=str(e))
             with sentry_sdk.new_scope() as scope:
                 scope.set_tag("export.format", request.format)
                 scope.set_tag("export.scope", request.scope)
@@ -191,11 +490,19 @@ class ExportService:
                 )
                 sentry_sdk.capture_exception(e)
 
-    def _collect_data(self, user_id: str, request: ExportCreateRequest) -> dict:
+    def _collect_data(
+        self,
+        user_id: str,
+        request: ExportCreateRequest,
+        progress: Callable[[int], None] | None = None,
+        since: datetime | None = None,
+    ) -> dict:
         result = {}
 
         if request.scope in ("transactions", "full_dump"):
-            result["transactions"] = self._query_transactions(user_id, request)
+            result["transactions"] = self._query_transactions(user_id, request, progress, since)
+            if since is not None:
+                result["deleted"] = self._query_tombstones(user_id, since)
 
         if request.scope in ("accounts", "full_dump"):
             result["accounts"] = self._query_accounts_summary(user_id)
@@ -205,27 +512,49 @@ class ExportService:
 
         return result
 
-    def _query_transactions(self, user_id: str, request: ExportCreateRequest) -> list[dict]:
+    def _query_transactions(
+        self,
+        user_id: str,
+        request: ExportCreateRequest,
+        progress: Callable[[int], None] | None = None,
+        since: datetime | None = None,
+    ) -> list[dict]:
         query = (
             self.db.query(Transaction)
             .options(joinedload(Transaction.category_rel), joinedload(Transaction.account_rel))
-            .filter(Transaction.user_id == user_id)
+            .filter(Transaction.user_id == user_id, *_request_filters(request))
         )
-
-        if request.start_date:
-            query = query.filter(Transaction.timestamp >= request.start_date)
-        if request.end_date:
-            query = query.filter(Transaction.timestamp <= request.end_date)
-        if request.account_id:
-            query = query.filter(Transaction.account_id == request.account_id)
-        if request.category_id:
-            query = query.filter(Transaction.category_id == request.category_id)
-        if request.currency:
-            query = query.filter(Transaction.currency == request.currency)
-
-        transactions = query.order_by(Transaction.timestamp.desc()).all()
-
-        return [self._tx_to_dict(tx) for tx in transactions]
+        if since is not None:
+            # Served by ix_transactions_user_updated_at.
+            query = query.filter(Transaction.updated_at >= since)
+
+        # Stream in batches so watchers see row counts while a large query runs.
+        rows: list[dict] = []
+        for tx in query.order_by(Transaction.timestamp.desc()).yield_per(PROGRESS_BATCH_ROWS):
+            row = self._tx_to_dict(tx)
+            if since is not None:
+                # Deltas are applied by id, so changed rows carry their identity.
+                row["id"] = str(tx.id)
+                row["updated_at"] = tx.updated_at.isoformat()
+            rows.append(row)
+            if progress and len(rows) % PROGRESS_BATCH_ROWS == 0:
+                progress(len(rows))
+        if progress:
+            progress(len(rows))
+        return rows
+
+    def _query_tombstones(self, user_id: str, since: datetime) -> list[dict]:
+        # Deleted rows are gone, so account/category/date filters cannot apply.
+        rows = (
+            self.db.query(TransactionTombstone.id, TransactionTombstone.deleted_at)
+            .filter(
+                TransactionTombstone.user_id == user_id,
+                TransactionTombstone.deleted_at >= since,
+            )
+            .order_by(TransactionTombstone.deleted_at)
+            .all()
+        )
+        return [{"id": str(r.id), "deleted_at": r.deleted_at.isoformat()} for r in rows]
 
     def _query_accounts_summary(self, user_id: str) -> list[dict]:
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -321,12 +650,28 @@ class ExportService:
             for r in rows
         ]
 
-    def _serialize(self, data: dict, request: ExportCreateRequest) -> bytes:
+    def _serialize(self, data: dict, request: ExportCreateRequest, delta: bool = False) -> bytes:
         fmt = request.format
         scope = request.scope
 
-        if fmt == "csv":
+        if delta:
+            if fmt not in DELTA_FORMATS or scope not in DELTA_SCOPES:
+                raise ValueError(f"Delta export is not supported for {fmt} {scope}")
+            return _scribe().export_delta(
+                data.get("transactions", []),
+                data.get("deleted", []),
+                data.get("accounts"),
+                data.get("categories"),
+                fmt,
+            )
+        elif fmt == "csv":
             return self._serialize_csv(data, scope)
+        elif fmt in CSV_CODECS:
+            if scope == "full_dump":
+                raise ValueError("Compressed CSV is not supported for full data dump. Use CSV.")
+            return _scribe().compress_csv(self._serialize_csv(data, scope), CSV_CODECS[fmt])
+        elif fmt in COLUMNAR_FORMATS:
+            return self._serialize_columnar(data, scope, fmt)
         elif fmt == "xlsx":
             return self._serialize_xlsx(data, scope, request.currency or "USD")
         elif fmt == "pdf":
@@ -336,33 +681,46 @@ class ExportService:
 
     def _serialize_csv(self, data: dict, scope: str) -> bytes:
         if scope == "full_dump":
-            return scribe.export_csv_full_dump(
+            return _scribe().export_csv_full_dump(
                 data.get("transactions", []),
                 data.get("accounts", []),
                 data.get("categories", []),
             )
         elif scope == "transactions":
-            return scribe.export_csv(data["transactions"], "")
+            return _scribe().export_csv(data["transactions"], "")
         elif scope == "accounts":
-            return scribe.export_accounts_csv(data["accounts"])
+            return _scribe().export_accounts_csv(data["accounts"])
         elif scope == "categories":
-            return scribe.export_categories_csv(data["categories"])
+            return _scribe().export_categories_csv(data["categories"])
+        else:
+            raise ValueError(f"Unsupported scope: {scope}")
+
+    def _serialize_columnar(self, data: dict, scope: str, fmt: str) -> bytes:
+        if scope == "full_dump":
+            return _scribe().export_columnar_full_dump(
+                data.get("transactions", []),
+                data.get("accounts", []),
+                data.get("categories", []),
+                fmt,
+            )
+        elif scope in ("transactions", "accounts", "categories"):
+            return _scribe().export_columnar(data[scope], scope, fmt)
         else:
             raise ValueError(f"Unsupported scope: {scope}")
 
     def _serialize_xlsx(self, data: dict, scope: str, currency: str) -> bytes:
         if scope == "full_dump":
-            return scribe.export_xlsx(
+            return _scribe().export_xlsx(
                 data.get("transactions", []),
                 {"accounts": data.get("accounts", []), "categories": data.get("categories", [])},
                 currency,
             )
         elif scope == "transactions":
-            return scribe.export_xlsx(data["transactions"], {}, currency)
+            return _scribe().export_xlsx(data["transactions"], {}, currency)
         elif scope == "accounts":
-            return scribe.export_xlsx([], {"accounts": data["accounts"]}, currency)
+            return _scribe().export_xlsx([], {"accounts": data["accounts"]}, currency)
         elif scope == "categories":
-            return scribe.export_xlsx([], {"categories": data["categories"]}, currency)
+            return _scribe().export_xlsx([], {"categories": data["categories"]}, currency)
         else:
             raise ValueError(f"Unsupported scope: {scope}")
 
@@ -374,11 +732,11 @@ class ExportService:
         }
 
         if scope == "transactions":
-            return scribe.export_pdf(data["transactions"], meta)
+            return _scribe().export_pdf(data["transactions"], meta)
         elif scope == "accounts":
-            return scribe.export_pdf(data["accounts"], meta)
+            return _scribe().export_pdf(data["accounts"], meta)
         elif scope == "categories":
-            return scribe.export_pdf(data["categories"], meta)
+            return _scribe().export_pdf(data["categories"], meta)
         elif scope == "full_dump":
             raise ValueError("PDF export is not supported for full data dump. Use CSV or XLSX.")
         else:
@@ -403,7 +761,5 @@ class ExportService:
         }
 
     @staticmethod
-    def _file_suffix(fmt: str, scope: str) -> str:
-        if fmt == "csv" and scope == "full_dump":
-            return ".zip"
-        return f".{fmt}"
+    def _file_suffix(fmt: str, scope: str, delta: bool = False) -> str:
+        return f".{export_extension(fmt, scope, delta)}"
@@ -0,0 +1,478 @@
+"""Bank statement import (CSV and OFX).
+
+Uploads are spooled to a temp file by the router and parsed in the import
+worker pool, one chunk of IMPORT_CHUNK_ROWS lines at a time, so memory stays
+flat whatever the file size. Every line gets a deterministic content hash
+stored in `Transaction.hash`; chunks go through the bulk loader, which skips
+hashes already present, so re-importing a statement (or one that overlaps an
+earlier import) only adds the lines not seen before.
+
+Jobs live in process memory, like export jobs: status is polled from the
+worker that accepted the upload.
+"""
+
+import contextlib
+import csv
+import hashlib
+import io
+import os
+import re
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+from itertools import batched
+from typing import NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import sentry_sdk
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Account, Category, User
+from app.services.bulk_loader import load_transactions
+from app.services.export_pool import ExportWorkerPool
+
+JOB_TTL_MINUTES = 30
+TERMINAL_STATUSES = ("done", "error")
+STATEMENT_FORMATS = {"csv": "csv", "ofx": "ofx", "qfx": "ofx"}
+# Row-level problems kept on the job for display; the rest are only counted.
+MAX_REPORTED_ERRORS = 20
+
+# Header names (lower-cased) recognised for each field when no mapping is given.
+HEADER_ALIASES = {
+    "date": ("date", "transaction date", "posted date", "posting date", "value date", "booked"),
+    "amount": ("amount", "transaction amount", "value", "amount (nzd)", "amount (usd)"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "paid out", "out"),
+    "credit": ("credit", "deposit", "deposits", "money in", "paid in", "in"),
+    "description": ("description", "details", "memo", "narrative", "particulars", "reference"),
+    "merchant": ("payee", "merchant", "name", "counterparty", "other party"),
+    "currency": ("currency",),
+    "category": ("category",),
+}
+MAPPABLE_FIELDS = tuple(HEADER_ALIASES)
+
+# Tried in order when no date_format is given. Day-first before month-first.
+_DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d.%m.%Y", "%d %b %Y", "%d %B %Y", "%Y%m%d")
+_AMOUNT_JUNK = re.compile(r"[^\d,.\-+()]")
+_OFX_TAG = re.compile(r"<([A-Z0-9.]+)>([^<\r\n]*)")
+_OFX_BLOCK_END = "</STMTTRN>"
+_OFX_READ_BYTES = 64 * 1024
+
+
+class StatementLine(NamedTuple):
+    """One parsed statement line. `amount` is signed: negative is money out."""
+
+    day: date
+    amount: float
+    description: str
+    merchant: str | None = None
+    currency: str | None = None
+    category: str | None = None
+    fitid: str | None = None
+
+
+class RowError(ValueError):
+    """A statement line that cannot be imported."""
+
+
+@dataclass
+class ImportOptions:
+    account_id: str
+    format: str  # csv | ofx
+    currency: str | None = None
+    date_format: str | None = None
+    # field -> CSV header, overriding HEADER_ALIASES
+    columns: dict[str, str] = field(default_factory=dict)
+    expense_category_id: str | None = None
+    income_category_id: str | None = None
+
+
+@dataclass
+class ImportJob:
+    id: str
+    user_id: str
+    kind: str  # statement | full_dump
+    status: str  # pending, running, done, error
+    format: str
+    filename: str
+    created_at: datetime
+    completed_at: datetime | None = None
+    error: str | None = None
+    rows_read: int = 0
+    rows_inserted: int = 0
+    rows_duplicate: int = 0
+    rows_failed: int = 0
+    errors: list[str] = field(default_factory=list)
+    # Spooled upload. Kept after a failed restore so the job can be resumed.
+    path: str | None = None
+    expires_at: datetime = field(
+        default_factory=lambda: datetime.now(UTC) + timedelta(minutes=JOB_TTL_MINUTES)
+    )
+
+
+# Module-level in-memory job registry
+_jobs: dict[str, ImportJob] = {}
+
+# Imports get their own bounded pool (same admission rules as exports), so a
+# large statement never competes with exports or the default executor.
+import_pool = ExportWorkerPool(
+    workers=settings.IMPORT_WORKERS,
+    max_queue=settings.IMPORT_QUEUE_SIZE,
+    max_per_user=settings.IMPORT_MAX_PER_USER,
+    kind="import",
+)
+
+
+def create_job(user_id: str, kind: str, fmt: str, filename: str, path: str) -> ImportJob:
+    job = ImportJob(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        kind=kind,
+        status="pending",
+        format=fmt,
+        filename=filename,
+        created_at=datetime.now(UTC),
+        path=path,
+    )
+    _jobs[job.id] = job
+    return job
+
+
+def get_job(job_id: str) -> ImportJob | None:
+    return _jobs.get(job_id)
+
+
+def update_job(job: ImportJob, **changes) -> None:
+    """Apply state changes to a job and restart its TTL, so a long run never expires mid-way."""
+    for key, value in changes.items():
+        setattr(job, key, value)
+    job.expires_at = datetime.now(UTC) + timedelta(minutes=JOB_TTL_MINUTES)
+
+
+def release_source(job: ImportJob) -> None:
+    """Delete the job's spooled upload, if it still has one."""
+    path, job.path = job.path, None
+    if path:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+def record_row_error(job: ImportJob, message: str) -> None:
+    job.rows_failed += 1
+    if len(job.errors) < MAX_REPORTED_ERRORS:
+        job.errors.append(message)
+
+
+def discard_job(job_id: str) -> None:
+    """Drop a job that was never scheduled (e.g. rejected by the worker pool)."""
+    job = _jobs.pop(job_id, None)
+    if job is not None:
+        release_source(job)
+
+
+def cleanup_expired_jobs() -> None:
+    now = datetime.now(UTC)
+    for jid in [jid for jid, job in _jobs.items() if job.expires_at < now]:
+        release_source(_jobs.pop(jid))
+
+
+# ── Parsing ──
+
+
+def parse_amount(raw: str) -> float:
+    """Parse '1,234.50', '-12.00', '(45.10)', '$ 3,00' and the like."""
+    text = _AMOUNT_JUNK.sub("", raw or "")
+    negative = text.startswith("-") or (text.startswith("(") and text.endswith(")"))
+    text = text.strip("()+-")
+    if not text:
+        raise RowError(f"Invalid amount {raw!r}")
+    if "," in text and "." in text:
+        # The later separator is the decimal one.
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        head, _, tail = text.rpartition(",")
+        text = f"{head.replace(',', '')}.{tail}" if len(tail) != 3 else text.replace(",", "")
+    try:
+        value = float(text)
+    except ValueError:
+        raise RowError(f"Invalid amount {raw!r}") from None
+    return -value if negative else value
+
+
+def parse_date(raw: str, date_format: str | None = None) -> date:
+    text = (raw or "").strip()
+    if date_format:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            raise RowError(f"Date {raw!r} does not match {date_format}") from None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise RowError(f"Unrecognised date {raw!r}")
+
+
+def _resolve_columns(header: list[str], overrides: dict[str, str]) -> dict[str, int]:
+    lowered = [h.strip().lower() for h in header]
+    columns: dict[str, int] = {}
+    for name in MAPPABLE_FIELDS:
+        if name in overrides:
+            wanted = overrides[name].strip().lower()
+            if wanted not in lowered:
+                raise ValueError(f"Column {overrides[name]!r} not found in the file header")
+            columns[name] = lowered.index(wanted)
+            continue
+        for alias in HEADER_ALIASES[name]:
+            if alias in lowered:
+                columns[name] = lowered.index(alias)
+                break
+    if "date" not in columns:
+        raise ValueError("No date column found; map one explicitly")
+    if "amount" not in columns and not {"debit", "credit"} & columns.keys():
+        raise ValueError("No amount (or debit/credit) column found; map one explicitly")
+    return columns
+
+
+def iter_csv(stream: io.TextIOBase, options: ImportOptions) -> Iterator[StatementLine | RowError]:
+    """Yield statement lines (or the error for each bad line) from a CSV stream."""
+    sample = stream.read(8192)
+    stream.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(stream, dialect)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("The file is empty")
+    columns = _resolve_columns(header, options.columns)
+
+    def cell(row: list[str], name: str) -> str:
+        index = columns.get(name)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for line_no, row in enumerate(reader, start=2):
+        if not any(c.strip() for c in row):
+            continue
+        try:
+            if "amount" in columns:
+                amount = parse_amount(cell(row, "amount"))
+            else:
+                debit, credit = cell(row, "debit"), cell(row, "credit")
+                amount = (parse_amount(credit) if credit else 0.0) - (
+                    abs(parse_amount(debit)) if debit else 0.0
+                )
+            yield StatementLine(
+                day=parse_date(cell(row, "date"), options.date_format),
+                amount=amount,
+                description=cell(row, "description"),
+                merchant=cell(row, "merchant") or None,
+                currency=cell(row, "currency").upper() or None,
+                category=cell(row, "category") or None,
+            )
+        except RowError as exc:
+            yield RowError(f"Line {line_no}: {exc}")
+
+
+def _ofx_date(raw: str) -> date:
+    # YYYYMMDD[HHMMSS[.XXX]][[-5:EST]] - only the calendar date matters here.
+    try:
+        return datetime.strptime(raw.strip()[:8], "%Y%m%d").date()
+    except ValueError:
+        raise RowError(f"Invalid DTPOSTED {raw!r}") from None
+
+
+def iter_ofx(stream: io.TextIOBase) -> Iterator[StatementLine | RowError]:
+    """Yield statement lines from OFX 1.x (SGML) or 2.x (XML), reading 64 KB at a time."""
+    buffer = ""
+    currency = None
+    index = 0
+    while True:
+        chunk = stream.read(_OFX_READ_BYTES)
+        buffer += chunk
+        if currency is None and "<CURDEF>" in buffer:
+            match = re.search(r"<CURDEF>\s*([A-Z]{3})", buffer)
+            currency = match.group(1) if match else None
+        while (end := buffer.find(_OFX_BLOCK_END)) != -1:
+            start = buffer.rfind("<STMTTRN>", 0, end)
+            block, buffer = buffer[start:end], buffer[end + len(_OFX_BLOCK_END) :]
+            index += 1
+            tags = {name: value.strip() for name, value in _OFX_TAG.findall(block)}
+            try:
+                yield StatementLine(
+                    day=_ofx_date(tags.get("DTPOSTED", "")),
+                    amount=parse_amount(tags.get("TRNAMT", "")),
+                    description=tags.get("MEMO", ""),
+                    merchant=tags.get("NAME") or tags.get("PAYEE") or None,
+                    currency=currency,
+                    fitid=tags.get("FITID") or None,
+                )
+            except RowError as exc:
+                yield RowError(f"Transaction {index}: {exc}")
+        if not chunk:
+            return
+        # Keep only what can still be part of an unfinished block.
+        keep = buffer.rfind("<STMTTRN>")
+        buffer = buffer[keep:] if keep != -1 else buffer[-len(_OFX_BLOCK_END) :]
+
+
+def line_hash(account_id: uuid.UUID, line: StatementLine, occurrence: int) -> str:
+    """Deterministic dedupe key for a statement line.
+
+    OFX lines use the bank's FITID. Other lines hash their content plus the
+    occurrence number among identical lines in the file, so two genuine
+    identical purchases on one day stay distinct while a re-import of the
+    same file maps onto the same keys.
+    """
+    if line.fitid:
+        return f"imp:{account_id}:fitid:{line.fitid}"
+    content = "\x1f".join(
+        (
+            line.day.isoformat(),
+            f"{line.amount:.2f}",
+            " ".join(line.description.lower().split()),
+            (line.merchant or "").lower(),
+            str(occurrence),
+        )
+    )
+    return f"imp:{account_id}:{hashlib.sha256(content.encode()).hexdigest()[:40]}"
+
+
+# ── Running ──
+
+
+def _zone(tz_name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz_name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+class ImportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _categories(self, user_id: str, options: ImportOptions):
+        """Visible categories by lower-cased name/slug, plus the expense/income fallbacks."""
+        categories = (
+            self.db.query(Category)
+            .filter(
+                ((Category.user_id == user_id) & Category.deleted_at.is_(None))
+                | Category.user_id.is_(None)
+            )
+            .order_by(Category.user_id.is_(None), Category.display_order)
+            .all()
+        )
+        by_name: dict[tuple[str, str], Category] = {}
+        by_id = {str(c.id): c for c in categories}
+        for c in categories:
+            by_name.setdefault((c.type, c.name.lower()), c)
+            by_name.setdefault((c.type, c.slug.lower()), c)
+
+        def fallback(explicit: str | None, cat_type: str, slug: str) -> Category | None:
+            if explicit:
+                chosen = by_id.get(explicit)
+                if chosen is None or chosen.type != cat_type:
+                    raise ValueError(f"{cat_type.title()} category not found")
+                return chosen
+            return by_name.get((cat_type, slug)) or next(
+                (c for c in categories if c.type == cat_type), None
+            )
+
+        return (
+            by_name,
+            fallback(options.expense_category_id, "expense", "miscellaneous"),
+            fallback(options.income_category_id, "income", "income"),
+        )
+
+    def _lines(self, path: str, options: ImportOptions):
+        with open(path, encoding="utf-8-sig", errors="replace", newline="") as stream:
+            if options.format == "ofx":
+                yield from iter_ofx(stream)
+            else:
+                yield from iter_csv(stream, options)
+
+    def run_import(self, job_id: str, options: ImportOptions) -> None:
+        """Parse the job's statement file and insert its new lines, chunk by chunk."""
+        job = get_job(job_id)
+        if job is None or job.path is None:
+            return
+        path = job.path
+        try:
+            update_job(job, status="running")
+            user = self.db.query(User).filter(User.id == job.user_id).one()
+            account = (
+                self.db.query(Account)
+                .filter(Account.id == options.account_id, Account.user_id == user.id)
+                .one()
+            )
+            by_name, expense_fallback, income_fallback = self._categories(job.user_id, options)
+            zone = _zone(user.timezone)
+            currency = options.currency or user.preferred_currency or "USD"
+            seen: Counter[str] = Counter()
+
+            for chunk in batched(self._lines(path, options), settings.IMPORT_CHUNK_ROWS):
+                rows = []
+                for line in chunk:
+                    job.rows_read += 1
+                    if isinstance(line, RowError):
+                        record_row_error(job, str(line))
+                        continue
+                    if line.amount == 0:
+                        record_row_error(job, f"Row {job.rows_read}: zero amount")
+                        continue
+                    cat_type = "expense" if line.amount < 0 else "income"
+                    category = (
+                        by_name.get((cat_type, line.category.lower())) if line.category else None
+                    ) or (expense_fallback if cat_type == "expense" else income_fallback)
+                    if category is None:
+                        record_row_error(job, f"Row {job.rows_read}: no {cat_type} category")
+                        continue
+                    base = line_hash(account.id, line, 0)
+                    seen[base] += 1
+                    rows.append(
+                        {
+                            "id": uuid.uuid4(),
+                            "user_id": user.id,
+                            "account_id": account.id,
+                            "category_id": category.id,
+                            "amount": abs(line.amount),
+                            "currency": line.currency or currency,
+                            "notes": line.description[:360],
+                            "merchant": (line.merchant or "")[:120] or None,
+                            "timestamp": datetime.combine(
+                                line.day, time(12), tzinfo=zone
+                            ).astimezone(UTC),
+                            "hash": line_hash(account.id, line, seen[base] - 1),
+                            "is_opening_balance": False,
+                            "is_transfer": False,
+                        }
+                    )
+                result = load_transactions(self.db, rows)
+                self.db.commit()
+                update_job(
+                    job,
+                    rows_inserted=job.rows_inserted + len(result.inserted),
+                    rows_duplicate=job.rows_duplicate + result.duplicates,
+                )
+            job.status = "done"
+        except Exception as exc:
+            self.db.rollback()
+            job.status = "error"
+            job.error = str(exc) if isinstance(exc, ValueError) else "Import failed"
+            if not isinstance(exc, ValueError):
+                sentry_sdk.capture_exception(exc)
+        finally:
+            update_job(job, completed_at=datetime.now(UTC))
+            release_source(job)
@@ -3,15 +3,23 @@
 Cadence math is pure (no DB); materialization is idempotent via Transaction.hash.
 """
 
+import asyncio
+import heapq
+import uuid
 from calendar import monthrange
 from collections.abc import Iterator
 from datetime import UTC, date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import islice
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from fastapi import HTTPException
+from sqlalchemy import func, insert, or_, update
 from sqlalchemy.orm import Session, joinedload
 
 from app.db.models import Account, Category, RecurringRule, Transaction, User
-from app.db.schemas import RecurringRuleSchema
+from app.db.schemas import RecurringRuleSchema, UpcomingOccurrence, UpcomingRecurringResponse
+from app.services.budget_service import record_transaction_changes
 
 # ── Cadence math (pure functions) ────────────────────────────────────────
 
@@ -31,33 +39,25 @@ def advance(rule_start: date, interval_unit: str, interval_count: int, from_date
 
     The cadence is anchored at `rule_start` so all occurrences stay aligned with
     the original day of week / day of month even across DST and leap years.
+    Closed form: cost does not depend on how far `from_date` is from the start.
     """
-    if interval_unit == "day":
-        step = timedelta(days=interval_count)
-        nxt = rule_start
-        while nxt <= from_date:
-            nxt = nxt + step
+    if interval_unit in ("day", "week"):
+        step = interval_count * (7 if interval_unit == "week" else 1)
+        if from_date < rule_start:
+            return rule_start
+        k = (from_date - rule_start).days // step + 1
+        return rule_start + timedelta(days=k * step)
+    if interval_unit in ("month", "year"):
+        months = interval_count * (12 if interval_unit == "year" else 1)
+        # First step whose month is not before from_date's month; if it lands in
+        # that same month on or before from_date, the step after it is next.
+        # Month and year rules never return rule_start itself (k starts at 1).
+        delta = (from_date.year - rule_start.year) * 12 + from_date.month - rule_start.month
+        k = max(1, -(-delta // months))
+        nxt = _add_months(rule_start, k * months)
+        if nxt <= from_date:
+            nxt = _add_months(rule_start, (k + 1) * months)
         return nxt
-    if interval_unit == "week":
-        step = timedelta(days=7 * interval_count)
-        nxt = rule_start
-        while nxt <= from_date:
-            nxt = nxt + step
-        return nxt
-    if interval_unit == "month":
-        k = 0
-        while True:
-            k += 1
-            nxt = _add_months(rule_start, k * interval_count)
-            if nxt > from_date:
-                return nxt
-    if interval_unit == "year":
-        k = 0
-        while True:
-            k += 1
-            nxt = _add_months(rule_start, k * 12 * interval_count)
-            if nxt > from_date:
-                return nxt
     raise ValueError(f"invalid interval_unit: {interval_unit}")
 
 
@@ -83,45 +83,138 @@ def iter_due_occurrences(rule: RecurringRule, up_to: date) -> Iterator[date]:
         cursor = advance(rule.start_date, rule.interval_unit, rule.interval_count, cursor)
 
 
-def preview_upcoming(rule: RecurringRule, count: int = 3) -> list[date]:
-    """Next N occurrences from today's perspective, ignoring whether they've fired."""
-    out: list[date] = []
+def iter_upcoming(rule: RecurringRule, start: date, end: date) -> Iterator[date]:
+    """Yield not-yet-materialized occurrences of `rule` within [start, end].
+
+    Jumps straight to the first occurrence on or after `start` with the
+    closed-form `advance`, so the cost is O(occurrences yielded) regardless of
+    how old the rule is or how far ahead the window starts.
+    """
     cursor = max(rule.next_due_at, rule.start_date)
-    end = rule.end_date
-    for _ in range(count):
-        if end is not None and cursor > end:
-            break
-        out.append(cursor)
+    if cursor < start:
+        cursor = advance(
+            rule.start_date, rule.interval_unit, rule.interval_count, start - timedelta(days=1)
+        )
+    last = min(end, rule.end_date) if rule.end_date is not None else end
+    while cursor <= last:
+        yield cursor
         cursor = advance(rule.start_date, rule.interval_unit, rule.interval_count, cursor)
-    return out
+
+
+def merge_upcoming(
+    rules: list[RecurringRule], start: date, end: date
+) -> Iterator[tuple[date, RecurringRule]]:
+    """All rules' occurrences in [start, end] as one date-ordered stream.
+
+    A lazy k-way heap merge over the per-rule generators: O(log k) per
+    occurrence, so callers that stop early only pay for what they consume.
+    """
+
+    def tagged(rule: RecurringRule) -> Iterator[tuple[date, RecurringRule]]:
+        for due in iter_upcoming(rule, start, end):
+            yield due, rule
+
+    return heapq.merge(*(tagged(rule) for rule in rules), key=lambda item: item[0])
+
+
+def preview_upcoming(rule: RecurringRule, count: int = 3) -> list[date]:
+    """Next N occurrences from today's perspective, ignoring whether they've fired."""
+    return list(islice(iter_upcoming(rule, date.min, date.max), count))
 
 
 # ── Timezone helpers ─────────────────────────────────────────────────────
 
 
+@lru_cache(maxsize=512)
+def _zone(tz_name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz_name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
 def user_today(user: User | None) -> date:
     """Today in the user's timezone (falls back to UTC)."""
-    tz_name = user.timezone if user and user.timezone else "UTC"
-    try:
-        tz = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        tz = ZoneInfo("UTC")
-    return datetime.now(tz).date()
+    return datetime.now(_zone(user.timezone if user else None)).date()
+
+
+def _local_noon_utc(occurrence: date, tz: ZoneInfo) -> datetime:
+    return datetime.combine(occurrence, time(12, 0), tzinfo=tz).astimezone(UTC)
 
 
 def _occurrence_timestamp(occurrence: date, user: User | None) -> datetime:
     """Return a UTC-aware timestamp for an occurrence date in the user's tz."""
-    tz_name = user.timezone if user and user.timezone else "UTC"
-    try:
-        tz = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        tz = ZoneInfo("UTC")
-    local_noon = datetime.combine(occurrence, time(12, 0), tzinfo=tz)
-    return local_noon.astimezone(UTC)
+    return _local_noon_utc(occurrence, _zone(user.timezone if user else None))
+
+
+def due_instant(next_due_at: date, tz: ZoneInfo) -> datetime:
+    """UTC instant at which `next_due_at` starts in `tz` (local midnight)."""
+    return datetime.combine(next_due_at, time(0), tzinfo=tz).astimezone(UTC)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything stored here is UTC.
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+# ── Scheduling ───────────────────────────────────────────────────────────
+
+# Set by the background loop so request handlers can wake it when a rule's
+# due instant moves earlier than the one it is sleeping towards.
+_wake_loop: asyncio.AbstractEventLoop | None = None
+_wake_event: asyncio.Event | None = None
+
+
+def schedule_wake_event() -> asyncio.Event:
+    """Bind the wake-up event to the running loop. Called once by the scheduler."""
+    global _wake_loop, _wake_event
+    _wake_loop = asyncio.get_running_loop()
+    _wake_event = asyncio.Event()
+    return _wake_event
+
+
+def notify_schedule_changed() -> None:
+    """Wake the scheduler so it recomputes its next due instant. Thread-safe."""
+    if _wake_loop is None or _wake_event is None or _wake_loop.is_closed():
+        return
+    _wake_loop.call_soon_threadsafe(_wake_event.set)
+
+
+def reschedule_rule(db: Session, rule: RecurringRule, tz_name: str | None = None) -> None:
+    """Recompute `rule.next_due_utc` from `next_due_at` and the owner's timezone."""
+    if tz_name is None:
+        tz_name = db.query(User.timezone).filter(User.id == rule.user_id).scalar()
+    rule.next_due_utc = due_instant(rule.next_due_at, _zone(tz_name))
+
+
+def reschedule_user_rules(db: Session, user_id, tz_name: str | None) -> int:
+    """Recompute `next_due_utc` for every active rule of a user. Caller commits."""
+    tz = _zone(tz_name)
+    rules = (
+        db.query(RecurringRule)
+        .filter(RecurringRule.user_id == user_id, RecurringRule.is_active)
+        .all()
+    )
+    for rule in rules:
+        rule.next_due_utc = due_instant(rule.next_due_at, tz)
+    return len(rules)
+
+
+def next_due_instant(db: Session) -> datetime | None:
+    """Earliest `next_due_utc` across active rules, or None if nothing is scheduled."""
+    earliest = (
+        db.query(func.min(RecurringRule.next_due_utc)).filter(RecurringRule.is_active).scalar()
+    )
+    return _as_utc(earliest) if earliest is not None else None
 
 
 # ── Materialization ──────────────────────────────────────────────────────
 
+# Rules per chunk in materialize_all_due; each chunk is one commit.
+MATERIALIZE_CHUNK_SIZE = 500
+# Bound on hashes per `IN (...)` lookup, well under driver parameter limits.
+HASH_LOOKUP_BATCH = 900
+
 
 def _transfer_pair_hash(rule_id, occurrence: date, leg: str) -> str:
     return f"rec:{rule_id}:{occurrence.isoformat()}:{leg}"
@@ -131,146 +224,222 @@ def _simple_hash(rule_id, occurrence: date) -> str:
     return f"rec:{rule_id}:{occurrence.isoformat()}"
 
 
-def _materialize_expense_or_income(
-    db: Session, rule: RecurringRule, occurrence: date, user: User | None
-) -> Transaction | None:
-    tx_hash = _simple_hash(rule.id, occurrence)
-    existing = db.query(Transaction).filter(Transaction.hash == tx_hash).first()
-    if existing:
-        return None
-    tx = Transaction(
-        user_id=rule.user_id,
-        amount=rule.amount,
-        currency=rule.currency,
-        category_id=rule.category_id,
-        account_id=rule.account_id,
-        notes=rule.description,
-        merchant=rule.merchant,
-        timestamp=_occurrence_timestamp(occurrence, user),
-        hash=tx_hash,
-        recurring_rule_id=rule.id,
-    )
-    db.add(tx)
-    return tx
-
-
-def _materialize_transfer(
-    db: Session, rule: RecurringRule, occurrence: date, user: User | None
-) -> tuple[Transaction, Transaction] | None:
-    from_hash = _transfer_pair_hash(rule.id, occurrence, "from")
-    if db.query(Transaction).filter(Transaction.hash == from_hash).first():
-        return None
-    ts = _occurrence_timestamp(occurrence, user)
-    from_tx = Transaction(
-        user_id=rule.user_id,
-        amount=rule.amount,
-        currency=rule.currency,
-        notes=rule.description,
-        timestamp=ts,
-        account_id=rule.account_id,
+def _occurrence_key(rule: RecurringRule, occurrence: date) -> str:
+    """Hash that marks an occurrence as materialized (the "from" leg for transfers)."""
+    if rule.type == "transfer":
+        return _transfer_pair_hash(rule.id, occurrence, "from")
+    return _simple_hash(rule.id, occurrence)
+
+
+def _existing_hashes(db: Session, hashes: list[str]) -> set[str]:
+    found: set[str] = set()
+    for i in range(0, len(hashes), HASH_LOOKUP_BATCH):
+        batch = hashes[i : i + HASH_LOOKUP_BATCH]
+        found.update(h for (h,) in db.query(Transaction.hash).filter(Transaction.hash.in_(batch)))
+    return found
+
+
+def _transaction_row(rule: RecurringRule, ts: datetime, **overrides) -> dict:
+    # Every row carries the same keys so the bulk INSERT runs as one executemany.
+    row = {
+        "id": uuid.uuid4(),
+        "user_id": rule.user_id,
+        "amount": rule.amount,
+        "currency": rule.currency,
+        "category_id": rule.category_id,
+        "account_id": rule.account_id,
+        "notes": rule.description,
+        "merchant": rule.merchant,
+        "timestamp": ts,
+        "hash": None,
+        "is_transfer": False,
+        "transfer_direction": None,
+        "linked_transaction_id": None,
+        "recurring_rule_id": rule.id,
+    }
+    row.update(overrides)
+    return row
+
+
+def _occurrence_rows(rule: RecurringRule, occurrence: date, tz: ZoneInfo) -> list[dict]:
+    ts = _local_noon_utc(occurrence, tz)
+    if rule.type != "transfer":
+        return [_transaction_row(rule, ts, hash=_simple_hash(rule.id, occurrence))]
+    from_row = _transaction_row(
+        rule,
+        ts,
+        category_id=None,
+        merchant=None,
         is_transfer=True,
         transfer_direction="from",
-        category_id=None,
-        hash=from_hash,
-        recurring_rule_id=rule.id,
+        hash=_transfer_pair_hash(rule.id, occurrence, "from"),
     )
-    db.add(from_tx)
-    db.flush()
-    to_tx = Transaction(
-        user_id=rule.user_id,
-        amount=rule.amount,
-        currency=rule.currency,
-        notes=rule.description,
-        timestamp=ts,
+    # The "to" leg links back immediately; the "from" leg is linked after the
+    # insert so the FK never points at a row that is not there yet.
+    to_row = _transaction_row(
+        rule,
+        ts,
+        category_id=None,
+        merchant=None,
         account_id=rule.to_account_id,
         is_transfer=True,
         transfer_direction="to",
-        linked_transaction_id=from_tx.id,
-        category_id=None,
+        linked_transaction_id=from_row["id"],
         hash=_transfer_pair_hash(rule.id, occurrence, "to"),
-        recurring_rule_id=rule.id,
     )
-    db.add(to_tx)
-    db.flush()
-    from_tx.linked_transaction_id = to_tx.id
-    return from_tx, to_tx
+    return [from_row, to_row]
+
+
+def _materialize_batch(
+    db: Session,
+    rules: list[RecurringRule],
+    *,
+    today: date | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Materialize every due occurrence of `rules`. Returns occurrences created.
+
+    Round trips are per batch, not per occurrence: one user lookup, chunked
+    `hash IN (...)` existence checks, one bulk INSERT and one bulk UPDATE to
+    close transfer links. `today` overrides each user's local today, `now`
+    the instant it is derived from. Every rule leaves with `next_due_utc` set;
+    rules past their end date or missing a transfer destination are deactivated.
+    The caller commits.
+    """
+    rules = [r for r in rules if r.is_active]
+    if not rules:
+        return 0
 
+    user_ids = {r.user_id for r in rules}
+    zones = {
+        uid: _zone(tz_name)
+        for uid, tz_name in db.query(User.id, User.timezone).filter(User.id.in_(user_ids))
+    }
 
-def materialize_rule(db: Session, rule: RecurringRule, *, today: date) -> int:
-    """Materialize all due occurrences up to `today`. Returns number created."""
-    if not rule.is_active:
+    due: list[tuple[RecurringRule, list[date], ZoneInfo]] = []
+    for rule in rules:
+        tz = zones.get(rule.user_id) or _zone(None)
+        finished = rule.end_date is not None and rule.next_due_at > rule.end_date
+        if finished or (rule.type == "transfer" and rule.to_account_id is None):
+            # Can never fire again; deactivate so the due scan stops picking it up.
+            rule.is_active = False
+            rule.next_due_utc = due_instant(rule.next_due_at, tz)
+            continue
+        up_to = today if today is not None else (now or datetime.now(UTC)).astimezone(tz).date()
+        occurrences = list(iter_due_occurrences(rule, up_to=up_to))
+        if occurrences:
+            due.append((rule, occurrences, tz))
+        else:
+            # Keeps rules written before the column existed (or by older code) on schedule.
+            rule.next_due_utc = due_instant(rule.next_due_at, tz)
+    if not due:
         return 0
-    user = db.query(User).filter(User.id == rule.user_id).first()
+
+    existing = _existing_hashes(
+        db, [_occurrence_key(rule, occ) for rule, occurrences, _ in due for occ in occurrences]
+    )
+
+    rows: list[dict] = []
+    links: list[dict] = []
     created = 0
-    last_occurrence: date | None = None
-    for occurrence in iter_due_occurrences(rule, up_to=today):
-        if rule.type == "transfer":
-            if rule.to_account_id is None:
-                break
-            result = _materialize_transfer(db, rule, occurrence, user)
-        else:
-            result = _materialize_expense_or_income(db, rule, occurrence, user)
-        if result is not None:
+    for rule, occurrences, tz in due:
+        for occurrence in occurrences:
+            if _occurrence_key(rule, occurrence) in existing:
+                continue
+            new_rows = _occurrence_rows(rule, occurrence, tz)
+            if len(new_rows) == 2:
+                links.append({"id": new_rows[0]["id"], "linked_transaction_id": new_rows[1]["id"]})
+            rows.extend(new_rows)
             created += 1
-        last_occurrence = occurrence
 
-    if last_occurrence is not None:
+        last_occurrence = occurrences[-1]
         rule.last_materialized_at = last_occurrence
         # Advance cursor to the next un-materialized occurrence.
         rule.next_due_at = advance(
             rule.start_date, rule.interval_unit, rule.interval_count, last_occurrence
         )
+        rule.next_due_utc = due_instant(rule.next_due_at, tz)
         if rule.end_date and rule.next_due_at > rule.end_date:
             rule.is_active = False
+
+    if rows:
+        # Core insert on the table: the ORM bulk path splits rows into one
+        # statement per run of differing NULL columns.
+        db.execute(insert(Transaction.__table__), rows)
+        record_transaction_changes(db, added=rows)
+    if links:
+        db.execute(update(Transaction), links)
     return created
 
 
-def materialize_all_due(db: Session) -> int:
-    """Scan every active rule and materialize anything due as of the user's today.
+def materialize_rule(db: Session, rule: RecurringRule, *, today: date) -> int:
+    """Materialize all due occurrences up to `today`. Returns number created."""
+    return _materialize_batch(db, [rule], today=today)
+
+
+def materialize_all_due(
+    db: Session, chunk_size: int = MATERIALIZE_CHUNK_SIZE, *, now: datetime | None = None
+) -> int:
+    """Materialize every active rule whose due instant has passed.
 
-    Uses per-user today so a rule due 2026-04-14 fires when the owning user
-    crosses midnight in their own timezone, not the server's.
+    A rule is due once `next_due_utc` (local midnight of `next_due_at` in the
+    owner's timezone) is at or before `now`, so the scan only touches due rules
+    via the (is_active, next_due_utc) index. Rules without `next_due_utc` are
+    picked up too and get it filled in. Rules are walked in id order,
+    `chunk_size` at a time, committing after each chunk so a long catch-up
+    never holds one huge transaction.
     """
+    now = now or datetime.now(UTC)
     total = 0
-    rules = db.query(RecurringRule).filter(RecurringRule.is_active).all()
-    if not rules:
-        return 0
-    # Cache per-user "today" to avoid recomputing tz math inside a hot loop.
-    user_cache: dict = {}
-    for rule in rules:
-        today = user_cache.get(rule.user_id)
-        if today is None:
-            user = db.query(User).filter(User.id == rule.user_id).first()
-            today = user_today(user)
-            user_cache[rule.user_id] = today
-        if rule.next_due_at <= today:
-            total += materialize_rule(db, rule, today=today)
-    if total:
+    last_id = None
+    while True:
+        query = db.query(RecurringRule).filter(
+            RecurringRule.is_active,
+            or_(RecurringRule.next_due_utc <= now, RecurringRule.next_due_utc.is_(None)),
+        )
+        if last_id is not None:
+            query = query.filter(RecurringRule.id > last_id)
+        rules = query.order_by(RecurringRule.id).limit(chunk_size).all()
+        if not rules:
+            break
+        last_id = rules[-1].id
+        total += _materialize_batch(db, rules, now=now)
         db.commit()
+        if len(rules) < chunk_size:
+            break
     return total
 
 
 # ── Schema projection ────────────────────────────────────────────────────
 
 
-def _join_account_names(db: Session, rule: RecurringRule) -> tuple[str | None, str | None]:
-    names = (
-        db.query(Account.id, Account.name)
-        .filter(Account.id.in_([aid for aid in [rule.account_id, rule.to_account_id] if aid]))
-        .all()
-    )
-    name_map = {str(aid): name for aid, name in names}
-    return (
-        name_map.get(str(rule.account_id)),
-        name_map.get(str(rule.to_account_id)) if rule.to_account_id else None,
-    )
-
+def load_rule_refs(
+    db: Session, rules: list[RecurringRule]
+) -> tuple[dict[str, str], dict[str, Category]]:
+    """Account names and categories referenced by `rules`: two queries total.
 
-def to_schema(db: Session, rule: RecurringRule) -> RecurringRuleSchema:
-    account_name, to_account_name = _join_account_names(db, rule)
-    cat = None
-    if rule.category_id is not None:
-        cat = db.query(Category).filter(Category.id == rule.category_id).first()
+    Returns ({account_id: name}, {category_id: Category}) keyed by str id.
+    """
+    account_ids = {aid for r in rules for aid in (r.account_id, r.to_account_id) if aid}
+    category_ids = {r.category_id for r in rules if r.category_id is not None}
+    accounts = {}
+    if account_ids:
+        accounts = {
+            str(aid): name
+            for aid, name in db.query(Account.id, Account.name).filter(Account.id.in_(account_ids))
+        }
+    categories = {}
+    if category_ids:
+        categories = {
+            str(cat.id): cat for cat in db.query(Category).filter(Category.id.in_(category_ids))
+        }
+    return accounts, categories
+
+
+def _project(
+    rule: RecurringRule, accounts: dict[str, str], categories: dict[str, Category]
+) -> RecurringRuleSchema:
+    cat = categories.get(str(rule.category_id)) if rule.category_id is not None else None
     return RecurringRuleSchema(
         id=str(rule.id),
         type=rule.type,
@@ -278,9 +447,9 @@ def to_schema(db: Session, rule: RecurringRule) -> RecurringRuleSchema:
         amount=rule.amount,
         currency=rule.currency,
         account_id=str(rule.account_id),
-        account_name=account_name or "",
+        account_name=accounts.get(str(rule.account_id), ""),
         to_account_id=str(rule.to_account_id) if rule.to_account_id else None,
-        to_account_name=to_account_name,
+        to_account_name=accounts.get(str(rule.to_account_id)) if rule.to_account_id else None,
         category_id=str(rule.category_id) if rule.category_id else None,
         category_name=cat.name if cat else None,
         category_color_light=cat.color_light if cat else None,
@@ -300,6 +469,100 @@ def to_schema(db: Session, rule: RecurringRule) -> RecurringRuleSchema:
     )
 
 
+def to_schemas(db: Session, rules: list[RecurringRule]) -> list[RecurringRuleSchema]:
+    """Project rules to schemas with a constant number of queries (see load_rule_refs)."""
+    accounts, categories = load_rule_refs(db, rules)
+    return [_project(rule, accounts, categories) for rule in rules]
+
+
+def to_schema(db: Session, rule: RecurringRule) -> RecurringRuleSchema:
+    return to_schemas(db, [rule])[0]
+
+
+# ── Upcoming calendar ────────────────────────────────────────────────────
+
+UPCOMING_DEFAULT_DAYS = 30
+# Longest calendar window served in one request.
+MAX_UPCOMING_DAYS = 366
+UPCOMING_DEFAULT_LIMIT = 200
+
+
+def get_upcoming(
+    db: Session,
+    user_id: str,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    days: int = UPCOMING_DEFAULT_DAYS,
+    currency: str | None = None,
+    limit: int = UPCOMING_DEFAULT_LIMIT,
+) -> UpcomingRecurringResponse:
+    """Upcoming occurrences of every active rule in [start, end], soonest first.
+
+    The window defaults to the user's local today plus `days`; the effective
+    window is then checked for order and `MAX_UPCOMING_DAYS` (400 otherwise).
+    Amounts are converted to `currency` (default: the user's preferred one)
+    with a single rates snapshot. At most `limit` occurrences are returned.
+    """
+    from app.services.exchange_rates import convert, get_rates_from_db
+
+    user = db.query(User).filter(User.id == user_id).first()
+    start = start or user_today(user)
+    end = end or start + timedelta(days=days)
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if (end - start).days > MAX_UPCOMING_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Window cannot exceed {MAX_UPCOMING_DAYS} days"
+        )
+    target = currency or (user.preferred_currency if user else None) or "USD"
+
+    rules = (
+        db.query(RecurringRule)
+        .filter(
+            RecurringRule.user_id == user_id,
+            RecurringRule.is_active,
+            RecurringRule.next_due_at <= end,
+            (RecurringRule.end_date.is_(None)) | (RecurringRule.end_date >= start),
+        )
+        .order_by(RecurringRule.id)
+        .all()
+    )
+    accounts, categories = load_rule_refs(db, rules)
+    rates = get_rates_from_db(db) if any(r.currency != target for r in rules) else {}
+
+    occurrences: list[UpcomingOccurrence] = []
+    merged = merge_upcoming(rules, start, end)
+    for due, rule in islice(merged, limit):
+        cat = categories.get(str(rule.category_id)) if rule.category_id is not None else None
+        occurrences.append(
+            UpcomingOccurrence(
+                rule_id=str(rule.id),
+                due_date=due,
+                type=rule.type,
+                name=rule.name,
+                amount=round(convert(rule.amount, rule.currency, target, rates), 2),
+                original_amount=rule.amount,
+                original_currency=rule.currency,
+                account_name=accounts.get(str(rule.account_id), ""),
+                to_account_name=accounts.get(str(rule.to_account_id))
+                if rule.to_account_id
+                else None,
+                category_name=cat.name if cat else None,
+                category_color_light=cat.color_light if cat else None,
+                category_color_dark=cat.color_dark if cat else None,
+            )
+        )
+    return UpcomingRecurringResponse(
+        occurrences=occurrences,
+        start_date=start,
+        end_date=end,
+        truncated=next(merged, None) is not None,
+        currency=target,
+        is_converted=any(o.original_currency != target for o in occurrences),
+    )
+
+
 def list_rules(db: Session, user_id: str) -> list[RecurringRule]:
     return (
         db.query(RecurringRule)
@@ -0,0 +1,347 @@
+"""Full-dump restore: load a cofr CSV backup archive into an account.
+
+The archive is what a full-backup CSV export writes: transactions.csv,
+accounts.csv and categories.csv, keyed by names rather than ids. A restore
+makes two passes over transactions.csv, streaming straight out of the ZIP:
+
+1. collect the account and category names it uses and create the ones the
+   user does not have (accounts match by name, categories by name or slug,
+   within the 20 custom category limit);
+2. load the transactions through the bulk loader, RESTORE_CHUNK_ROWS at a
+   time, committing each chunk.
+
+Each row's hash comes from its content plus its position among identical rows
+with the same timestamp, so running a restore again (after a failure, or twice
+by mistake) skips what is already there. A failed job keeps its upload and
+resumes from its last committed chunk. Transfer legs are paired up again at
+the end by timestamp, amount, currency and description.
+"""
+
+import csv
+import hashlib
+import io
+import uuid
+import zipfile
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from itertools import batched
+
+import sentry_sdk
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Account, Category, Transaction, User
+from app.services.budget_service import rebuild_category_budgets
+from app.services.bulk_loader import load_transactions
+from app.services.category_service import generate_slug
+from app.services.import_service import get_job, record_row_error, release_source, update_job
+
+TRANSACTIONS_FILE = "transactions.csv"
+ACCOUNTS_FILE = "accounts.csv"
+CATEGORIES_FILE = "categories.csv"
+REQUIRED_HEADERS = ("Date", "Amount", "Currency", "Category", "Category Type", "Account")
+ACCOUNT_TYPES = ("checking", "savings", "investment")
+# Same cap as CategoryService.create_category.
+MAX_CUSTOM_CATEGORIES = 20
+# Colours for categories a restore has to create (the system grey).
+NEW_CATEGORY_COLORS = ("#6B7280", "#9CA3AF")
+# Where rows go when their category cannot be created, by type.
+FALLBACK_CATEGORY_SLUGS = {"expense": "miscellaneous", "income": "income"}
+
+
+def _yes(value: str | None) -> bool:
+    return (value or "").strip().lower() in ("yes", "true", "1")
+
+
+def _open_member(archive: zipfile.ZipFile, name: str) -> io.TextIOWrapper:
+    try:
+        raw = archive.open(name)
+    except KeyError:
+        raise ValueError(f"{name} is missing; upload a full backup CSV export") from None
+    return io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+
+def iter_dump_rows(archive: zipfile.ZipFile) -> Iterator[dict[str, str]]:
+    with _open_member(archive, TRANSACTIONS_FILE) as stream:
+        reader = csv.DictReader(stream)
+        missing = [h for h in REQUIRED_HEADERS if h not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"{TRANSACTIONS_FILE} has no {', '.join(missing)} column")
+        yield from reader
+
+
+def _row_content(row: dict) -> tuple:
+    # DictReader files surplus cells under a None key; they are not part of the row.
+    return tuple(sorted((k, (v or "").strip()) for k, v in row.items() if k is not None))
+
+
+def row_hash(user_id: str, content: tuple, occurrence: int) -> str:
+    text = "\x1f".join((*(v for _, v in content), str(occurrence)))
+    return f"restore:{user_id}:{hashlib.sha256(text.encode()).hexdigest()[:40]}"
+
+
+def _parse_timestamp(raw: str) -> datetime:
+    try:
+        value = datetime.fromisoformat(raw.strip())
+    except ValueError:
+        raise ValueError(f"Invalid date {raw!r}") from None
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+class RestoreService:
+    def __init__(self, db: Session):
+        self.db = db
+        # (type, lower-cased name) -> category_ref the loader should resolve instead
+        self._remapped: dict[tuple[str, str], str] = {}
+
+    def run_restore(self, job_id: str) -> None:
+        job = get_job(job_id)
+        if job is None or job.path is None:
+            return
+        # Only unexpected failures (database, worker) keep the upload for a resume;
+        # a malformed archive fails the same way every time.
+        resumable = False
+        try:
+            update_job(job, status="running")
+            user = self.db.query(User).filter(User.id == job.user_id).one()
+            with zipfile.ZipFile(job.path) as archive:
+                self._reconcile(job, user, archive)
+                self.db.commit()
+                self._load(job, user, archive)
+            self.relink_transfers(user.id)
+            self.db.commit()
+            job.status = "done"
+            job.error = None
+        except zipfile.BadZipFile:
+            job.status = "error"
+            job.error = "Not a ZIP archive; upload a full backup CSV export"
+        except Exception as exc:
+            self.db.rollback()
+            job.status = "error"
+            if isinstance(exc, ValueError):
+                job.error = str(exc)
+            else:
+                resumable = True
+                job.error = "Restore failed; resume the job to continue"
+                sentry_sdk.capture_exception(exc)
+        finally:
+            update_job(job, completed_at=datetime.now(UTC))
+            if not resumable:
+                release_source(job)
+
+    # ── Accounts and categories ──
+
+    def _reconcile(self, job, user: User, archive: zipfile.ZipFile) -> None:
+        """Create the accounts and categories the archive uses that the user lacks."""
+        accounts: dict[str, str] = {}
+        categories: dict[tuple[str, str], str] = {}
+        names = archive.namelist()
+        if ACCOUNTS_FILE in names:
+            with _open_member(archive, ACCOUNTS_FILE) as stream:
+                for row in csv.DictReader(stream):
+                    accounts.setdefault((row.get("Name") or "").strip(), row.get("Type") or "")
+        if CATEGORIES_FILE in names:
+            with _open_member(archive, CATEGORIES_FILE) as stream:
+                for row in csv.DictReader(stream):
+                    name = (row.get("Name") or "").strip()
+                    categories.setdefault((row.get("Type") or "", name.lower()), name)
+        for row in iter_dump_rows(archive):
+            accounts.setdefault(row["Account"].strip(), row.get("Account Type") or "")
+            name = row["Category"].strip()
+            categories.setdefault((row["Category Type"], name.lower()), name)
+        accounts.pop("", None)
+
+        self._ensure_accounts(user, accounts)
+        retyped = self._ensure_categories(job, user, categories)
+        self.db.flush()
+        rebuild_category_budgets(self.db, retyped)
+
+    def _ensure_accounts(self, user: User, wanted: dict[str, str]) -> None:
+        existing = {
+            name for (name,) in self.db.query(Account.name).filter(Account.user_id == user.id)
+        }
+        max_order = (
+            self.db.query(func.max(Account.display_order))
+            .filter(Account.user_id == user.id)
+            .scalar()
+        ) or 0
+        for name, account_type in wanted.items():
+            if name[:60] in existing:
+                continue
+            max_order += 1
+            existing.add(name[:60])
+            self.db.add(
+                Account(
+                    user_id=user.id,
+                    name=name[:60],
+                    type=account_type if account_type in ACCOUNT_TYPES else "checking",
+                    is_system=False,
+                    display_order=max_order,
+                )
+            )
+
+    def _ensure_categories(
+        self, job, user: User, wanted: dict[tuple[str, str], str]
+    ) -> list[uuid.UUID]:
+        """Create or revive the archive's categories. Returns ids of revived ones whose type changed."""
+        categories = (
+            self.db.query(Category)
+            .filter((Category.user_id == user.id) | Category.user_id.is_(None))
+            .order_by(Category.display_order)
+            .all()
+        )
+        live = [c for c in categories if c.deleted_at is None]
+        known = {(c.type, c.name.lower()) for c in live} | {(c.type, c.slug) for c in live}
+        deleted = {c.slug: c for c in categories if c.user_id and c.deleted_at is not None}
+        custom_count = sum(1 for c in live if c.user_id is not None)
+        max_order = max((c.display_order for c in categories), default=0)
+        retyped = []
+
+        for (cat_type, key), name in wanted.items():
+            if cat_type not in FALLBACK_CATEGORY_SLUGS or not name:
+                continue
+            slug = generate_slug(name)
+            if (cat_type, key) in known or (cat_type, slug) in known:
+                continue
+            if slug in deleted:
+                restored = deleted.pop(slug)
+                restored.deleted_at = None
+                restored.name = name[:60]
+                if restored.type != cat_type:
+                    retyped.append(restored.id)
+                restored.type = cat_type
+                restored.is_active = True
+            elif custom_count < MAX_CUSTOM_CATEGORIES:
+                max_order += 1
+                self.db.add(
+                    Category(
+                        user_id=user.id,
+                        name=name[:60],
+                        slug=slug,
+                        color_light=NEW_CATEGORY_COLORS[0],
+                        color_dark=NEW_CATEGORY_COLORS[1],
+                        type=cat_type,
+                        is_system=False,
+                        is_active=True,
+                        display_order=max_order,
+                    )
+                )
+            else:
+                of_type = [c for c in live if c.type == cat_type]
+                fallback = next(
+                    (c for c in of_type if c.slug == FALLBACK_CATEGORY_SLUGS[cat_type]),
+                    of_type[0] if of_type else None,
+                )
+                if fallback is not None:
+                    self._remapped[(cat_type, key)] = fallback.slug
+                    job.errors.append(
+                        f"Category {name!r} filed under {fallback.name!r}: "
+                        f"{MAX_CUSTOM_CATEGORIES} custom categories already exist"
+                    )
+                continue
+            custom_count += 1
+            known |= {(cat_type, key), (cat_type, slug)}
+        return retyped
+
+    # ── Transactions ──
+
+    def _rows(self, user: User, archive: zipfile.ZipFile, skip: int):
+        """Yield loader rows (or the error for each bad line) after the first `skip`."""
+        user_id = str(user.id)
+        group, seen = None, Counter()
+        for index, row in enumerate(iter_dump_rows(archive)):
+            # Exports are sorted by timestamp, so identical rows are counted
+            # within their timestamp only and memory stays flat.
+            if row["Date"] != group:
+                group, seen = row["Date"], Counter()
+            content = _row_content(row)
+            seen[content] += 1
+            if index < skip:
+                continue
+            try:
+                yield self._loader_row(user, row, row_hash(user_id, content, seen[content] - 1))
+            except ValueError as exc:
+                yield ValueError(f"Line {index + 2}: {exc}")
+
+    def _loader_row(self, user: User, row: dict[str, str], hash_: str) -> dict:
+        is_transfer = _yes(row.get("Transfer")) or row["Category Type"] == "transfer"
+        try:
+            amount = abs(float(row["Amount"]))
+        except ValueError:
+            raise ValueError(f"Invalid amount {row['Amount']!r}") from None
+        cat_type, name = row["Category Type"], row["Category"].strip()
+        direction = (row.get("Transfer Direction") or "").strip() or None
+        if is_transfer and direction not in ("from", "to"):
+            raise ValueError("Transfer without a direction")
+        return {
+            "user_id": user.id,
+            "account_ref": row["Account"].strip()[:60],
+            "category_ref": None
+            if is_transfer
+            else self._remapped.get((cat_type, name.lower()), name),
+            "category_type": None if is_transfer else cat_type,
+            "amount": amount,
+            "currency": (row["Currency"] or "USD").strip().upper()[:3],
+            "notes": (row.get("Description") or "")[:360],
+            "timestamp": _parse_timestamp(row["Date"]),
+            "hash": hash_,
+            "is_opening_balance": _yes(row.get("Opening Balance")),
+            "is_transfer": is_transfer,
+            "transfer_direction": direction if is_transfer else None,
+        }
+
+    def _load(self, job, user: User, archive: zipfile.ZipFile) -> None:
+        # rows_read only advances once a chunk is committed, so it is the resume point.
+        for chunk in batched(self._rows(user, archive, job.rows_read), settings.RESTORE_CHUNK_ROWS):
+            rows = []
+            errors = []
+            for item in chunk:
+                (errors if isinstance(item, ValueError) else rows).append(item)
+            result = load_transactions(self.db, rows)
+            self.db.commit()
+            update_job(
+                job,
+                rows_read=job.rows_read + len(chunk),
+                rows_inserted=job.rows_inserted + len(result.inserted),
+                rows_duplicate=job.rows_duplicate + result.duplicates,
+            )
+            for error in errors:
+                record_row_error(job, str(error))
+            for _ in range(result.unresolved):
+                record_row_error(job, "Account or category could not be matched")
+
+    def relink_transfers(self, user_id) -> int:
+        """Pair restored transfer legs that are not linked yet. Returns the pairs linked."""
+        legs = (
+            self.db.query(
+                Transaction.id,
+                Transaction.timestamp,
+                Transaction.amount,
+                Transaction.currency,
+                Transaction.notes,
+                Transaction.transfer_direction,
+            )
+            .filter(
+                Transaction.user_id == user_id,
+                Transaction.is_transfer.is_(True),
+                Transaction.linked_transaction_id.is_(None),
+                Transaction.hash.like(f"restore:{user_id}:%"),
+            )
+            .order_by(Transaction.timestamp, Transaction.hash)
+            .all()
+        )
+        sides: dict[tuple, dict[str, list]] = defaultdict(lambda: {"from": [], "to": []})
+        for leg in legs:
+            key = (leg.timestamp, round(leg.amount, 2), leg.currency, leg.notes)
+            sides[key][leg.transfer_direction].append(leg.id)
+
+        updates = []
+        for pair in sides.values():
+            for from_id, to_id in zip(pair["from"], pair["to"], strict=False):
+                updates.append({"id": from_id, "linked_transaction_id": to_id})
+                updates.append({"id": to_id, "linked_transaction_id": from_id})
+        if updates:
+            self.db.execute(update(Transaction), updates)
+        return len(updates) // 2
@@ -0,0 +1,21 @@
+"""SQLite shims shared by the benchmarks that run on a throwaway in-memory database."""
+
+import uuid
+
+from sqlalchemy import Uuid
+
+
+def accept_str_uuids() -> None:
+    """Let SQLite bind str ids like PostgreSQL does (request schemas carry ids as str)."""
+    if getattr(Uuid.bind_processor, "_accepts_str", False):
+        return
+    original = Uuid.bind_processor
+
+    def bind_processor(self, dialect):
+        process = original(self, dialect)
+        if process is None:
+            return None
+        return lambda value: process(uuid.UUID(value) if isinstance(value, str) else value)
+
+    bind_processor._accepts_str = True
+    Uuid.bind_processor = bind_processor
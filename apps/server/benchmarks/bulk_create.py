@@ -0,0 +1,147 @@
+"""Benchmark: bulk expense create vs. one request per item.
+
+Creates `--items` expenses for one user twice, first through
+`ExpenseService.create_expense` one at a time (what a client replaying an
+offline queue does today via `POST /expenses/`), then through a single
+`create_expenses_bulk` call per batch of `--batch-size`. Reports items per
+second and SQL statements for each path.
+
+    uv run python -m benchmarks.bulk_create --items 2000 --batch-size 500
+
+Runs against a throwaway in-memory SQLite database unless `--database-url`
+points somewhere else (use an empty scratch database - rows are inserted).
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+# Defaults so the app's settings load outside a configured environment.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-at-least-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q=")
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.models import Account, Base, Category, User  # noqa: E402
+from app.db.schemas import ExpenseCreateRequest  # noqa: E402
+from app.services.expense_service import ExpenseService  # noqa: E402
+from benchmarks._sqlite import accept_str_uuids  # noqa: E402
+
+
+def _seed(db: Session) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    user_id, account_id = uuid.uuid4(), uuid.uuid4()
+    categories = [uuid.uuid4() for _ in range(8)]
+    db.execute(insert(User), [{"id": user_id, "default_account_id": None}])
+    db.execute(
+        insert(Account),
+        [{"id": account_id, "user_id": user_id, "name": "Checking", "type": "checking"}],
+    )
+    db.execute(
+        insert(Category),
+        [
+            {
+                "id": cid,
+                "user_id": user_id,
+                "name": f"Category {i}",
+                "slug": f"category-{i}",
+                "color_light": "#6B7280",
+                "color_dark": "#9CA3AF",
+                "type": "expense",
+            }
+            for i, cid in enumerate(categories)
+        ],
+    )
+    db.commit()
+    return user_id, categories
+
+
+def _items(categories: list, count: int) -> list[ExpenseCreateRequest]:
+    start = datetime.now(UTC) - timedelta(days=365)
+    return [
+        ExpenseCreateRequest(
+            amount=round(5 + (i * 37) % 200 + 0.25, 2),
+            category_id=str(categories[i % len(categories)]),
+            description=f"Statement line {i}",
+            currency="NZD",
+            created_at=start + timedelta(hours=i * 3),
+        )
+        for i in range(count)
+    ]
+
+
+def _timed(engine, fn) -> tuple[float, int]:
+    statements = 0
+
+    def _count(*_args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    started = time.perf_counter()
+    try:
+        fn()
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", _count)
+    return elapsed, statements
+
+
+def run(items: int = 2000, batch_size: int = 500, database_url: str = "sqlite://") -> dict:
+    """Create `items` expenses via each path and return timing and round-trip figures."""
+    if database_url.startswith("sqlite"):
+        accept_str_uuids()
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+        poolclass=StaticPool if database_url.startswith("sqlite") else None,
+    )
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        user_id, categories = _seed(db)
+        service = ExpenseService(db)
+        payload = _items(categories, items)
+
+        async def single():
+            for item in payload:
+                await service.create_expense(user_id, item)
+
+        async def bulk():
+            for i in range(0, len(payload), batch_size):
+                await service.create_expenses_bulk(user_id, payload[i : i + batch_size])
+
+        single_seconds, single_statements = _timed(engine, lambda: asyncio.run(single()))
+        bulk_seconds, bulk_statements = _timed(engine, lambda: asyncio.run(bulk()))
+
+    engine.dispose()
+    return {
+        "items": items,
+        "batch_size": batch_size,
+        "single_seconds": round(single_seconds, 3),
+        "single_items_per_second": round(items / single_seconds) if single_seconds else None,
+        "single_statements": single_statements,
+        "bulk_seconds": round(bulk_seconds, 3),
+        "bulk_items_per_second": round(items / bulk_seconds) if bulk_seconds else None,
+        "bulk_statements": bulk_statements,
+        "speedup": round(single_seconds / bulk_seconds, 1) if bulk_seconds else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+    for key, value in run(args.items, args.batch_size, args.database_url).items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Micro-benchmark: `advance()` against the step-by-step walk it replaced.
+
+    uv run python -m benchmarks.cadence
+
+Times next-occurrence lookups for rules of increasing age. The stepwise
+version's cost grows with the age of the rule; the closed form should not.
+"""
+
+import os
+import timeit
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-at-least-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q=")
+
+from app.services.recurring_service import _add_months, advance  # noqa: E402
+
+
+def advance_stepwise(
+    rule_start: date, interval_unit: str, interval_count: int, from_date: date
+) -> date:
+    """The original iterative `advance`, kept as the reference implementation."""
+    if interval_unit in ("day", "week"):
+        step = timedelta(days=interval_count * (7 if interval_unit == "week" else 1))
+        nxt = rule_start
+        while nxt <= from_date:
+            nxt = nxt + step
+        return nxt
+    if interval_unit in ("month", "year"):
+        months = interval_count * (12 if interval_unit == "year" else 1)
+        k = 0
+        while True:
+            k += 1
+            nxt = _add_months(rule_start, k * months)
+            if nxt > from_date:
+                return nxt
+    raise ValueError(f"invalid interval_unit: {interval_unit}")
+
+
+CASES = [("day", 1), ("week", 1), ("month", 1), ("year", 1)]
+AGES_DAYS = [30, 365, 3650]
+
+
+def run(number: int = 2000) -> list[dict]:
+    today = date(2026, 10, 19)
+    results = []
+    for unit, count in CASES:
+        for age in AGES_DAYS:
+            start = today - timedelta(days=age)
+            args = (start, unit, count, today)
+            stepwise = timeit.timeit(lambda a=args: advance_stepwise(*a), number=number)
+            closed = timeit.timeit(lambda a=args: advance(*a), number=number)
+            results.append(
+                {
+                    "unit": unit,
+                    "age_days": age,
+                    "stepwise_us": stepwise / number * 1e6,
+                    "closed_form_us": closed / number * 1e6,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    print(f"{'unit':>6} {'age (days)':>11} {'stepwise µs':>12} {'closed µs':>10} {'speedup':>8}")
+    for r in run():
+        speedup = r["stepwise_us"] / r["closed_form_us"]
+        print(
+            f"{r['unit']:>6} {r['age_days']:>11} {r['stepwise_us']:>12.2f}"
+            f" {r['closed_form_us']:>10.2f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
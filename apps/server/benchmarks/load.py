@@ -0,0 +1,430 @@
+"""Load test: weighted API traffic from concurrent virtual users.
+
+Seeds `--users` users into `--database-url` with `app.commands.seed_dataset`,
+mints their JWTs with `create_access_token` (so the stack must share
+JWT_SECRET), starts uvicorn with the preset's worker count and pool sizes,
+then runs `--concurrency` virtual users for `--duration` seconds. Each one
+replays a weighted mix of dashboard bootstrap, transaction list, create,
+update, delete, export and login requests as one seeded user. Reports p50,
+p95 and p99 latency, throughput, errors (5xx, transport failures, unexpected
+4xx) and rate-limited (429) responses per route.
+
+    uv run python -m benchmarks.load --preset 4 --database-url postgresql://localhost/cofr_load
+    uv run python -m benchmarks.load --preset 1 --mix bootstrap=1 --duration 60
+    uv run python -m benchmarks.load --base-url http://localhost:5784 --concurrency 32
+
+Presets (workers / virtual users / DB_POOL_SIZE + DB_MAX_OVERFLOW per
+worker) keep the total connections under PostgreSQL's default 100; flags
+override them. `--base-url` drives an already running stack instead (it must
+use the same database and JWT_SECRET). The API binds ids as strings, which
+only PostgreSQL accepts, so point `--database-url` at a migrated PostgreSQL
+database (`alembic upgrade head`); seeded users are reused across runs. Login is
+limited to 20 attempts per IP per 15 minutes, so most login requests come
+back 429 by design. Exports fail with 503 when scribe is not installed; leave
+them out with `--mix`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+# Defaults so the app's settings load outside a configured environment.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-at-least-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q=")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.auth.jwt import create_access_token  # noqa: E402
+from app.auth.passwords import hash_password  # noqa: E402
+from app.commands.seed_dataset import (  # noqa: E402
+    DEFAULT_END,
+    DatasetSpec,
+    ensure_reference_data,
+    seed,
+)
+from app.db.models import AuthProvider  # noqa: E402
+from benchmarks.services import _percentile  # noqa: E402
+
+PRESETS = {
+    "1": {"workers": 1, "concurrency": 16, "pool_size": 15, "max_overflow": 25},
+    "4": {"workers": 4, "concurrency": 64, "pool_size": 10, "max_overflow": 10},
+    "8": {"workers": 8, "concurrency": 128, "pool_size": 5, "max_overflow": 5},
+}
+
+# Relative weights of each action in the default traffic mix.
+MIX = {
+    "bootstrap": 30,
+    "list": 30,
+    "create": 15,
+    "update": 10,
+    "delete": 6,
+    "export": 2,
+    "login": 1,
+}
+
+ROUTES = {
+    "bootstrap": "GET /dashboard/bootstrap",
+    "list": "GET /expenses/",
+    "create": "POST /expenses/",
+    "update": "PUT /expenses/{id}",
+    "delete": "DELETE /expenses/{id}",
+    "export": "POST /exports",
+    "login": "POST /auth/local/login",
+}
+
+LOGIN_PASSWORD = "LoadTest1234!"
+_SERVER_DIR = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class LoadUser:
+    user_id: str
+    headers: dict
+    category_id: str
+    email: str | None = None
+
+
+@dataclass
+class Recorder:
+    # Samples before `since` (the warm-up) are dropped.
+    since: float = 0.0
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, dict[str, int]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(int))
+    )
+
+    def add(self, route: str, started: float, outcome: str) -> None:
+        if started < self.since:
+            return
+        self.latencies[route].append((time.perf_counter() - started) * 1000)
+        self.statuses[route][outcome] += 1
+
+
+def prepare(db: Session, spec: DatasetSpec, login_users: int = 2) -> list[LoadUser]:
+    """Seed `spec`, give the first users a local login and mint everyone's token."""
+    summary = seed(db, spec)
+    food = str(ensure_reference_data(db)["food-dining"])
+    users = []
+    for index, user_id in enumerate(summary.user_ids):
+        email = f"load-{spec.seed}-{index}@example.com" if index < login_users else None
+        if email and not db.query(AuthProvider.id).filter_by(provider_user_id=email).first():
+            db.add(
+                AuthProvider(
+                    user_id=user_id,
+                    provider="local",
+                    provider_user_id=email,
+                    email=email,
+                    display_name=f"Load {index}",
+                    password_hash=hash_password(LOGIN_PASSWORD),
+                )
+            )
+        token = create_access_token(str(user_id), f"load-{index}")
+        users.append(LoadUser(str(user_id), {"Authorization": f"Bearer {token}"}, food, email))
+    db.commit()
+    return users
+
+
+def _classify(response: httpx.Response) -> str:
+    if response.status_code == 429:
+        return "rate_limited"
+    return "error" if response.status_code >= 400 else "ok"
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient,
+    user: LoadUser,
+    mix: dict[str, int],
+    rng: random.Random,
+    deadline: float,
+    recorder: Recorder,
+    logins: list[str],
+) -> None:
+    actions, weights = list(mix), list(mix.values())
+    created: list[str] = []
+    now = datetime.now(UTC)
+    bootstrap_params = {
+        "start_date": now.replace(day=1, hour=0, minute=0, second=0).isoformat(),
+        "end_date": now.isoformat(),
+    }
+    while time.perf_counter() < deadline:
+        action = rng.choices(actions, weights)[0]
+        if action in ("update", "delete") and not created:
+            action = "create"
+        route = ROUTES[action]
+        started = time.perf_counter()
+        try:
+            if action == "bootstrap":
+                response = await client.get(
+                    "/dashboard/bootstrap", params=bootstrap_params, headers=user.headers
+                )
+            elif action == "list":
+                response = await client.get(
+                    "/expenses/", params={"limit": 50}, headers=user.headers
+                )
+            elif action == "create":
+                response = await client.post(
+                    "/expenses/",
+                    json={
+                        "amount": round(rng.uniform(3, 120), 2),
+                        "category_id": user.category_id,
+                        "description": "load test",
+                        "created_at": (now - timedelta(days=rng.randrange(60))).isoformat(),
+                    },
+                    headers=user.headers,
+                )
+                if response.status_code == 201:
+                    created.append(response.json()["id"])
+            elif action == "update":
+                response = await client.put(
+                    f"/expenses/{rng.choice(created)}",
+                    json={"amount": round(rng.uniform(3, 120), 2)},
+                    headers=user.headers,
+                )
+            elif action == "delete":
+                response = await client.delete(
+                    f"/expenses/{created.pop(rng.randrange(len(created)))}",
+                    headers=user.headers,
+                )
+            elif action == "export":
+                response = await client.post(
+                    "/exports",
+                    json={"format": "csv", "scope": "transactions"},
+                    headers=user.headers,
+                )
+            else:
+                response = await client.post(
+                    "/auth/local/login",
+                    json={"email": rng.choice(logins), "password": LOGIN_PASSWORD},
+                )
+            outcome = _classify(response)
+        except httpx.HTTPError:
+            outcome = "error"
+        recorder.add(route, started, outcome)
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    users: list[LoadUser],
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    mix: dict[str, int] | None = None,
+    seed_value: int = 0,
+) -> dict:
+    """Run `concurrency` virtual users against `client` and summarise per route."""
+    mix = {k: v for k, v in (mix or MIX).items() if v > 0}
+    logins = [u.email for u in users if u.email]
+    if not logins:
+        mix.pop("login", None)
+    started = time.perf_counter()
+    recorder = Recorder(since=started + warmup)
+    deadline = started + warmup + duration
+    await asyncio.gather(
+        *(
+            _virtual_user(
+                client,
+                users[i % len(users)],
+                mix,
+                random.Random(f"{seed_value}:{i}"),
+                deadline,
+                recorder,
+                logins,
+            )
+            for i in range(concurrency)
+        )
+    )
+    elapsed = max(time.perf_counter() - recorder.since, 1e-9)
+    return _summary(recorder, elapsed)
+
+
+def _summary(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for route, samples in sorted(recorder.latencies.items()):
+        counts = recorder.statuses[route]
+        routes[route] = {
+            "requests": len(samples),
+            "rps": round(len(samples) / elapsed, 1),
+            "p50_ms": round(_percentile(samples, 0.50), 2),
+            "p95_ms": round(_percentile(samples, 0.95), 2),
+            "p99_ms": round(_percentile(samples, 0.99), 2),
+            "errors": counts["error"],
+            "rate_limited": counts["rate_limited"],
+            "error_rate": round(counts["error"] / len(samples), 4),
+        }
+    everything = [ms for samples in recorder.latencies.values() for ms in samples]
+    total = {
+        "requests": len(everything),
+        "rps": round(len(everything) / elapsed, 1),
+        "seconds": round(elapsed, 2),
+    }
+    if everything:
+        errors = sum(r["errors"] for r in routes.values())
+        total.update(
+            p50_ms=round(_percentile(everything, 0.50), 2),
+            p95_ms=round(_percentile(everything, 0.95), 2),
+            p99_ms=round(_percentile(everything, 0.99), 2),
+            errors=errors,
+            error_rate=round(errors / len(everything), 4),
+        )
+    return {"total": total, "routes": routes}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(database_url: str, workers: int, pool_size: int, max_overflow: int):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DB_POOL_SIZE": str(pool_size),
+        "DB_MAX_OVERFLOW": str(max_overflow),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=_SERVER_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+
+def _parse_mix(raw: str | None) -> dict[str, int] | None:
+    if not raw:
+        return None
+    mix = {}
+    for part in raw.split(","):
+        action, _, weight = part.partition("=")
+        if action not in ROUTES:
+            raise SystemExit(f"unknown action {action!r}; choose from {', '.join(ROUTES)}")
+        mix[action] = int(weight or 1)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="1")
+    parser.add_argument("--workers", type=int, help="uvicorn workers (overrides the preset)")
+    parser.add_argument("--concurrency", type=int, help="virtual users (overrides the preset)")
+    parser.add_argument("--pool-size", type=int, help="DB_POOL_SIZE per worker")
+    parser.add_argument("--max-overflow", type=int, help="DB_MAX_OVERFLOW per worker")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds first")
+    parser.add_argument("--mix", help="weights, e.g. bootstrap=3,list=2,create=1")
+    parser.add_argument("--users", type=int, default=20, help="seeded users to spread load over")
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=DEFAULT_END, help="data end")
+    parser.add_argument("--database-url", required=True, help="PostgreSQL database to load")
+    parser.add_argument("--base-url", help="drive this running stack instead of starting one")
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args()
+
+    preset = PRESETS[args.preset]
+    workers = args.workers or preset["workers"]
+    concurrency = args.concurrency or preset["concurrency"]
+    pool_size = args.pool_size or preset["pool_size"]
+    max_overflow = args.max_overflow if args.max_overflow is not None else preset["max_overflow"]
+
+    database_url = args.database_url
+    engine = create_engine(database_url)
+    with Session(engine) as db:
+        users = prepare(
+            db, DatasetSpec(users=args.users, months=args.months, seed=args.seed, end=args.end)
+        )
+    engine.dispose()
+
+    process, base_url = None, args.base_url
+    if base_url is None:
+        process, base_url = _start_server(database_url, workers, pool_size, max_overflow)
+
+    async def _run():
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            return await drive(
+                client,
+                users,
+                concurrency,
+                args.duration,
+                args.warmup,
+                _parse_mix(args.mix),
+                args.seed,
+            )
+
+    try:
+        result = asyncio.run(_run())
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=30)
+
+    result["config"] = {
+        "workers": None if args.base_url else workers,
+        "concurrency": concurrency,
+        "pool_size": None if args.base_url else pool_size,
+        "max_overflow": None if args.base_url else max_overflow,
+        "duration": args.duration,
+        "dataset_end": args.end.isoformat(),
+        "database": engine.dialect.name,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+
+    total = result["total"]
+    print(
+        f"{total['requests']} requests in {total['seconds']}s: {total['rps']} req/s, "
+        f"p50 {total.get('p50_ms')}ms p95 {total.get('p95_ms')}ms p99 {total.get('p99_ms')}ms, "
+        f"{total.get('errors', 0)} errors"
+    )
+    for route, r in result["routes"].items():
+        print(
+            f"{route:>26}: {r['requests']:>6} req {r['rps']:>7} req/s  p50 {r['p50_ms']:>8}ms"
+            f"  p95 {r['p95_ms']:>8}ms  p99 {r['p99_ms']:>8}ms  errors {r['errors']}"
+            f"  429 {r['rate_limited']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Micro-benchmark: request logging overhead against no middleware.
+
+    uv run python -m benchmarks.middleware
+    uv run python -m benchmarks.middleware --requests 5000 --body-kib 4096
+
+Sends requests straight into a minimal FastAPI app (no HTTP server or
+client in the way) wrapped four ways: no middleware, the old
+`BaseHTTPMiddleware`-style `log_requests` (kept here as the reference),
+`RequestLoggingMiddleware`, and `RequestLoggingMiddleware` with body capture.
+The access log is written to /dev/null so its formatting cost is included.
+Reports mean µs per request for a GET, a small POST and a large POST
+streamed in 64 KiB chunks.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-at-least-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q=")
+
+from fastapi import FastAPI, Request  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.metrics import REQUEST_DURATION, REQUESTS_IN_FLIGHT  # noqa: E402
+from app.middleware import RequestLoggingMiddleware, server_timing_enabled  # noqa: E402
+from app.query_stats import track_queries  # noqa: E402
+
+logger = logging.getLogger("app.middleware")
+
+CHUNK_BYTES = 64 * 1024
+CAPTURE_BYTES = 2048
+
+
+async def legacy_log_requests(request: Request, call_next):
+    """The original function middleware, buffering POST bodies before the route."""
+    start_time = time.perf_counter()
+
+    logger.info("→ %s %s", request.method, request.url.path)
+
+    if request.method in ("POST", "OPTIONS"):
+        body = await request.body()
+        logger.debug("  Body: %s", body)
+
+        async def receive():
+            return {"type": "http.request", "body": body}
+
+        request._receive = receive
+
+    logger.debug("  Query: %s", dict(request.query_params))
+
+    REQUESTS_IN_FLIGHT.inc()
+    try:
+        with track_queries() as stats:
+            response = await call_next(request)
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+
+    duration = time.perf_counter() - start_time
+    route = request.scope.get("route")
+    REQUEST_DURATION.observe(
+        duration,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+    logger.info(
+        "← %s %s %d (%.3fs, %d queries, db %.3fs)",
+        request.method,
+        request.url.path,
+        response.status_code,
+        duration,
+        stats.statements,
+        stats.db_seconds,
+    )
+    if server_timing_enabled():
+        db_ms = stats.db_seconds * 1000
+        app_ms = max(duration * 1000 - db_ms, 0.0)
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{stats.statements} queries", app;dur={app_ms:.1f}'
+        )
+    return response
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        return {"bytes": size}
+
+    return app
+
+
+def _stacks():
+    legacy = _make_app()
+    legacy.middleware("http")(legacy_log_requests)
+    return {
+        "none": (_make_app(), 0),
+        "log_requests (old)": (legacy, 0),
+        "asgi": (RequestLoggingMiddleware(_make_app()), 0),
+        "asgi + capture": (RequestLoggingMiddleware(_make_app()), CAPTURE_BYTES),
+    }
+
+
+async def _request(app, method: str, path: str, body: bytes) -> None:
+    chunks = [body[i : i + CHUNK_BYTES] for i in range(0, len(body), CHUNK_BYTES)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    status = None
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    headers = [(b"content-type", b"application/octet-stream")]
+    if body:
+        headers.append((b"content-length", str(len(body)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"{method} {path} returned {status}")
+
+
+async def _time(app, method: str, path: str, body: bytes, requests: int) -> float:
+    for _ in range(min(50, requests)):
+        await _request(app, method, path, body)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await _request(app, method, path, body)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def run(requests: int = 2000, body_kib: int = 1024) -> list[dict]:
+    cases = [
+        ("GET", "/ping", b"", requests),
+        ("POST small", "/upload", b"x" * 512, requests),
+        (f"POST {body_kib} KiB", "/upload", b"x" * (body_kib * 1024), max(requests // 20, 10)),
+    ]
+    handler = logging.FileHandler(os.devnull)
+    original = (logger.level, logger.propagate, settings.LOG_REQUEST_BODY_BYTES)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    results = []
+    try:
+        for stack, (app, capture) in _stacks().items():
+            settings.LOG_REQUEST_BODY_BYTES = capture
+            row = {"stack": stack}
+            for name, path, body, n in cases:
+                row[name] = asyncio.run(_time(app, name.split()[0], path, body, n))
+            results.append(row)
+    finally:
+        logger.level, logger.propagate, settings.LOG_REQUEST_BODY_BYTES = original
+        logger.removeHandler(handler)
+        handler.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--body-kib", type=int, default=1024)
+    args = parser.parse_args()
+
+    results = run(args.requests, args.body_kib)
+    columns = [key for key in results[0] if key != "stack"]
+    baseline = results[0]
+    print(f"{'stack':<20}" + "".join(f"{c + ' µs':>18}" for c in columns))
+    for row in results:
+        cells = []
+        for column in columns:
+            overhead = row[column] - baseline[column]
+            cells.append(f"{row[column]:>9.1f} ({overhead:+6.1f})")
+        print(f"{row['stack']:<20}" + "".join(f"{c:>18}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: recurring materialization catch-up after downtime.
+
+Seeds `--rules` active rules (daily expenses, weekly incomes and daily
+transfers spread across users in several timezones) whose cursors are
+`--days` behind, then times one `materialize_all_due` pass.
+
+    uv run python -m benchmarks.recurring_catch_up --rules 10000 --days 30
+
+Runs against a throwaway in-memory SQLite database unless `--database-url`
+points somewhere else (use an empty scratch database - rows are inserted).
+"""
+
+import argparse
+import os
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+# Defaults so the app's settings load outside a configured environment.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-at-least-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q=")
+
+from sqlalchemy import create_engine, event, func, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.models import Account, Base, RecurringRule, Transaction, User  # noqa: E402
+from app.services.recurring_service import materialize_all_due  # noqa: E402
+
+RULES_PER_USER = 10
+TIMEZONES = ["UTC", "Pacific/Auckland", "America/Los_Angeles", "Europe/London", "Asia/Kolkata"]
+
+
+def _seed(db: Session, rules: int, days: int) -> None:
+    start = datetime.now(UTC).date() - timedelta(days=days - 1)
+    users, accounts, rule_rows = [], [], []
+    for u in range((rules + RULES_PER_USER - 1) // RULES_PER_USER):
+        user_id = uuid.uuid4()
+        checking, savings = uuid.uuid4(), uuid.uuid4()
+        users.append({"id": user_id, "timezone": TIMEZONES[u % len(TIMEZONES)]})
+        accounts += [
+            {"id": checking, "user_id": user_id, "name": "Checking", "type": "checking"},
+            {"id": savings, "user_id": user_id, "name": "Savings", "type": "savings"},
+        ]
+        for r in range(min(RULES_PER_USER, rules - u * RULES_PER_USER)):
+            kind = ("expense", "expense", "expense", "income", "transfer")[r % 5]
+            rule_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "type": kind,
+                    "name": f"{kind} {r}",
+                    "amount": 10.0 + r,
+                    "currency": "NZD",
+                    "account_id": checking,
+                    "to_account_id": savings if kind == "transfer" else None,
+                    "description": "",
+                    "interval_unit": "week" if kind == "income" else "day",
+                    "interval_count": 1,
+                    "start_date": start,
+                    "next_due_at": start,
+                    "is_active": True,
+                }
+            )
+    db.execute(insert(User), users)
+    db.execute(insert(Account), accounts)
+    db.execute(insert(RecurringRule), rule_rows)
+    db.commit()
+
+
+def run(rules: int = 10_000, days: int = 30, database_url: str = "sqlite://") -> dict:
+    """Seed, run one catch-up pass and return timing and round-trip figures."""
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+        poolclass=StaticPool if database_url.startswith("sqlite") else None,
+    )
+    Base.metadata.create_all(engine)
+
+    statements = 0
+
+    def _count(*_args):
+        nonlocal statements
+        statements += 1
+
+    with Session(engine) as db:
+        _seed(db, rules, days)
+        event.listen(engine, "before_cursor_execute", _count)
+        started = time.perf_counter()
+        created = materialize_all_due(db)
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", _count)
+        rows = db.query(func.count(Transaction.id)).scalar()
+
+    engine.dispose()
+    return {
+        "rules": rules,
+        "days": days,
+        "occurrences": created,
+        "rows": rows,
+        "statements": statements,
+        "seconds": round(elapsed, 3),
+        "occurrences_per_second": round(created / elapsed) if elapsed else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+    for key, value in run(args.rules, args.days, args.database_url).items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Benchmark: service hot paths on seeded data, with a baseline regression check.
+
+Seeds `--users` users with `app.commands.seed_dataset` (fixed `--seed`, history
+ending on `--end`, the dataset's DEFAULT_END unless given), then times every
+case `--rounds` times after one warm-up call:
+
+- ExpenseService: get_expenses, get_range_stats, get_account_balances,
+  get_lifetime_stats, get_spend_sparkline
+- every DashboardAnalyticsService method
+- BudgetService.get_budgets
+- materialize_all_due, with the last `--catch-up-days` of recurring rows
+  removed and the rules rewound before each round
+- ExportService.run_export for each format (skipped without scribe)
+
+Per-user cases run for the first seeded user. Expense windows and the
+recurring catch-up are anchored to `--end`; the dashboard and budget services
+read the wall clock, so their windows drift past the data over time - refresh
+the baseline together with `--end`. Each case reports median, p95,
+min and max milliseconds plus the SQL statements of one call. `--output`
+writes the results as JSON; `--baseline` compares against a stored results
+file and exits non-zero when a case's median is more than `--threshold`
+slower (and at least `--min-delta-ms` slower) or it issues more statements.
+
+    uv run python -m benchmarks.services --save-baseline bench-main.json
+    uv run python -m benchmarks.services --baseline bench-main.json --threshold 0.2
+    uv run python -m benchmarks.services --database-url postgresql://localhost/cofr_bench
+
+Runs against a throwaway in-memory SQLite database unless `--database-url`
+points somewhere else (PostgreSQL needs `alembic upgrade head` first; seeded
+users are reused on the next run). Compare baselines from the same machine
+and database only.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+
+# Defaults so the app's settings load outside a configured environment.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-at-least-32-chars")
+os.environ.setdefault("ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q=")
+
+from sqlalchemy import create_engine, event, func  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.commands.seed_dataset import DEFAULT_END, DatasetSpec, seed  # noqa: E402
+from app.db.models import Base, RecurringRule, Transaction  # noqa: E402
+from app.db.schemas import ExportCreateRequest  # noqa: E402
+from app.services import export_service  # noqa: E402
+from app.services.budget_service import BudgetService, record_transaction_changes  # noqa: E402
+from app.services.dashboard_analytics_service import DashboardAnalyticsService  # noqa: E402
+from app.services.expense_service import ExpenseService  # noqa: E402
+from app.services.recurring_service import advance, materialize_all_due  # noqa: E402
+from benchmarks._sqlite import accept_str_uuids  # noqa: E402
+
+EXPORT_FORMATS = ("csv", "csv_gz", "csv_zst", "xlsx", "pdf", "parquet", "arrow")
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    # Untimed, runs before every call (warm-up included).
+    setup: Callable[[], None] | None = None
+    skip: str | None = None
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct * len(ordered)) - 1))]
+
+
+def _measure(engine, db: Session, case: Case, rounds: int) -> dict:
+    statements = 0
+
+    def _count(*_args):
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    for i in range(rounds + 1):
+        if case.setup:
+            case.setup()
+        db.rollback()
+        statements = 0
+        event.listen(engine, "before_cursor_execute", _count)
+        started = time.perf_counter()
+        try:
+            case.fn()
+        finally:
+            elapsed = time.perf_counter() - started
+            event.remove(engine, "before_cursor_execute", _count)
+        db.rollback()
+        if i:  # the first call warms caches and is not counted
+            timings.append(elapsed * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "rounds": rounds,
+        "statements": statements,
+    }
+
+
+def _rewind_recurring(db: Session, days: int, end: date) -> None:
+    """Drop recurring rows of the `days` days up to `end` and point the rules back at them."""
+    cutoff = end - timedelta(days=days)
+    recent = (
+        db.query(Transaction)
+        .filter(
+            Transaction.recurring_rule_id.isnot(None),
+            Transaction.timestamp >= datetime.combine(cutoff, datetime.min.time(), tzinfo=UTC),
+        )
+        .all()
+    )
+    record_transaction_changes(db, removed=recent)
+    ids = [tx.id for tx in recent]
+    db.query(Transaction).filter(Transaction.linked_transaction_id.in_(ids)).update(
+        {Transaction.linked_transaction_id: None}, synchronize_session=False
+    )
+    db.query(Transaction).filter(Transaction.id.in_(ids)).delete(synchronize_session=False)
+    for rule in db.query(RecurringRule).filter(RecurringRule.is_active.is_(True)):
+        rule.next_due_at = advance(
+            rule.start_date, rule.interval_unit, rule.interval_count, cutoff - timedelta(days=1)
+        )
+        # Recomputed by the pass itself, as for rules that never had one.
+        rule.next_due_utc = None
+    db.commit()
+
+
+def _export(db: Session, user_id: str, fmt: str) -> None:
+    request = ExportCreateRequest(format=fmt, scope="transactions")
+    job = export_service.create_job(user_id, request)
+    try:
+        export_service.ExportService(db).run_export(job.id, user_id, request)
+        if job.status != "done":
+            raise RuntimeError(f"{fmt} export failed: {job.error}")
+    finally:
+        if job.file_path:
+            os.unlink(job.file_path)
+        export_service.discard_job(job.id)
+
+
+def _cases(db: Session, user_id: str, catch_up_days: int, end: date) -> list[Case]:
+    expenses = ExpenseService(db)
+    analytics = DashboardAnalyticsService(db)
+    budgets = BudgetService(db)
+    # Midday keeps `end` the local date in every seeded timezone.
+    now = datetime(end.year, end.month, end.day, 12, tzinfo=UTC)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    cases = [
+        Case("expenses.get_expenses", lambda: asyncio.run(expenses.get_expenses(user_id))),
+        Case(
+            "expenses.get_expenses_filtered",
+            lambda: asyncio.run(
+                expenses.get_expenses(
+                    user_id,
+                    start_date=now - timedelta(days=90),
+                    end_date=now,
+                    collapse_transfer_pairs=True,
+                )
+            ),
+        ),
+        Case(
+            "expenses.get_range_stats",
+            lambda: asyncio.run(expenses.get_range_stats(user_id, month_start, now)),
+        ),
+        Case("expenses.get_account_balances", lambda: expenses.get_account_balances(user_id)),
+        Case("expenses.get_lifetime_stats", lambda: expenses.get_lifetime_stats(user_id)),
+        Case(
+            "expenses.get_spend_sparkline",
+            lambda: expenses.get_spend_sparkline(user_id, now - timedelta(days=30), now),
+        ),
+        Case("dashboard.get_monthly_trend", lambda: analytics.get_monthly_trend(user_id)),
+        Case("dashboard.get_weekday_heatmap", lambda: analytics.get_weekday_heatmap(user_id)),
+        Case("dashboard.get_account_trend", lambda: analytics.get_account_trend(user_id)),
+        Case("dashboard.get_recurring", lambda: analytics.get_recurring(user_id)),
+        Case("budgets.get_budgets", lambda: asyncio.run(budgets.get_budgets(user_id))),
+        Case(
+            "recurring.materialize_all_due",
+            lambda: materialize_all_due(db, now=now),
+            setup=lambda: _rewind_recurring(db, catch_up_days, end),
+        ),
+    ]
+    missing = None if export_service.is_rust_available() else "scribe is not installed"
+    for fmt in EXPORT_FORMATS:
+        cases.append(Case(f"export.{fmt}", lambda fmt=fmt: _export(db, user_id, fmt), skip=missing))
+    return cases
+
+
+def run(
+    users: int = 5,
+    months: int = 12,
+    seed_value: int = 42,
+    rounds: int = 10,
+    catch_up_days: int = 30,
+    database_url: str = "sqlite://",
+    only: list[str] | None = None,
+    end: date = DEFAULT_END,
+) -> dict:
+    """Seed, time every case and return the results document."""
+    is_sqlite = database_url.startswith("sqlite")
+    if is_sqlite:
+        accept_str_uuids()
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        poolclass=StaticPool if is_sqlite else None,
+    )
+    if is_sqlite:
+        Base.metadata.create_all(engine)
+
+    results: dict[str, dict] = {}
+    with Session(engine) as db:
+        started = time.perf_counter()
+        summary = seed(db, DatasetSpec(users=users, months=months, seed=seed_value, end=end))
+        seed_seconds = time.perf_counter() - started
+        user_id = str(summary.user_ids[0])
+        transactions = db.query(func.count(Transaction.id)).scalar()
+
+        for case in _cases(db, user_id, catch_up_days, end):
+            if only and not any(case.name.startswith(prefix) for prefix in only):
+                continue
+            if case.skip:
+                results[case.name] = {"skipped": case.skip}
+                continue
+            results[case.name] = _measure(engine, db, case, rounds)
+
+    engine.dispose()
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "users": users,
+            "months": months,
+            "seed": seed_value,
+            "end": end.isoformat(),
+            "seeded_users": summary.users,
+            "transactions": transactions,
+            "seed_seconds": round(seed_seconds, 2),
+            "rounds": rounds,
+        },
+        "cases": results,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float = 0.2, min_delta_ms: float = 1.0
+) -> list[str]:
+    """Regressions of `results` against `baseline`, one line per case."""
+    regressions = []
+    for name, current in results["cases"].items():
+        before = baseline.get("cases", {}).get(name)
+        if not before or "median_ms" not in before or "median_ms" not in current:
+            continue
+        slower = current["median_ms"] - before["median_ms"]
+        if slower > min_delta_ms and current["median_ms"] > before["median_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: median {before['median_ms']:.2f}ms -> {current['median_ms']:.2f}ms "
+                f"(+{slower / before['median_ms']:.0%})"
+            )
+        if current["statements"] > before["statements"]:
+            regressions.append(
+                f"{name}: statements {before['statements']} -> {current['statements']}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--catch-up-days", type=int, default=30)
+    parser.add_argument("--end", type=date.fromisoformat, default=DEFAULT_END, help="data end")
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--only", action="append", help="case name prefix (repeatable)")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--save-baseline", help="write the results JSON here as the baseline")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2=20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = run(
+        users=args.users,
+        months=args.months,
+        seed_value=args.seed,
+        rounds=args.rounds,
+        catch_up_days=args.catch_up_days,
+        database_url=args.database_url,
+        only=args.only,
+        end=args.end,
+    )
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    meta = results["meta"]
+    print(f"{meta['database']}: {meta['users']} users, {meta['transactions']} transactions")
+    for name, case in results["cases"].items():
+        if "skipped" in case:
+            print(f"{name:>34}: skipped ({case['skipped']})")
+        else:
+            print(
+                f"{name:>34}: median {case['median_ms']:>9.2f}ms  p95 {case['p95_ms']:>9.2f}ms"
+                f"  {case['statements']:>4} statements"
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark: cold start to first request.
+
+Starts a fresh interpreter with `python -X importtime`, imports the app,
+runs its lifespan and sends `GET /health`, then reports:
+
+- import time of `app.main` and the slowest top-level imports
+- time from lifespan start to the first response
+- which lazily-loaded heavy dependencies were imported anyway
+
+    uv run python -m benchmarks.startup
+
+Background jitter is disabled so warmup jobs (rates fetch, recurring
+catch-up) start immediately; the first request must not wait for them.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Only needed on the routes or jobs that use them; never at import or startup.
+LAZY_MODULES = ("boto3", "botocore", "resend", "authlib", "svix", "scribe")
+
+_CHILD = """
+import json, os, sys, time
+
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    status = client.get("/health").status_code
+    first = time.perf_counter()
+    print(json.dumps({
+        "import_seconds": imported - started,
+        "lifespan_seconds": ready - imported,
+        "first_request_seconds": first - imported,
+        "health_status": status,
+        "lazy_loaded": [m for m in %r if m in sys.modules],
+    }), flush=True)
+    # Skip shutdown: warmup threads may still be waiting on the network.
+    os._exit(0)
+"""
+
+_SERVER_DIR = Path(__file__).resolve().parent.parent
+
+
+def _slowest_imports(stderr: str, top: int, depth: int = 1) -> list[dict]:
+    """Imports at `depth` in the `-X importtime` tree, slowest cumulative first.
+
+    Depth 0 is just `app.main` and the harness; depth 1 is what those pull in
+    directly (fastapi, sqlalchemy, the routers...), which is where regressions show.
+    """
+    indent = " " + "  " * depth
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not name.startswith(indent) or name[len(indent)] == " ":
+            continue
+        rows.append({"module": name.strip(), "cumulative_ms": int(cumulative_us) / 1000})
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def run(top: int = 10, database_url: str | None = None) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite:///{tmp}/startup.db",
+            "JWT_SECRET": os.environ.get("JWT_SECRET", "benchmark-secret-key-at-least-32-chars"),
+            "ENCRYPTION_KEY": os.environ.get(
+                "ENCRYPTION_KEY", "yoiUSNghFamT5wyzMwk8YL2XS1T4uNg5Ih3k05CH51Q="
+            ),
+            "ENV": "test",
+            "SENTRY_DSN": "",
+            "BACKGROUND_JITTER_SECONDS": "0",
+        }
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _CHILD % (LAZY_MODULES,)],
+            cwd=_SERVER_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup benchmark child failed:\n{proc.stderr[-2000:]}")
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    app_main = next(
+        (
+            int(line.split("|")[1]) / 1000
+            for line in proc.stderr.splitlines()
+            if line.startswith("import time:") and line.rstrip().endswith(" app.main")
+        ),
+        None,
+    )
+    return {
+        **result,
+        "process_wall_seconds": wall,
+        "app_main_import_ms": app_main,
+        "slowest_imports": _slowest_imports(proc.stderr, top),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    result = run(top=args.top, database_url=args.database_url)
+    print(f"import app.main      {result['import_seconds'] * 1000:8.1f} ms")
+    print(f"lifespan startup     {result['lifespan_seconds'] * 1000:8.1f} ms")
+    print(f"first request        {result['first_request_seconds'] * 1000:8.1f} ms")
+    print(f"process wall clock   {result['process_wall_seconds'] * 1000:8.1f} ms")
+    print(f"lazy modules loaded  {', '.join(result['lazy_loaded']) or 'none'}")
+    print("\nslowest imports under app.main:")
+    for row in result["slowest_imports"]:
+        print(f"  {row['cumulative_ms']:8.1f} ms  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
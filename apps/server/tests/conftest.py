@@ -12,6 +12,7 @@ os.environ["AWS_REGION"] = ""
 os.environ["S3_BUCKET_NAME"] = ""
 
 import uuid
+from contextlib import contextmanager
 
 import jwt as pyjwt
 import pytest
@@ -45,6 +46,7 @@ SaUuid.bind_processor = _patched_bind_processor
 from app.database import get_db  # noqa: E402
 from app.db.models import Base, Category  # noqa: E402
 from app.main import app  # noqa: E402
+from app.query_stats import count_queries  # noqa: E402
 
 # In-memory SQLite for tests. StaticPool + check_same_thread=False
 # ensures the same connection is shared across threads (required for
@@ -214,6 +216,22 @@ def make_category(
     return cat
 
 
+@contextmanager
+def query_budget(max_statements: int, allow_repeats: bool = False):
+    """Fail if the block runs more than `max_statements` SQL statements or, unless
+    `allow_repeats`, repeats one statement shape often enough to look like an N+1.
+
+        with query_budget(4):
+            client.get("/expenses/", headers=headers)
+    """
+    with count_queries(test_engine) as stats:
+        yield stats
+    assert stats.statements <= max_statements, (
+        f"{stats.statements} statements, budget {max_statements}:\n{stats.report()}"
+    )
+    assert allow_repeats or not stats.repeated(), f"likely N+1:\n{stats.report()}"
+
+
 @pytest.fixture
 def sample_category(db_session, auth_headers):
     """A custom expense category belonging to the auth'd user."""
@@ -0,0 +1,99 @@
+"""Background job coordinator: leader gating, failure handling, scheduling."""
+
+import asyncio
+import logging
+
+from app.services.background_tasks import BackgroundCoordinator, PeriodicTask, lock_key
+from tests.conftest import test_engine
+
+
+class _NeverLeader:
+    """Locks stand-in for a worker that never wins the election."""
+
+    def try_acquire(self, key: int) -> bool:
+        return False
+
+    def release_all(self) -> None:
+        pass
+
+
+def test_lock_key_is_stable_and_distinct():
+    assert lock_key("rates_refresh") == lock_key("rates_refresh")
+    assert lock_key("rates_refresh") != lock_key("recurring_materialize")
+    assert -(2**63) <= lock_key("rates_refresh") < 2**63
+
+
+async def test_sqlite_worker_is_leader_and_records_timings():
+    calls = []
+    coordinator = BackgroundCoordinator(test_engine)
+    coordinator.add(PeriodicTask(name="job", fn=lambda: calls.append(1), interval=60))
+
+    assert await coordinator.run_once("job") is True
+    stats = coordinator.stats()["job"]
+    assert calls == [1]
+    assert stats["runs"] == 1
+    assert stats["is_leader"] is True
+    assert stats["failures"] == 0
+    assert stats["last_run_at"] is not None
+
+
+async def test_follower_skips_leader_only_jobs():
+    calls = []
+    coordinator = BackgroundCoordinator(test_engine, locks=_NeverLeader())
+    coordinator.add(PeriodicTask(name="leader", fn=lambda: calls.append("leader"), interval=60))
+    coordinator.add(
+        PeriodicTask(name="local", fn=lambda: calls.append("local"), interval=60, leader_only=False)
+    )
+
+    assert await coordinator.run_once("leader") is False
+    assert await coordinator.run_once("local") is True
+    assert calls == ["local"]
+    assert coordinator.stats()["leader"]["skipped"] == 1
+
+
+async def test_failures_are_logged_and_counted(caplog):
+    def boom():
+        raise RuntimeError("upstream down")
+
+    coordinator = BackgroundCoordinator(test_engine)
+    coordinator.add(PeriodicTask(name="flaky", fn=boom, interval=60))
+
+    with caplog.at_level(logging.ERROR, logger="app.services.background_tasks"):
+        assert await coordinator.run_once("flaky") is True
+
+    stats = coordinator.stats()["flaky"]
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "RuntimeError: upstream down"
+    assert "Background task flaky failed" in caplog.text
+
+
+async def test_loop_uses_returned_delay_and_wake_event():
+    fast_calls = []
+    woken_calls = []
+    wake = asyncio.Event()
+    coordinator = BackgroundCoordinator(test_engine)
+    # Returns a short delay, overriding its hour-long interval.
+    coordinator.add(
+        PeriodicTask(name="fast", fn=lambda: fast_calls.append(1) or 0.01, interval=3600)
+    )
+    coordinator.add(
+        PeriodicTask(
+            name="woken",
+            fn=lambda: woken_calls.append(1),
+            interval=3600,
+            initial_delay=3600,
+            wake=wake,
+        )
+    )
+
+    coordinator.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert woken_calls == []
+        wake.set()
+        await asyncio.sleep(0.1)
+    finally:
+        await coordinator.stop()
+
+    assert len(fast_calls) >= 2
+    assert woken_calls == [1]
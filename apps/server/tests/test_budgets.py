@@ -0,0 +1,338 @@
+"""Budget CRUD + spend evaluation tests."""
+
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app.db.models import BudgetProgress, ExchangeRate
+from app.services.budget_service import rebuild_progress
+from app.services.exchange_rates import invalidate_cache
+from tests.conftest import make_category, test_engine
+
+# ── Helpers ──
+
+
+def _create_budget(client, headers, category_ids, **overrides):
+    body = {
+        "name": "Groceries",
+        "period_type": "monthly",
+        "amount": 500,
+        "currency": "USD",
+        "category_ids": category_ids,
+        **overrides,
+    }
+    resp = client.post("/budgets", json=body, headers=headers)
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def _create_expense(client, headers, category_id, amount, currency="USD", created_at=None):
+    body = {"amount": amount, "category_id": category_id, "currency": currency}
+    if created_at is not None:
+        body["created_at"] = created_at.isoformat()
+    resp = client.post("/expenses/", json=body, headers=headers)
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def _seed_rates(db_session, **rates):
+    now = datetime.now(UTC)
+    for code, rate in rates.items():
+        db_session.add(ExchangeRate(currency_code=code, rate_to_usd=rate, updated_at=now))
+    db_session.commit()
+    invalidate_cache()
+
+
+def _count_statements(fn):
+    statements = []
+
+    def count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", count)
+    try:
+        result = fn()
+    finally:
+        event.remove(test_engine, "before_cursor_execute", count)
+    return len(statements), result
+
+
+def _progress(db_session, budget_id):
+    db_session.expire_all()
+    rows = db_session.query(BudgetProgress).filter(BudgetProgress.budget_id == budget_id).all()
+    return {(str(r.period_start), r.currency): round(r.spent, 6) for r in rows if r.spent}
+
+
+def _assert_progress_matches_rebuild(db_session, budget_id):
+    incremental = _progress(db_session, budget_id)
+    rebuild_progress(db_session, budget_ids=[budget_id])
+    db_session.commit()
+    assert _progress(db_session, budget_id) == incremental
+    return incremental
+
+
+# ── Spend evaluation ──
+
+
+def test_budget_spend_converts_with_one_rates_snapshot(
+    client, auth_headers, db_session, sample_category
+):
+    headers, user_id = auth_headers
+    _seed_rates(db_session, USD=1.0, NZD=2.0)
+    income = make_category(db_session, user_id, name="Refunds", cat_type="income")
+    cat_id = str(sample_category.id)
+    _create_expense(client, headers, cat_id, 20, "NZD")
+    _create_expense(client, headers, cat_id, 5, "USD")
+    _create_expense(client, headers, str(income.id), 100, "USD")
+
+    budget = _create_budget(client, headers, [cat_id, str(income.id)])
+    # 20 NZD -> 10 USD, plus 5 USD; the income category does not count toward an expense budget.
+    assert budget["spent"] == 15.0
+    assert budget["remaining"] == 485.0
+
+    past = date.today() - timedelta(days=60)
+    custom = _create_budget(
+        client,
+        headers,
+        [cat_id],
+        name="Old trip",
+        period_type="custom",
+        currency="NZD",
+        start_date=str(past),
+        end_date=str(past + timedelta(days=7)),
+    )
+    assert custom["spent"] == 0.0
+
+    listed = {b["name"]: b for b in client.get("/budgets", headers=headers).json()}
+    assert listed["Groceries"]["spent"] == 15.0
+    assert listed["Old trip"]["spent"] == 0.0
+    invalidate_cache()
+
+
+def test_list_budgets_query_count_is_constant(client, auth_headers, db_session):
+    headers, user_id = auth_headers
+    categories = [str(make_category(db_session, user_id, name=f"Cat {i}").id) for i in range(8)]
+    for cat_id in categories:
+        _create_expense(client, headers, cat_id, 10)
+
+    _create_budget(client, headers, categories[:1], name="Budget 0")
+    baseline, budgets = _count_statements(lambda: client.get("/budgets", headers=headers).json())
+    assert len(budgets) == 1
+
+    for i, cat_id in enumerate(categories[1:], start=1):
+        _create_budget(
+            client,
+            headers,
+            [cat_id],
+            name=f"Budget {i}",
+            period_type="weekly" if i % 2 else "monthly",
+        )
+    queries, budgets = _count_statements(lambda: client.get("/budgets", headers=headers).json())
+    assert len(budgets) == 8
+    assert all(b["spent"] == 10.0 for b in budgets)
+    assert queries == baseline
+
+
+def test_budget_history_still_reports_each_period(client, auth_headers, sample_category):
+    headers, _ = auth_headers
+    _create_expense(client, headers, str(sample_category.id), 42)
+    budget = _create_budget(client, headers, [str(sample_category.id)])
+
+    resp = client.get(f"/budgets/{budget['id']}/history?periods=6", headers=headers)
+    assert resp.status_code == 200
+    periods = resp.json()["periods"]
+    assert len(periods) == 6
+    assert [p["spent"] for p in periods] == [0, 0, 0, 0, 0, 42]
+
+
+def test_budget_history_query_count_does_not_grow_with_periods(
+    client, auth_headers, sample_category
+):
+    headers, _ = auth_headers
+    _create_expense(client, headers, str(sample_category.id), 7)
+    budget = _create_budget(client, headers, [str(sample_category.id)], period_type="weekly")
+    url = f"/budgets/{budget['id']}/history"
+
+    few, _ = _count_statements(lambda: client.get(f"{url}?periods=2", headers=headers))
+    many, resp = _count_statements(lambda: client.get(f"{url}?periods=52", headers=headers))
+    assert resp.status_code == 200
+    periods = resp.json()["periods"]
+    assert len(periods) == 52
+    assert periods[-1]["spent"] == 7
+    assert sum(p["spent"] for p in periods) == 7
+    assert many == few
+
+
+def test_budget_history_buckets_in_user_timezone(client, auth_headers, sample_category):
+    headers, _ = auth_headers
+    resp = client.put(
+        "/account/preferences", json={"timezone": "Pacific/Auckland"}, headers=headers
+    )
+    assert resp.status_code == 200, resp.text
+    budget = _create_budget(client, headers, [str(sample_category.id)])
+
+    resp = client.get(f"/budgets/{budget['id']}/history?periods=24", headers=headers)
+    periods = resp.json()["periods"]
+    # 13:30 UTC on the last day of a month is already the 1st in Auckland (UTC+12/13).
+    last_day = date.fromisoformat(periods[-3]["period_end"])
+    _create_expense(
+        client,
+        headers,
+        str(sample_category.id),
+        30,
+        created_at=datetime(last_day.year, last_day.month, last_day.day, 13, 30, tzinfo=UTC),
+    )
+
+    periods = client.get(f"/budgets/{budget['id']}/history?periods=24", headers=headers).json()[
+        "periods"
+    ]
+    assert len(periods) == 24
+    assert periods[-3]["spent"] == 0
+    assert periods[-2]["spent"] == 30
+
+
+def test_dashboard_bootstrap_includes_budget_history(client, auth_headers, sample_category):
+    headers, _ = auth_headers
+    _create_expense(client, headers, str(sample_category.id), 12)
+    _create_budget(client, headers, [str(sample_category.id)], name="Monthly")
+    _create_budget(client, headers, [str(sample_category.id)], name="Weekly", period_type="weekly")
+    _create_budget(
+        client,
+        headers,
+        [str(sample_category.id)],
+        name="Trip",
+        period_type="custom",
+        start_date=str(date.today()),
+        end_date=str(date.today()),
+    )
+    params = {
+        "start_date": str(date.today()),
+        "end_date": str(date.today()),
+        "budget_periods": 3,
+        "widget_type": "budget_history",
+    }
+
+    resp = client.get("/dashboard/bootstrap", params=params, headers=headers)
+    assert resp.status_code == 200, resp.text
+    history = {h["budget_name"]: h for h in resp.json()["budget_history"]}
+    assert set(history) == {"Monthly", "Weekly"}
+    assert [p["spent"] for p in history["Monthly"]["periods"]] == [0, 0, 12]
+    assert [p["spent"] for p in history["Weekly"]["periods"]] == [0, 0, 12]
+
+    params["widget_type"] = "transactions"
+    resp = client.get("/dashboard/bootstrap", params=params, headers=headers)
+    assert resp.json()["budget_history"] == []
+
+
+# ── Incremental progress ──
+
+
+def test_progress_follows_transaction_writes(client, auth_headers, db_session, sample_category):
+    headers, user_id = auth_headers
+    other = make_category(db_session, user_id, name="Other")
+    cat_id = str(sample_category.id)
+    budget = _create_budget(client, headers, [cat_id])
+    month = budget["period_start"]
+
+    expense = _create_expense(client, headers, cat_id, 40)
+    _create_expense(client, headers, cat_id, 10, "NZD")
+    _create_expense(client, headers, str(other.id), 99)
+    assert _assert_progress_matches_rebuild(db_session, budget["id"]) == {
+        (month, "USD"): 40,
+        (month, "NZD"): 10,
+    }
+
+    resp = client.put(f"/expenses/{expense['id']}", json={"amount": 25}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert _progress(db_session, budget["id"])[(month, "USD")] == 25
+
+    # Recategorized out of the budget, then back in under an earlier date.
+    client.put(f"/expenses/{expense['id']}", json={"category_id": str(other.id)}, headers=headers)
+    assert (month, "USD") not in _progress(db_session, budget["id"])
+    earlier = datetime.now(UTC) - timedelta(days=70)
+    client.put(
+        f"/expenses/{expense['id']}",
+        json={"category_id": cat_id, "created_at": earlier.isoformat()},
+        headers=headers,
+    )
+    progress = _assert_progress_matches_rebuild(db_session, budget["id"])
+    assert progress[(str(earlier.date().replace(day=1)), "USD")] == 25
+
+    assert client.delete(f"/expenses/{expense['id']}", headers=headers).status_code == 200
+    assert _assert_progress_matches_rebuild(db_session, budget["id"]) == {(month, "NZD"): 10}
+
+
+def test_progress_follows_rules_and_membership(client, auth_headers, db_session, sample_category):
+    headers, user_id = auth_headers
+    other = make_category(db_session, user_id, name="Utilities")
+    _create_expense(client, headers, str(other.id), 60)
+    budget = _create_budget(client, headers, [str(sample_category.id)])
+    assert budget["spent"] == 0
+
+    account_id = client.get("/accounts/", headers=headers).json()[0]["id"]
+    rule = {
+        "type": "expense",
+        "name": "Gym",
+        "amount": 30,
+        "currency": "USD",
+        "account_id": account_id,
+        "category_id": str(sample_category.id),
+        "description": "",
+        "interval_unit": "month",
+        "interval_count": 1,
+        "start_date": str(date.today()),
+    }
+    assert client.post("/recurring/", json=rule, headers=headers).status_code == 201
+    _assert_progress_matches_rebuild(db_session, budget["id"])
+
+    resp = client.put(
+        f"/budgets/{budget['id']}",
+        json={"category_ids": [str(sample_category.id), str(other.id)]},
+        headers=headers,
+    )
+    assert resp.json()["spent"] == 90
+    listed = client.get("/budgets", headers=headers).json()
+    assert listed[0]["spent"] == 90
+    _assert_progress_matches_rebuild(db_session, budget["id"])
+
+
+def test_rebuild_repairs_drifted_progress(client, auth_headers, db_session, sample_category):
+    headers, _ = auth_headers
+    _create_budget(client, headers, [str(sample_category.id)])
+    _create_expense(client, headers, str(sample_category.id), 12)
+
+    db_session.query(BudgetProgress).update({BudgetProgress.spent: 1000})
+    db_session.commit()
+    assert client.get("/budgets", headers=headers).json()[0]["spent"] == 1000
+
+    assert rebuild_progress(db_session) == 1
+    db_session.commit()
+    assert client.get("/budgets", headers=headers).json()[0]["spent"] == 12
+
+
+def test_category_type_change_rebuilds_progress(client, auth_headers, db_session):
+    headers, user_id = auth_headers
+    category = make_category(db_session, user_id, name="Side gigs")
+    _create_expense(client, headers, str(category.id), 40)
+    budget = _create_budget(client, headers, [str(category.id)])
+    assert budget["spent"] == 40
+
+    resp = client.put(f"/categories/{category.id}", json={"type": "income"}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert client.get("/budgets", headers=headers).json()[0]["spent"] == 0
+
+    # Reviving a soft-deleted category with its old type counts its spending again.
+    assert client.delete(f"/categories/{category.id}", headers=headers).status_code == 200
+    resp = client.post(
+        "/categories/",
+        json={
+            "name": "Side gigs",
+            "color_light": "#3B82F6",
+            "color_dark": "#60A5FA",
+            "type": "expense",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201, resp.text
+    assert client.get("/budgets", headers=headers).json()[0]["spent"] == 40
+    _assert_progress_matches_rebuild(db_session, budget["id"])
@@ -0,0 +1,98 @@
+"""Bulk loader: reference resolution, hash dedupe, inserted_at, budget progress."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from app.db.models import Account, BudgetProgress, Transaction
+from app.services.bulk_loader import _CopyStream, load_transactions
+from tests.conftest import make_category
+
+
+def _row(user_id, **overrides):
+    return {
+        "user_id": user_id,
+        "account_ref": "Cash",
+        "category_ref": "food",
+        "category_type": "expense",
+        "amount": 10.0,
+        "currency": "USD",
+        "timestamp": datetime(2026, 2, 3, 12, tzinfo=UTC),
+        **overrides,
+    }
+
+
+def test_resolves_references_and_skips_known_hashes(
+    client, auth_headers, db_session, system_categories
+):
+    _, user_id = auth_headers
+    own_food = make_category(db_session, user_id, name="Food", slug="my-food")
+    account = Account(user_id=user_id, name="Cash", type="cash")
+    db_session.add(account)
+    db_session.commit()
+    restored_at = datetime.now(UTC) - timedelta(days=400)
+
+    result = load_transactions(
+        db_session,
+        [
+            _row(user_id, hash="h1", category_ref="Food", inserted_at=restored_at),
+            _row(user_id, hash="h2", category_ref="salary", category_type="income"),
+            _row(user_id, hash="h3", account_ref="Nowhere"),
+            _row(user_id, hash="h4", category_ref="no-such-category"),
+            _row(user_id, hash="h5", category_ref=None, is_transfer=True),
+            _row(user_id, hash="h1"),
+        ],
+    )
+    db_session.commit()
+
+    assert (len(result.inserted), result.duplicates, result.unresolved) == (3, 1, 2)
+    rows = {t.hash: t for t in db_session.query(Transaction).all()}
+    assert set(rows) == {"h1", "h2", "h5"}
+    # The user's own "Food" wins over the system category with the same name.
+    assert rows["h1"].category_id == own_food.id
+    assert rows["h2"].category_id == system_categories["salary"].id
+    assert rows["h5"].category_id is None
+    assert all(t.account_id == account.id for t in rows.values())
+    assert rows["h1"].inserted_at.replace(tzinfo=UTC) == restored_at
+    assert rows["h2"].inserted_at is not None
+
+    again = load_transactions(db_session, [_row(user_id, hash="h1"), _row(user_id, hash="h6")])
+    assert (len(again.inserted), again.duplicates) == (1, 1)
+
+
+def test_load_updates_budget_progress(client, auth_headers, db_session, system_categories):
+    headers, user_id = auth_headers
+    food = system_categories["food"]
+    resp = client.post(
+        "/budgets",
+        json={
+            "name": "Food",
+            "period_type": "monthly",
+            "amount": 100,
+            "currency": "USD",
+            "category_ids": [str(food.id)],
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201, resp.text
+    account_id = client.get("/accounts/", headers=headers).json()[0]["id"]
+    now = datetime.now(UTC)
+
+    load_transactions(
+        db_session,
+        [
+            _row(user_id, account_ref=None, account_id=uuid.UUID(account_id), timestamp=now)
+            for _ in range(3)
+        ],
+    )
+    db_session.commit()
+
+    assert sum(p.spent for p in db_session.query(BudgetProgress).all()) == 30
+    assert client.get("/budgets", headers=headers).json()[0]["spent"] == 30
+
+
+def test_copy_stream_writes_nulls_bare_and_values_quoted():
+    stream = _CopyStream([(1, None, "", "a,b", True), (2, "x", None, 'q"q', False)])
+    chunks = []
+    while chunk := stream.read(7):
+        chunks.append(chunk)
+    assert "".join(chunks) == '"1",,"","a,b","True"\n"2","x",,"q""q","False"\n'
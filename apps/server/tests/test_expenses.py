@@ -1,5 +1,9 @@
 """Expense CRUD + stats tests."""
 
+from sqlalchemy import event
+
+from app.config import settings
+from tests.conftest import make_category, test_engine
 
 # ── Helpers ──
 
@@ -31,6 +35,20 @@ def _create_expense(
     return resp.json()
 
 
+def _count_statements(fn):
+    statements = []
+
+    def count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", count)
+    try:
+        result = fn()
+    finally:
+        event.remove(test_engine, "before_cursor_execute", count)
+    return len(statements), result
+
+
 # ── Create ──
 
 
@@ -57,6 +75,65 @@ def test_create_expense_opening_balance(client, auth_headers, system_categories)
     assert data["is_opening_balance"] is True
 
 
+def test_bulk_create_reports_per_item_results(
+    client, auth_headers, second_auth, db_session, system_categories
+):
+    headers, _ = auth_headers
+    _, other_user_id = second_auth
+    food = str(system_categories["food"].id)
+    foreign = make_category(db_session, other_user_id, name="Not yours")
+    accounts = client.get("/accounts/", headers=headers).json()
+    items = [
+        {"amount": 12.5, "category_id": food, "description": "Lunch", "merchant": "Cafe"},
+        {"amount": 3, "category_id": str(foreign.id)},
+        {"amount": 40, "category_id": food, "account_id": accounts[1]["id"], "currency": "USD"},
+        {"amount": 1, "category_id": food, "account_id": "00000000-0000-0000-0000-000000000000"},
+        {"amount": 2, "category_id": "not-a-uuid"},
+    ]
+
+    resp = client.post("/expenses/bulk", json={"items": items}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert (body["created"], body["failed"]) == (2, 3)
+    results = body["results"]
+    assert [r["status"] for r in results] == ["created", "error", "created", "error", "error"]
+    assert results[1]["error"] == "Category not found"
+    assert results[3]["error"] == "Account not found"
+    assert results[0]["expense"]["merchant"] == "Cafe"
+    assert results[0]["expense"]["category_name"] == "Food"
+    assert results[2]["expense"]["account_id"] == accounts[1]["id"]
+
+    stored = client.get(f"/expenses/{results[2]['expense']['id']}", headers=headers).json()
+    assert stored["amount"] == 40
+    assert stored["currency"] == "USD"
+    listed = client.get("/expenses/", headers=headers).json()
+    assert listed["total_count"] == 2
+
+
+def test_bulk_create_query_count_is_constant(client, auth_headers, system_categories):
+    headers, _ = auth_headers
+    food = str(system_categories["food"].id)
+
+    def post(n):
+        items = [{"amount": i + 1, "category_id": food} for i in range(n)]
+        return client.post("/expenses/bulk", json={"items": items}, headers=headers)
+
+    few, _ = _count_statements(lambda: post(2))
+    many, resp = _count_statements(lambda: post(50))
+    assert resp.json()["created"] == 50
+    assert many == few
+
+
+def test_bulk_create_rejects_oversized_batches(client, auth_headers, system_categories):
+    headers, _ = auth_headers
+    items = [{"amount": 1, "category_id": str(system_categories["food"].id)}] * (
+        settings.EXPENSE_BULK_MAX_ITEMS + 1
+    )
+    resp = client.post("/expenses/bulk", json={"items": items}, headers=headers)
+    assert resp.status_code == 422
+    assert client.post("/expenses/bulk", json={"items": []}, headers=headers).status_code == 422
+
+
 def test_create_expense_description_max_length(client, auth_headers, system_categories):
     headers, _ = auth_headers
     cat_id = str(system_categories["food"].id)
@@ -56,6 +56,15 @@ class TestExportHistory:
         names = {e["name"] for e in data["exports"]}
         assert names == {"Export A", "Export B"}
 
+    def test_history_reports_file_extension(self, client, auth_headers, db_session):
+        headers, user_id = auth_headers
+        _make_export(db_session, user_id, fmt="csv_zst")
+        _make_export(db_session, user_id, fmt="parquet", scope="full_dump")
+
+        resp = client.get("/exports/history", headers=headers)
+        extensions = {e["format"]: e["extension"] for e in resp.json()["exports"]}
+        assert extensions == {"csv_zst": "csv.zst", "parquet": "zip"}
+
     def test_history_requires_auth(self, client):
         resp = client.get("/exports/history")
         assert resp.status_code in (401, 403)
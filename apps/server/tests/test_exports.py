@@ -1,7 +1,11 @@
+import asyncio
+import threading
 import time
 from datetime import UTC, datetime, timedelta
 from unittest.mock import patch
 
+import pytest
+
 from tests.conftest import register_user
 
 
@@ -303,6 +307,83 @@ class TestExports:
         )
         assert resp.status_code == 202
 
+    def test_compressed_csv_full_dump_rejected(self, mock_cofr, client, auth_headers):
+        headers, _ = auth_headers
+        resp = client.post(
+            "/exports",
+            json={"format": "csv_gz", "scope": "full_dump"},
+            headers=headers,
+        )
+        assert resp.status_code == 400
+
+    def test_export_csv_gz_download(self, mock_cofr, client, auth_headers, system_categories):
+        headers, _ = auth_headers
+        mock_cofr.export_csv.return_value = b"Date,Amount\n"
+        mock_cofr.compress_csv.return_value = b"\x1f\x8bgz"
+
+        from tests.conftest import TestSession
+
+        with _patch_session_local(TestSession):
+            resp = client.post(
+                "/exports",
+                json={"format": "csv_gz", "scope": "transactions", "name": "Ledger"},
+                headers=headers,
+            )
+            job_id = resp.json()["job_id"]
+            time.sleep(1.0)
+
+            download_resp = client.get(f"/exports/{job_id}/download", headers=headers)
+            assert download_resp.status_code == 200
+            assert download_resp.headers["content-type"] == "application/gzip"
+            assert 'filename="Ledger.csv.gz"' in download_resp.headers["content-disposition"]
+            assert download_resp.content == b"\x1f\x8bgz"
+            mock_cofr.compress_csv.assert_called_once_with(b"Date,Amount\n", "gzip")
+
+    def test_export_parquet_scope(self, mock_cofr, client, auth_headers, system_categories):
+        headers, _ = auth_headers
+        mock_cofr.export_columnar.return_value = b"PAR1fakePAR1"
+
+        from tests.conftest import TestSession
+
+        with _patch_session_local(TestSession):
+            resp = client.post(
+                "/exports",
+                json={"format": "parquet", "scope": "categories", "name": "Spend"},
+                headers=headers,
+            )
+            assert resp.status_code == 202
+            job_id = resp.json()["job_id"]
+            time.sleep(1.0)
+
+            download_resp = client.get(f"/exports/{job_id}/download", headers=headers)
+            assert download_resp.status_code == 200
+            assert download_resp.headers["content-type"] == "application/vnd.apache.parquet"
+            assert 'filename="Spend.parquet"' in download_resp.headers["content-disposition"]
+            args = mock_cofr.export_columnar.call_args.args
+            assert args[1:] == ("categories", "parquet")
+
+    def test_export_arrow_full_dump_uses_zip(
+        self, mock_cofr, client, auth_headers, system_categories
+    ):
+        headers, _ = auth_headers
+        mock_cofr.export_columnar_full_dump.return_value = b"zip-bytes"
+
+        from tests.conftest import TestSession
+
+        with _patch_session_local(TestSession):
+            resp = client.post(
+                "/exports",
+                json={"format": "arrow", "scope": "full_dump", "name": "Backup"},
+                headers=headers,
+            )
+            job_id = resp.json()["job_id"]
+            time.sleep(1.0)
+
+            download_resp = client.get(f"/exports/{job_id}/download", headers=headers)
+            assert download_resp.status_code == 200
+            assert 'filename="Backup.zip"' in download_resp.headers["content-disposition"]
+            assert mock_cofr.export_columnar_full_dump.call_args.args[3] == "arrow"
+
     def test_download_with_query_token(self, mock_cofr, client, auth_headers, system_categories):
         headers, user_id = auth_headers
         mock_cofr.export_csv.return_value = b"token-test-data"
@@ -359,6 +440,227 @@ class TestExports:
                 "exports/test/s3.csv", "Ops-APAC-Q1.csv"
             )
 
+    def test_identical_request_reuses_running_or_finished_job(
+        self, mock_cofr, client, auth_headers, system_categories
+    ):
+        headers, _ = auth_headers
+        mock_cofr.export_csv.return_value = b"dedup"
+
+        from tests.conftest import TestSession
+
+        body = {"format": "csv", "scope": "transactions"}
+        with _patch_session_local(TestSession):
+            first = client.post("/exports", json=body, headers=headers).json()
+            time.sleep(1.0)
+            second = client.post("/exports", json={**body, "name": "Renamed"}, headers=headers)
+
+        assert second.status_code == 202
+        assert second.json()["job_id"] == first["job_id"]
+        assert mock_cofr.export_csv.call_count == 1
+
+    def test_data_change_invalidates_fingerprint(
+        self, mock_cofr, client, auth_headers, system_categories, db_session
+    ):
+        from app.db.schemas import ExportCreateRequest
+        from app.services.export_service import compute_export_fingerprint
+
+        headers, user_id = auth_headers
+        request = ExportCreateRequest(format="csv", scope="transactions")
+        before = compute_export_fingerprint(db_session, user_id, request)
+
+        resp = client.post(
+            "/expenses/",
+            json={"amount": 5, "category_id": str(system_categories["food"].id)},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        after_insert = compute_export_fingerprint(db_session, user_id, request)
+        assert after_insert != before
+
+        time.sleep(1.1)  # SQLite CURRENT_TIMESTAMP has one-second resolution
+        client.put(f"/expenses/{resp.json()['id']}", json={"amount": 6}, headers=headers)
+        assert compute_export_fingerprint(db_session, user_id, request) != after_insert
+
+    def test_balance_fingerprint_tracks_currency_and_rows_outside_window(
+        self, mock_cofr, client, auth_headers, system_categories, db_session
+    ):
+        from app.db.models import User
+        from app.db.schemas import ExportCreateRequest
+        from app.services.export_service import compute_export_fingerprint
+
+        headers, user_id = auth_headers
+        request = ExportCreateRequest(
+            format="csv", scope="accounts", end_date=datetime(2000, 1, 1, tzinfo=UTC)
+        )
+        before = compute_export_fingerprint(db_session, user_id, request)
+
+        # Balances cover every transaction, not just the requested window.
+        resp = client.post(
+            "/expenses/",
+            json={"amount": 5, "category_id": str(system_categories["food"].id)},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        after_insert = compute_export_fingerprint(db_session, user_id, request)
+        assert after_insert != before
+
+        user = db_session.query(User).filter(User.id == user_id).one()
+        user.preferred_currency = "EUR" if user.preferred_currency != "EUR" else "USD"
+        db_session.commit()
+        assert compute_export_fingerprint(db_session, user_id, request) != after_insert
+
+    def test_stored_export_is_reused(
+        self, mock_cofr, client, auth_headers, system_categories, db_session
+    ):
+        import uuid
+
+        from app.db.models import Export
+        from app.db.schemas import ExportCreateRequest
+        from app.services.export_service import compute_export_fingerprint
+
+        headers, user_id = auth_headers
+        request = ExportCreateRequest(format="xlsx", scope="categories")
+        record = Export(
+            id=uuid.uuid4(),
+            user_id=uuid.UUID(user_id),
+            name="Stored",
+            format="xlsx",
+            scope="categories",
+            file_size=10,
+            s3_key=f"exports/{user_id}/stored.xlsx",
+            fingerprint=compute_export_fingerprint(db_session, user_id, request),
+            expires_at=datetime.now(UTC) + timedelta(days=1),
+        )
+        db_session.add(record)
+        db_session.commit()
+
+        with patch("app.routers.exports.s3_mod") as mock_s3:
+            mock_s3.is_s3_available.return_value = True
+            mock_s3.presign_download.return_value = "https://s3.example.com/presigned"
+            resp = client.post(
+                "/exports", json={"format": "xlsx", "scope": "categories"}, headers=headers
+            )
+            data = resp.json()
+            assert resp.status_code == 202
+            assert data["status"] == "done"
+            assert data["reused"] is True
+            assert data["export_id"] == str(record.id)
+
+            download = client.get(
+                f"/exports/{data['job_id']}/download", headers=headers, follow_redirects=False
+            )
+        assert download.status_code == 307
+        mock_cofr.export_xlsx.assert_not_called()
+
+    def test_delta_export_since_previous_export(
+        self, mock_cofr, client, auth_headers, system_categories
+    ):
+        headers, _ = auth_headers
+        mock_cofr.export_csv.return_value = b"full"
+        mock_cofr.export_delta.return_value = b"delta-zip"
+        food = str(system_categories["food"].id)
+
+        from tests.conftest import TestSession
+
+        with _patch_session_local(TestSession):
+            kept = client.post(
+                "/expenses/", json={"amount": 5, "category_id": food}, headers=headers
+            )
+            gone = client.post(
+                "/expenses/", json={"amount": 7, "category_id": food}, headers=headers
+            )
+            base = client.post(
+                "/exports", json={"format": "csv", "scope": "transactions"}, headers=headers
+            ).json()["job_id"]
+            time.sleep(1.1)  # SQLite CURRENT_TIMESTAMP has one-second resolution
+
+            client.put(f"/expenses/{kept.json()['id']}", json={"amount": 6}, headers=headers)
+            client.delete(f"/expenses/{gone.json()['id']}", headers=headers)
+            added = client.post(
+                "/expenses/", json={"amount": 9, "category_id": food}, headers=headers
+            )
+
+            resp = client.post(
+                "/exports",
+                json={"format": "csv", "scope": "transactions", "since_export_id": base},
+                headers=headers,
+            )
+            assert resp.status_code == 202
+            job_id = resp.json()["job_id"]
+            time.sleep(1.0)
+
+            download_resp = client.get(f"/exports/{job_id}/download", headers=headers)
+            assert download_resp.status_code == 200
+            assert download_resp.headers["content-disposition"].endswith('.zip"')
+
+        changes, deleted, accounts, categories, fmt = mock_cofr.export_delta.call_args.args
+        assert {c["id"] for c in changes} == {kept.json()["id"], added.json()["id"]}
+        assert all(c["updated_at"] for c in changes)
+        assert [d["id"] for d in deleted] == [gone.json()["id"]]
+        assert (accounts, categories, fmt) == (None, None, "csv")
+
+    def test_delta_bound_overlaps_previous_snapshot(self, mock_cofr, auth_headers, db_session):
+        import uuid
+
+        from app.config import settings
+        from app.db.models import Export
+        from app.db.schemas import ExportCreateRequest
+        from app.services.export_service import resolve_delta_since
+
+        _, user_id = auth_headers
+        snapshot = datetime(2026, 3, 1, 12, 0, 0, tzinfo=UTC)
+        record = Export(
+            id=uuid.uuid4(),
+            user_id=uuid.UUID(user_id),
+            name="Base",
+            format="csv",
+            scope="transactions",
+            file_size=10,
+            s3_key=f"exports/{user_id}/base.csv",
+            snapshot_at=snapshot,
+            expires_at=datetime.now(UTC) + timedelta(days=1),
+        )
+        db_session.add(record)
+        db_session.commit()
+
+        request = ExportCreateRequest(
+            format="csv", scope="transactions", since_export_id=str(record.id)
+        )
+        since = resolve_delta_since(db_session, user_id, request)
+
+        # A write stamped before the snapshot but committed after it is re-sent.
+        assert since == snapshot - timedelta(seconds=settings.EXPORT_DELTA_OVERLAP_SECONDS)
+        assert since < snapshot - timedelta(seconds=60)
+
+    def test_delta_export_validation(self, mock_cofr, client, auth_headers):
+        headers, _ = auth_headers
+        since = "2026-01-01T00:00:00Z"
+
+        both = {"since": since, "since_export_id": "00000000-0000-0000-0000-000000000000"}
+        resp = client.post(
+            "/exports", json={"format": "csv", "scope": "transactions", **both}, headers=headers
+        )
+        assert resp.status_code == 400
+
+        resp = client.post(
+            "/exports",
+            json={"format": "pdf", "scope": "transactions", "since": since},
+            headers=headers,
+        )
+        assert resp.status_code == 400
+
+        resp = client.post(
+            "/exports", json={"format": "csv", "scope": "accounts", "since": since}, headers=headers
+        )
+        assert resp.status_code == 400
+
+        resp = client.post(
+            "/exports",
+            json={"format": "csv", "scope": "transactions", "since_export_id": "nope"},
+            headers=headers,
+        )
+        assert resp.status_code == 404
+
 
 @patch("app.services.export_service._RUST_AVAILABLE", False)
 class TestExportsRustUnavailable:
@@ -410,3 +712,138 @@ class TestExportJobCleanup:
         cleanup_expired_jobs()
         assert "active-test" in _jobs
         del _jobs["active-test"]
+
+
+class TestExportWorkerPool:
+    def _blocked_pool(self, **kwargs):
+        from app.services.export_pool import ExportWorkerPool
+
+        pool = ExportWorkerPool(**{"workers": 1, "max_queue": 4, "max_per_user": 2, **kwargs})
+        gate = threading.Event()
+        return pool, gate
+
+    def test_per_user_limit_rejects_with_retry_after(self):
+        from app.services.export_pool import ExportPoolSaturated
+
+        pool, gate = self._blocked_pool(max_per_user=1)
+        try:
+            pool.submit("user-a", gate.wait, 5)
+            with pytest.raises(ExportPoolSaturated) as exc_info:
+                pool.submit("user-a", gate.wait, 5)
+            assert exc_info.value.retry_after >= 1
+            # Other users are still admitted
+            pool.submit("user-b", gate.wait, 5)
+        finally:
+            gate.set()
+            pool.shutdown()
+
+    def test_queue_full_rejects(self):
+        from app.services.export_pool import ExportPoolSaturated
+
+        pool, gate = self._blocked_pool(max_queue=1, max_per_user=5)
+        try:
+            pool.submit("user-a", gate.wait, 5)  # picked up by the only worker
+            deadline = time.monotonic() + 2
+            while pool.stats()["running"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            pool.submit("user-b", gate.wait, 5)  # waits in the queue
+            with pytest.raises(ExportPoolSaturated):
+                pool.submit("user-c", gate.wait, 5)
+            assert pool.stats()["queue_depth"] == 1
+        finally:
+            gate.set()
+            pool.shutdown()
+
+    def test_slots_released_and_stats_recorded(self):
+        pool, gate = self._blocked_pool()
+        gate.set()
+        try:
+            pool.submit("user-a", gate.wait, 5)
+            deadline = time.monotonic() + 2
+            while pool.user_in_flight("user-a") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert pool.user_in_flight("user-a") == 0
+            stats = pool.stats()
+            assert stats["running"] == 0
+            assert stats["queue_depth"] == 0
+            assert stats["avg_wait_seconds"] >= 0
+        finally:
+            pool.shutdown()
+
+    @patch("app.services.export_service._RUST_AVAILABLE", True)
+    def test_saturated_pool_returns_429(self, client, auth_headers):
+        from app.services.export_pool import ExportPoolSaturated
+
+        headers, _ = auth_headers
+        with patch("app.routers.exports.export_pool") as mock_pool:
+            mock_pool.submit.side_effect = ExportPoolSaturated("busy", retry_after=7)
+            resp = client.post(
+                "/exports",
+                json={"format": "csv", "scope": "transactions"},
+                headers=headers,
+            )
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "7"
+
+        from app.services.export_service import _jobs
+
+        assert not any(j.user_id == auth_headers[1] for j in _jobs.values())
+
+    def test_queue_stats_endpoint(self, client, auth_headers):
+        headers, _ = auth_headers
+        resp = client.get("/exports/queue", headers=headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["user_in_flight"] == 0
+        assert {"queue_depth", "avg_wait_seconds", "workers"} <= data.keys()
+
+
+class TestExportEvents:
+    async def test_broker_delivers_events_published_from_threads(self):
+        from app.services.export_service import JobEventBroker
+
+        broker = JobEventBroker()
+        queue = broker.subscribe("job-1")
+        worker = threading.Thread(
+            target=broker.publish, args=("job-1", {"status": "querying", "rows": 10})
+        )
+        worker.start()
+        worker.join()
+
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+        assert event == {"status": "querying", "rows": 10}
+
+        broker.unsubscribe("job-1", queue)
+        assert broker.watcher_count() == 0
+
+    @patch("app.services.export_service._RUST_AVAILABLE", True)
+    def test_stream_wakes_on_transition(self, client, auth_headers):
+        from app.services.export_service import ExportJob, _jobs, update_job
+
+        headers, user_id = auth_headers
+        job = ExportJob(
+            id="event-stream-test",
+            user_id=user_id,
+            status="querying",
+            format="csv",
+            scope="transactions",
+            name="Events",
+            created_at=datetime.now(UTC),
+        )
+        _jobs[job.id] = job
+
+        def _progress_then_finish():
+            time.sleep(0.2)
+            update_job(job, status="rendering", rows=42)
+            update_job(job, status="done")
+
+        try:
+            threading.Thread(target=_progress_then_finish).start()
+            with client.stream("GET", f"/exports/{job.id}/stream", headers=headers) as resp:
+                events = [line for line in resp.iter_lines() if line.startswith("data: ")]
+        finally:
+            del _jobs[job.id]
+
+        assert '"querying"' in events[0]
+        assert any('"rows": 42' in e for e in events)
+        assert '"done"' in events[-1]
@@ -0,0 +1,365 @@
+"""Statement import and full-dump restore: parsing, hash dedupe, job progress."""
+
+import io
+import zipfile
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.db.models import Transaction
+from app.services import restore_service
+from app.services.import_service import (
+    ImportOptions,
+    RowError,
+    StatementLine,
+    cleanup_expired_jobs,
+    create_job,
+    discard_job,
+    get_job,
+    iter_csv,
+    iter_ofx,
+    parse_amount,
+    update_job,
+)
+from tests.conftest import TestSession, make_category, register_user
+
+CSV_STATEMENT = """Date,Description,Payee,Amount
+2026-03-02,Card purchase,Corner Cafe,-4.50
+2026-03-02,Card purchase,Corner Cafe,-4.50
+03/03/2026,Salary March,ACME Ltd,"2,500.00"
+2026-03-04,Groceries,FreshMart,(61.20)
+not a date,Broken,Somewhere,-1.00
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>NZD
+<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260310120000<TRNAMT>-12.30<FITID>A1<NAME>Bakery<MEMO>EFTPOS
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260311<TRNAMT>40.00<FITID>A2<NAME>Refund</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def _account_id(client, headers):
+    return client.get("/accounts/", headers=headers).json()[0]["id"]
+
+
+class _InlinePool:
+    """Runs import jobs inside the request.
+
+    The test engine shares one SQLite connection between sessions, so a worker
+    thread committing while the request session closes (and rolls back) could
+    lose rows. Pool admission itself is covered by the export tests.
+    """
+
+    def submit(self, user_id, fn, *args):
+        fn(*args)
+
+
+def _upload(client, headers, account_id, content, filename="statement.csv", **fields):
+    with (
+        patch("app.routers.imports.SessionLocal", TestSession),
+        patch("app.routers.imports.import_pool", _InlinePool()),
+    ):
+        resp = client.post(
+            "/imports/statements",
+            data={"account_id": account_id, **fields},
+            files={"file": (filename, content.encode(), "text/plain")},
+            headers=headers,
+        )
+    assert resp.status_code == 202, resp.text
+    job = client.get(f"/imports/{resp.json()['job_id']}", headers=headers).json()
+    assert job["status"] in ("done", "error")
+    return job
+
+
+def _expenses(client, headers):
+    return client.get("/expenses/?limit=100", headers=headers).json()["expenses"]
+
+
+# ── Parsing ──
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("-4.50", -4.5),
+        ("2,500.00", 2500.0),
+        ("(61.20)", -61.2),
+        ("1.234,56", 1234.56),
+        ("€ 12,5", 12.5),
+        ("$1,000", 1000.0),
+    ],
+)
+def test_parse_amount(raw, expected):
+    assert parse_amount(raw) == expected
+
+
+def test_csv_debit_credit_columns_and_mapping_override():
+    stream = io.StringIO("When;Out;In;Text\n2026-01-05;10,00;;Coffee\n2026-01-06;;99,00;Pay\n")
+    options = ImportOptions(
+        account_id="x", format="csv", columns={"date": "When", "description": "Text"}
+    )
+    lines = list(iter_csv(stream, options))
+    assert [(line.day, line.amount, line.description) for line in lines] == [
+        (date(2026, 1, 5), -10.0, "Coffee"),
+        (date(2026, 1, 6), 99.0, "Pay"),
+    ]
+
+
+def test_ofx_blocks_split_across_reads():
+    with patch("app.services.import_service._OFX_READ_BYTES", 7):
+        lines = list(iter_ofx(io.StringIO(OFX_STATEMENT)))
+    assert lines == [
+        StatementLine(date(2026, 3, 10), -12.3, "EFTPOS", "Bakery", "NZD", None, "A1"),
+        StatementLine(date(2026, 3, 11), 40.0, "", "Refund", "NZD", None, "A2"),
+    ]
+    assert not any(isinstance(line, RowError) for line in lines)
+
+
+# ── Jobs ──
+
+
+def test_csv_import_and_reimport_dedupes(client, auth_headers, system_categories):
+    headers, _ = auth_headers
+    account_id = _account_id(client, headers)
+
+    job = _upload(client, headers, account_id, CSV_STATEMENT)
+    assert job["status"] == "done", job
+    assert job["rows_read"] == 5
+    assert job["rows_inserted"] == 4
+    assert job["rows_failed"] == 1
+    assert job["errors"] == ["Line 6: Unrecognised date 'not a date'"]
+
+    rows = _expenses(client, headers)
+    assert sorted((r["amount"], r["category_type"]) for r in rows) == [
+        (4.5, "expense"),
+        (4.5, "expense"),
+        (61.2, "expense"),
+        (2500.0, "income"),
+    ]
+    assert {r["category_name"] for r in rows} == {"Miscellaneous", "Salary"}
+
+    # Same statement again: every line is already there.
+    again = _upload(client, headers, account_id, CSV_STATEMENT)
+    assert again["rows_inserted"] == 0
+    assert again["rows_duplicate"] == 4
+    assert len(_expenses(client, headers)) == 4
+
+
+def test_ofx_import_uses_fitid_and_statement_currency(
+    client, auth_headers, db_session, system_categories
+):
+    headers, user_id = auth_headers
+    bakery = make_category(db_session, user_id, name="Bakery")
+    account_id = _account_id(client, headers)
+
+    job = _upload(
+        client,
+        headers,
+        account_id,
+        OFX_STATEMENT,
+        filename="march.ofx",
+        expense_category_id=str(bakery.id),
+    )
+    assert job["status"] == "done", job
+    assert (job["rows_inserted"], job["rows_duplicate"]) == (2, 0)
+    rows = {r["merchant"]: r for r in _expenses(client, headers)}
+    assert rows["Bakery"]["currency"] == "NZD"
+    assert rows["Bakery"]["category_id"] == str(bakery.id)
+
+    # A later statement that overlaps by one transaction.
+    overlap = OFX_STATEMENT.replace("<FITID>A1", "<FITID>A3")
+    job = _upload(client, headers, account_id, overlap, filename="april.ofx")
+    assert (job["rows_inserted"], job["rows_duplicate"]) == (1, 1)
+
+
+def test_import_rejects_bad_requests(client, auth_headers, system_categories):
+    headers, _ = auth_headers
+    account_id = _account_id(client, headers)
+
+    resp = client.post(
+        "/imports/statements",
+        data={"account_id": account_id},
+        files={"file": ("statement.pdf", b"%PDF", "application/pdf")},
+        headers=headers,
+    )
+    assert resp.status_code == 400
+
+    resp = client.post(
+        "/imports/statements",
+        data={"account_id": account_id, "columns": '{"nope": "x"}'},
+        files={"file": ("statement.csv", b"Date,Amount\n", "text/csv")},
+        headers=headers,
+    )
+    assert resp.status_code == 400
+
+    with patch.object(settings, "IMPORT_MAX_UPLOAD_BYTES", 16):
+        resp = client.post(
+            "/imports/statements",
+            data={"account_id": account_id},
+            files={"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")},
+            headers=headers,
+        )
+    assert resp.status_code == 413
+
+    job = _upload(client, headers, account_id, "Foo,Bar\n1,2\n")
+    assert job["status"] == "error"
+    assert "date column" in job["error"]
+
+    token = register_user(client, email="other@example.com", name="Other")
+    other = {"Authorization": f"Bearer {token}"}
+    resp = client.post(
+        "/imports/statements",
+        data={"account_id": account_id},
+        files={"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")},
+        headers=other,
+    )
+    assert resp.status_code == 404
+    assert client.get(f"/imports/{job['job_id']}", headers=other).status_code == 404
+
+
+# ── Full-dump restore ──
+
+DUMP_HEADER = (
+    "Date,Description,Amount,Currency,Category,Category Type,Account,Account Type,"
+    "Transfer,Transfer Direction,Opening Balance\n"
+)
+DUMP_ROWS = [
+    "2026-03-05T09:00:00+00:00,Vet,80.00,USD,Pets,expense,Travel Card,savings,No,,No",
+    "2026-03-04T12:00:00+00:00,Move,25.00,USD,Transfer,transfer,Checking,checking,Yes,from,No",
+    "2026-03-04T12:00:00+00:00,Move,25.00,USD,Transfer,transfer,Travel Card,savings,Yes,to,No",
+    "2026-03-03T12:00:00+00:00,Lunch,12.50,NZD,Food,expense,Checking,checking,No,,No",
+    "2026-03-03T12:00:00+00:00,Lunch,12.50,NZD,Food,expense,Checking,checking,No,,No",
+    "2026-03-01T00:00:00+00:00,,500.00,USD,Salary,income,Checking,checking,No,,Yes",
+]
+
+
+def _dump(rows=DUMP_ROWS) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("transactions.csv", DUMP_HEADER + "\n".join(rows) + "\n")
+        archive.writestr(
+            "accounts.csv", "Name,Type,Balance\nChecking,checking,0.00\nTravel Card,savings,0.00\n"
+        )
+        archive.writestr(
+            "categories.csv", "Name,Type,Total,Transaction Count\nPets,expense,80.00,1\n"
+        )
+    return buffer.getvalue()
+
+
+def _restore(client, headers, content):
+    with (
+        patch("app.routers.imports.SessionLocal", TestSession),
+        patch("app.routers.imports.import_pool", _InlinePool()),
+    ):
+        resp = client.post(
+            "/imports/full-dump",
+            files={"file": ("backup.zip", content, "application/zip")},
+            headers=headers,
+        )
+    assert resp.status_code == 202, resp.text
+    return client.get(f"/imports/{resp.json()['job_id']}", headers=headers).json()
+
+
+def test_full_dump_restore_reconciles_and_relinks(
+    client, auth_headers, db_session, system_categories
+):
+    headers, user_id = auth_headers
+
+    job = _restore(client, headers, _dump())
+    assert job["status"] == "done", job
+    assert (job["rows_read"], job["rows_inserted"], job["rows_failed"]) == (6, 6, 0)
+
+    accounts = {a["name"]: a for a in client.get("/accounts/", headers=headers).json()}
+    assert accounts["Travel Card"]["type"] == "savings"
+    categories = {c["name"]: c for c in client.get("/categories/", headers=headers).json()}
+    assert categories["Pets"]["type"] == "expense"
+    assert not categories["Pets"]["is_system"]
+
+    rows = db_session.query(Transaction).filter(Transaction.user_id == user_id).all()
+    by_notes = {}
+    for row in rows:
+        by_notes.setdefault(row.notes, []).append(row)
+    assert len(by_notes["Lunch"]) == 2
+    assert by_notes["Lunch"][0].category_id == system_categories["food"].id
+    assert by_notes[""][0].is_opening_balance
+    start, end = sorted(by_notes["Move"], key=lambda r: r.transfer_direction)
+    assert (start.transfer_direction, end.transfer_direction) == ("from", "to")
+    assert start.linked_transaction_id == end.id
+    assert end.linked_transaction_id == start.id
+
+    # Restoring the same archive again adds nothing.
+    again = _restore(client, headers, _dump())
+    assert (again["rows_inserted"], again["rows_duplicate"]) == (0, 6)
+    assert db_session.query(Transaction).filter(Transaction.user_id == user_id).count() == 6
+
+
+def test_failed_restore_resumes_from_last_chunk(
+    client, auth_headers, db_session, system_categories
+):
+    headers, user_id = auth_headers
+    real_load = restore_service.load_transactions
+    calls = []
+
+    def flaky_load(db, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+        return real_load(db, rows)
+
+    with (
+        patch.object(settings, "RESTORE_CHUNK_ROWS", 2),
+        patch("app.services.restore_service.load_transactions", flaky_load),
+    ):
+        job = _restore(client, headers, _dump())
+    assert job["status"] == "error"
+    assert job["resumable"] is True
+    assert job["rows_read"] == 2
+
+    with (
+        patch.object(settings, "RESTORE_CHUNK_ROWS", 2),
+        patch("app.routers.imports.SessionLocal", TestSession),
+        patch("app.routers.imports.import_pool", _InlinePool()),
+    ):
+        resp = client.post(f"/imports/{job['job_id']}/resume", headers=headers)
+    assert resp.status_code == 202, resp.text
+    job = client.get(f"/imports/{job['job_id']}", headers=headers).json()
+    assert job["status"] == "done", job
+    assert (job["rows_read"], job["rows_inserted"], job["rows_duplicate"]) == (6, 6, 0)
+    assert db_session.query(Transaction).filter(Transaction.user_id == user_id).count() == 6
+
+    resp = client.post(f"/imports/{job['job_id']}/resume", headers=headers)
+    assert resp.status_code == 409
+
+
+def test_restore_rejects_non_archives(client, auth_headers, system_categories):
+    headers, _ = auth_headers
+    job = _restore(client, headers, b"not a zip")
+    assert job["status"] == "error"
+    assert job["resumable"] is False
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("accounts.csv", "Name,Type,Balance\n")
+    job = _restore(client, headers, buffer.getvalue())
+    assert job["status"] == "error"
+    assert "transactions.csv" in job["error"]
+
+
+def test_job_progress_restarts_its_ttl():
+    job = create_job("user", "full_dump", "zip", "backup.zip", None)
+    job.expires_at = datetime.now(UTC) - timedelta(minutes=1)
+
+    update_job(job, rows_read=job.rows_read + 10)
+    cleanup_expired_jobs()
+
+    assert get_job(job.id) is job
+    assert job.rows_read == 10
+    assert job.expires_at > datetime.now(UTC) + timedelta(minutes=25)
+    discard_job(job.id)
@@ -0,0 +1,31 @@
+import asyncio
+
+import httpx
+
+from app.commands.seed_dataset import DatasetSpec
+from app.main import app
+from benchmarks.load import ROUTES, drive, prepare
+
+
+def test_load_harness_drives_the_mix_in_process(db_session):
+    users = prepare(db_session, DatasetSpec(users=2, months=2, seed=3), login_users=1)
+    mix = {"bootstrap": 2, "list": 2, "create": 3, "update": 1, "delete": 1, "login": 1}
+
+    async def _run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # The test database is one shared SQLite connection, so concurrent
+            # virtual users would interleave on it; concurrency is exercised
+            # against PostgreSQL by the CLI.
+            return await drive(client, users, concurrency=1, duration=1.5, mix=mix)
+
+    result = asyncio.run(_run())
+
+    routes = result["routes"]
+    assert set(routes) == {ROUTES[action] for action in mix}
+    assert result["total"]["requests"] == sum(r["requests"] for r in routes.values())
+    # Writes succeed for the seeded users; only login may be throttled.
+    for name, route in routes.items():
+        assert route["errors"] == 0, name
+        assert route["p50_ms"] <= route["p95_ms"] <= route["p99_ms"]
+    assert sum(r["rate_limited"] for n, r in routes.items() if n != ROUTES["login"]) == 0
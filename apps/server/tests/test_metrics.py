@@ -0,0 +1,94 @@
+"""/internal/metrics exposition, access control and pool instrumentation."""
+
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.metrics import (
+    DB_POOL_CHECKOUTS,
+    DB_POOL_EXHAUSTED_CHECKOUTS,
+    DB_POOL_OVERFLOW_CHECKOUTS,
+    REQUEST_DURATION,
+    Histogram,
+    install_pool_metrics,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, route='/a"b')
+
+    assert hist.render().splitlines() == [
+        "# HELP t_seconds Test.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{route="/a\\"b",le="0.1"} 1.0',
+        't_seconds_bucket{route="/a\\"b",le="1.0"} 3.0',
+        't_seconds_bucket{route="/a\\"b",le="+Inf"} 4.0',
+        't_seconds_sum{route="/a\\"b"} 4.05',
+        't_seconds_count{route="/a\\"b"} 4.0',
+    ]
+
+
+def test_metrics_endpoint_reports_routes_pools_and_limiters(client, auth_headers):
+    headers, _ = auth_headers
+    missing_id = "0c5a8a52-1b0e-4c8e-9a57-3f1f7d0c2b11"
+    before = REQUEST_DURATION.count(method="GET", route="/expenses/{expense_id}", status="404")
+
+    assert client.get(f"/expenses/{missing_id}", headers=headers).status_code == 404
+    for _ in range(2):
+        assert client.get("/expenses/stats/lifetime", headers=headers).status_code == 200
+    resp = client.get("/internal/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    # Labelled by the route template, not the concrete id.
+    assert missing_id not in body
+    assert (
+        REQUEST_DURATION.count(method="GET", route="/expenses/{expense_id}", status="404")
+        == before + 1
+    )
+    for line in (
+        "# TYPE cofr_http_request_duration_seconds histogram",
+        "cofr_http_requests_in_flight 1.0",
+        'cofr_job_queue_depth{pool="export"} 0.0',
+        'cofr_job_workers{pool="import"}',
+        "# TYPE cofr_threadpool_queue_depth gauge",
+        'cofr_rate_limiter_keys{limiter="auth"}',
+        'cofr_cache_lookups_total{cache="expense_user_currency",result="hit"}',
+    ):
+        assert line in body, line
+
+
+def test_metrics_endpoint_requires_token_outside_dev(client):
+    with patch.object(settings, "ENV", "production"):
+        assert client.get("/internal/metrics").status_code == 404
+
+        with patch.object(settings, "METRICS_TOKEN", "scrape-secret"):
+            assert client.get("/internal/metrics").status_code == 401
+            resp = client.get(
+                "/internal/metrics", headers={"Authorization": "Bearer scrape-secret"}
+            )
+            assert resp.status_code == 200
+
+
+def test_pool_metrics_count_overflow_and_exhaustion():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1)
+    install_pool_metrics(engine)
+    checkouts = DB_POOL_CHECKOUTS.value()
+    overflow = DB_POOL_OVERFLOW_CHECKOUTS.value()
+    exhausted = DB_POOL_EXHAUSTED_CHECKOUTS.value()
+
+    with engine.connect() as first:
+        first.execute(text("SELECT 1"))
+        assert DB_POOL_OVERFLOW_CHECKOUTS.value() == overflow
+        with engine.connect() as second:
+            second.execute(text("SELECT 1"))
+
+    assert DB_POOL_CHECKOUTS.value() == checkouts + 2
+    assert DB_POOL_OVERFLOW_CHECKOUTS.value() == overflow + 1
+    assert DB_POOL_EXHAUSTED_CHECKOUTS.value() == exhausted + 1
+    engine.dispose()
@@ -0,0 +1,101 @@
+"""RequestLoggingMiddleware: streaming bodies, JSON access log, sampling and capture."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from app.config import settings
+from app.middleware import RequestLoggingMiddleware
+
+
+def _call(app, chunks: list[bytes], method: str = "POST") -> list[dict]:
+    """Drive `app` through the middleware with the body split into `chunks`."""
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/upload", "headers": []}
+    asyncio.run(RequestLoggingMiddleware(app)(scope, receive, send))
+    return sent
+
+
+def _access_records(caplog) -> list[dict]:
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.middleware"]
+
+
+async def _streaming_app(scope, receive, send):
+    """Reads the body chunk by chunk and echoes how many chunks it saw."""
+    seen = []
+    while True:
+        message = await receive()
+        seen.append(message["body"])
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": str(len(seen)).encode()})
+
+
+def test_body_streams_through_and_capture_is_capped(caplog):
+    chunks = [b"a" * 10, b"b" * 10, b"c" * 10]
+
+    with patch.object(settings, "LOG_REQUEST_BODY_BYTES", 0), caplog.at_level("INFO"):
+        sent = _call(_streaming_app, chunks)
+    # The app received three chunks, not one buffered body.
+    assert sent[1]["body"] == b"3"
+    [record] = _access_records(caplog)
+    assert record["status"] == 201 and record["route"] == "unmatched"
+    assert "body" not in record
+
+    caplog.clear()
+    with patch.object(settings, "LOG_REQUEST_BODY_BYTES", 15), caplog.at_level("INFO"):
+        _call(_streaming_app, chunks)
+    [record] = _access_records(caplog)
+    assert record["body"] == "a" * 10 + "b" * 5
+    assert record["body_truncated"] is True
+
+
+def test_sampling_keeps_server_errors(caplog):
+    async def failing_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 503, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    with patch.object(settings, "LOG_SAMPLE_RATE", 0.0), caplog.at_level("INFO"):
+        _call(_streaming_app, [b"{}"])
+        _call(failing_app, [b""], method="GET")
+
+    assert [(r["method"], r["status"]) for r in _access_records(caplog)] == [("GET", 503)]
+
+
+def test_access_log_is_json_with_route_template(client, auth_headers, caplog):
+    headers, _ = auth_headers
+
+    with caplog.at_level("INFO", logger="app.middleware"):
+        resp = client.get("/expenses/0c5a8a52-1b0e-4c8e-9a57-3f1f7d0c2b11", headers=headers)
+
+    assert resp.status_code == 404
+    [record] = _access_records(caplog)
+    assert record["route"] == "/expenses/{expense_id}"
+    assert record["status"] == 404
+    assert record["queries"] >= 1
+
+
+def test_middleware_benchmark_smoke():
+    from benchmarks.middleware import run
+
+    results = run(requests=5, body_kib=128)
+
+    assert [r["stack"] for r in results] == [
+        "none",
+        "log_requests (old)",
+        "asgi",
+        "asgi + capture",
+    ]
+    assert all(r["POST 128 KiB"] > 0 for r in results)
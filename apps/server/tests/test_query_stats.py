@@ -0,0 +1,110 @@
+"""Per-request query counting, Server-Timing and the query_budget helper."""
+
+import re
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.query_stats import (
+    QueryStats,
+    count_queries,
+    install_query_tracking,
+    statement_shape,
+    track_queries,
+)
+from tests.conftest import query_budget
+
+
+def _transfers(client, headers, count):
+    accounts = client.get("/accounts/", headers=headers).json()
+    for i in range(count):
+        resp = client.post(
+            "/transfers/",
+            json={
+                "amount": 10 + i,
+                "from_account_id": accounts[0]["id"],
+                "to_account_id": accounts[1]["id"],
+                "currency": "NZD",
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 201, resp.text
+
+
+def test_statement_shape_collapses_in_lists_and_whitespace():
+    assert statement_shape("SELECT a\n  FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT a FROM t WHERE id IN (?)"
+    )
+    assert statement_shape("SELECT a FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == (
+        "SELECT a FROM t WHERE id IN (?)"
+    )
+
+    stats = QueryStats()
+    for i in range(6):
+        stats.record(f"SELECT name FROM accounts WHERE id IN ({', '.join('?' * (i + 1))})", 0.001)
+    stats.record("SELECT 1", 0.001)
+    assert stats.statements == 7
+    assert stats.repeated() == [("SELECT name FROM accounts WHERE id IN (?)", 6)]
+
+
+def test_server_timing_header_reports_db_and_app_time(client, auth_headers):
+    headers, _ = auth_headers
+
+    resp = client.get("/expenses/", headers=headers)
+
+    match = re.fullmatch(
+        r'db;dur=([\d.]+);desc="(\d+) queries", app;dur=([\d.]+)', resp.headers["Server-Timing"]
+    )
+    assert match, resp.headers["Server-Timing"]
+    assert int(match.group(2)) >= 1
+
+    with patch.object(settings, "SERVER_TIMING", False):
+        assert "Server-Timing" not in client.get("/expenses/", headers=headers).headers
+
+
+def test_expense_list_query_count_does_not_grow_with_transfers(client, auth_headers):
+    headers, _ = auth_headers
+    _transfers(client, headers, 1)
+    with query_budget(10) as few:
+        assert client.get("/expenses/", headers=headers).status_code == 200
+
+    _transfers(client, headers, 8)
+    with query_budget(few.statements) as many:
+        body = client.get("/expenses/", headers=headers).json()
+
+    assert many.statements == few.statements
+    outgoing = [e for e in body["expenses"] if e["transfer_direction"] == "from"]
+    assert len(outgoing) == 9
+    assert all(e["linked_account_name"] for e in outgoing)
+
+
+def test_n_plus_one_is_logged(client, auth_headers, caplog):
+    headers, _ = auth_headers
+    _transfers(client, headers, 6)
+
+    # One request per transfer's other leg, the way the list used to resolve names.
+    from app.services.expense_service import ExpenseService
+
+    def per_row(self, transactions):
+        return [self._to_schema(tx) for tx in transactions]
+
+    with patch.object(ExpenseService, "_to_schemas", per_row), caplog.at_level("WARNING"):
+        client.get("/expenses/", headers=headers)
+
+    assert any("Likely N+1 in GET /expenses/" in r.getMessage() for r in caplog.records)
+
+
+def test_failed_statement_leaves_no_timing_state_on_the_connection():
+    install_query_tracking()
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn, count_queries(engine) as counted, track_queries() as tracked:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert not any("query_start" in key for key in conn.info)
+
+    assert counted.statements == tracked.statements == 1
+    engine.dispose()
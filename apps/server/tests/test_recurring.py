@@ -1,14 +1,18 @@
 """Recurring rule tests: cadence math, materialization, CRUD, catch-up, idempotency."""
 
-from datetime import date
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
 
 from app.db.models import RecurringRule, Transaction, User
 from app.services.recurring_service import (
     _add_months,
     advance,
+    due_instant,
     iter_due_occurrences,
     materialize_all_due,
     materialize_rule,
+    merge_upcoming,
+    next_due_instant,
     preview_upcoming,
     user_today,
 )
@@ -54,6 +58,36 @@ def test_advance_yearly_leap_day():
     assert advance(start, "year", 1, start) == date(2025, 2, 28)
 
 
+def test_advance_matches_stepwise_reference():
+    """Property check: closed form agrees with the original walk on random inputs."""
+    import random
+
+    from benchmarks.cadence import advance_stepwise
+
+    rng = random.Random(20261019)
+    month_ends = [date(2024, 1, 31), date(2024, 2, 29), date(2025, 8, 30), date(2023, 12, 31)]
+    for _ in range(5000):
+        unit = rng.choice(["day", "week", "month", "year"])
+        count = rng.choice([1, 1, 2, 3, 6, 13])
+        start = (
+            rng.choice(month_ends)
+            if rng.random() < 0.3
+            else date(2020, 1, 1) + timedelta(days=rng.randrange(3000))
+        )
+        # Include from_date before, on and long after the start.
+        from_date = start + timedelta(days=rng.randrange(-60, 4000))
+        assert advance(start, unit, count, from_date) == advance_stepwise(
+            start, unit, count, from_date
+        ), (start, unit, count, from_date)
+
+
+def test_advance_old_rule_is_constant_time():
+    # A 200-year-old daily rule would take ~73k iterations stepwise.
+    start = date(1826, 1, 1)
+    assert advance(start, "day", 1, date(2026, 4, 1)) == date(2026, 4, 2)
+    assert advance(start, "month", 1, date(2026, 4, 1)) == date(2026, 5, 1)
+
+
 def test_preview_upcoming_respects_end_date():
     rule = RecurringRule(
         start_date=date(2026, 4, 1),
@@ -309,6 +343,62 @@ def test_idempotent_across_calls(db_session, client, auth_headers, sample_catego
     assert count == 1
 
 
+def test_catch_up_is_batched_and_links_transfer_legs(db_session, client, auth_headers):
+    """A multi-rule catch-up costs a handful of statements, not one per occurrence."""
+    from sqlalchemy import event
+
+    from tests.conftest import test_engine
+
+    _, user_id = auth_headers
+    accts = _get_accounts(client, auth_headers[0])
+    start = date.fromordinal(date.today().toordinal() - 9)
+    for i in range(5):
+        db_session.add(
+            RecurringRule(
+                user_id=user_id,
+                type="transfer",
+                name=f"Sweep {i}",
+                amount=10 + i,
+                currency="NZD",
+                account_id=accts[0]["id"],
+                to_account_id=accts[1]["id"],
+                description="",
+                interval_unit="day",
+                interval_count=1,
+                start_date=start,
+                next_due_at=start,
+                is_active=True,
+            )
+        )
+    db_session.commit()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(test_engine, "before_cursor_execute", listener)
+    try:
+        created = materialize_all_due(db_session)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", listener)
+
+    assert created == 50  # 5 rules x 10 days
+    assert len(statements) <= 8
+
+    legs = db_session.query(Transaction).filter(Transaction.user_id == user_id).all()
+    assert len(legs) == 100
+    by_id = {leg.id: leg for leg in legs}
+    for leg in legs:
+        assert by_id[leg.linked_transaction_id].linked_transaction_id == leg.id
+
+
+def test_recurring_catch_up_benchmark_smoke():
+    from benchmarks.recurring_catch_up import run
+
+    result = run(rules=50, days=30)
+    # Exact counts depend on each seeded user's local "today"; transfers add a second row.
+    assert result["rows"] > result["occurrences"] > 1000
+    assert result["statements"] < 20
+
+
 def test_update_rule_changes_future_only(db_session, client, auth_headers, sample_category):
     """After editing amount, already-materialized transactions keep old amount."""
     headers, _ = auth_headers
@@ -377,3 +467,326 @@ def test_timezone_persists_via_preferences(client, auth_headers):
     )
     assert resp.status_code == 200
     assert resp.json()["timezone"] == "Pacific/Auckland"
+
+
+# ── Timezone-aware scheduling ────────────────────────────────────────────
+
+
+def test_due_instant_is_local_midnight_in_utc():
+    d = date(2026, 1, 15)
+    assert due_instant(d, ZoneInfo("UTC")) == datetime(2026, 1, 15, tzinfo=UTC)
+    # NZDT is UTC+13 in January: midnight there is 11:00 the previous UTC day.
+    assert due_instant(d, ZoneInfo("Pacific/Auckland")) == datetime(2026, 1, 14, 11, tzinfo=UTC)
+    assert due_instant(d, ZoneInfo("America/Los_Angeles")) == datetime(2026, 1, 15, 8, tzinfo=UTC)
+
+
+def test_created_rule_gets_next_due_utc(db_session, client, auth_headers, sample_category):
+    headers, user_id = auth_headers
+    accts = _get_accounts(client, headers)
+    client.put("/account/preferences", json={"timezone": "Pacific/Auckland"}, headers=headers)
+    start = date.today() + timedelta(days=10)
+    payload = _make_rule_payload(
+        accts[0]["id"], str(sample_category.id), start_date=start.isoformat()
+    )
+    rule_id = client.post("/recurring/", json=payload, headers=headers).json()["id"]
+
+    rule = db_session.query(RecurringRule).filter(RecurringRule.id == rule_id).one()
+    expected = due_instant(start, ZoneInfo("Pacific/Auckland"))
+    assert rule.next_due_utc.replace(tzinfo=UTC) == expected
+    assert next_due_instant(db_session) == expected
+
+
+def test_materialize_all_due_only_processes_due_rules(
+    db_session, client, auth_headers, sample_category
+):
+    """Rules are due at local midnight: Auckland fires hours before Los Angeles."""
+    headers, user_id = auth_headers
+    accts = _get_accounts(client, headers)
+    user = db_session.query(User).filter(User.id == user_id).one()
+    user.timezone = "Pacific/Auckland"
+    db_session.commit()
+
+    day = date(2026, 1, 15)
+    rule = RecurringRule(
+        user_id=user_id,
+        type="expense",
+        name="Rent",
+        amount=100,
+        currency="NZD",
+        account_id=accts[0]["id"],
+        category_id=str(sample_category.id),
+        description="",
+        interval_unit="month",
+        interval_count=1,
+        start_date=day,
+        next_due_at=day,
+        next_due_utc=datetime(2026, 1, 14, 11, tzinfo=UTC),
+        is_active=True,
+    )
+    db_session.add(rule)
+    db_session.commit()
+
+    # One minute before Auckland midnight: nothing to do.
+    assert materialize_all_due(db_session, now=datetime(2026, 1, 14, 10, 59, tzinfo=UTC)) == 0
+    assert materialize_all_due(db_session, now=datetime(2026, 1, 14, 11, 0, tzinfo=UTC)) == 1
+
+    db_session.refresh(rule)
+    assert rule.next_due_at == date(2026, 2, 15)
+    assert rule.next_due_utc.replace(tzinfo=UTC) == datetime(2026, 2, 14, 11, tzinfo=UTC)
+
+
+def test_rules_that_cannot_fire_are_deactivated(db_session, client, auth_headers, sample_category):
+    """Ended rules and transfers without a destination leave the due scan for good."""
+    headers, user_id = auth_headers
+    accts = _get_accounts(client, headers)
+    day = date(2026, 1, 15)
+    common = {
+        "user_id": user_id,
+        "amount": 100,
+        "currency": "NZD",
+        "account_id": accts[0]["id"],
+        "description": "",
+        "interval_unit": "month",
+        "interval_count": 1,
+        "start_date": date(2025, 1, 15),
+        "next_due_at": day,
+        "next_due_utc": datetime(2026, 1, 15, tzinfo=UTC),
+        "is_active": True,
+    }
+    ended = RecurringRule(
+        type="expense",
+        name="Ended",
+        category_id=str(sample_category.id),
+        end_date=date(2025, 12, 31),
+        **common,
+    )
+    orphan = RecurringRule(type="transfer", name="Orphan", to_account_id=None, **common)
+    db_session.add_all([ended, orphan])
+    db_session.commit()
+
+    now = datetime(2026, 3, 1, tzinfo=UTC)
+    assert materialize_all_due(db_session, now=now) == 0
+
+    db_session.refresh(ended)
+    db_session.refresh(orphan)
+    assert not ended.is_active and not orphan.is_active
+    assert next_due_instant(db_session) is None
+    assert db_session.query(Transaction).filter(Transaction.user_id == user_id).count() == 0
+
+
+def test_timezone_change_reschedules_rules(db_session, client, auth_headers, sample_category):
+    headers, user_id = auth_headers
+    accts = _get_accounts(client, headers)
+    start = date.today() + timedelta(days=10)
+    payload = _make_rule_payload(
+        accts[0]["id"], str(sample_category.id), start_date=start.isoformat()
+    )
+    rule_id = client.post("/recurring/", json=payload, headers=headers).json()["id"]
+
+    resp = client.put(
+        "/account/preferences", json={"timezone": "America/Los_Angeles"}, headers=headers
+    )
+    assert resp.status_code == 200
+
+    rule = db_session.query(RecurringRule).filter(RecurringRule.id == rule_id).one()
+    db_session.refresh(rule)
+    expected = due_instant(start, ZoneInfo("America/Los_Angeles"))
+    assert rule.next_due_utc.replace(tzinfo=UTC) == expected
+
+
+def test_list_rules_query_count_is_constant(client, auth_headers, system_categories):
+    """Listing projects accounts and categories in bulk, not per rule."""
+    from sqlalchemy import event
+
+    from tests.conftest import test_engine
+
+    headers, _ = auth_headers
+    accts = _get_accounts(client, headers)
+    future = str(date.today() + timedelta(days=30))
+
+    def list_statements() -> tuple[int, list]:
+        statements = []
+
+        def count(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", count)
+        try:
+            rules = client.get("/recurring/", headers=headers).json()
+        finally:
+            event.remove(test_engine, "before_cursor_execute", count)
+        return len(statements), rules
+
+    categories = [system_categories["miscellaneous"], system_categories["food"]]
+    for i in range(2):
+        payload = _make_rule_payload(
+            accts[i]["id"], str(categories[i].id), name=f"Rule {i}", start_date=future
+        )
+        client.post("/recurring/", json=payload, headers=headers)
+    baseline, rules = list_statements()
+    assert len(rules) == 2
+
+    for i in range(2, 12):
+        payload = _make_rule_payload(
+            accts[i % len(accts)]["id"],
+            str(categories[i % len(categories)].id),
+            name=f"Rule {i}",
+            start_date=future,
+        )
+        assert client.post("/recurring/", json=payload, headers=headers).status_code == 201
+    transfer = _make_rule_payload(
+        accts[0]["id"],
+        None,
+        type="transfer",
+        name="Sweep",
+        to_account_id=accts[1]["id"],
+        start_date=future,
+    )
+    assert client.post("/recurring/", json=transfer, headers=headers).status_code == 201
+
+    queries, rules = list_statements()
+    assert len(rules) == 13
+    assert queries == baseline
+    # Auth user lookup, rules, accounts, categories.
+    assert queries <= 4
+    by_name = {r["name"]: r for r in rules}
+    assert by_name["Sweep"]["to_account_name"] == accts[1]["name"]
+    assert by_name["Rule 1"]["category_name"] == categories[1].name
+
+
+# ── Upcoming calendar ────────────────────────────────────────────────────
+
+
+def _rule(start, unit, count, **kw):
+    return RecurringRule(
+        start_date=start,
+        next_due_at=kw.pop("next_due_at", start),
+        interval_unit=unit,
+        interval_count=count,
+        end_date=kw.pop("end_date", None),
+        **kw,
+    )
+
+
+def test_merge_upcoming_is_sorted_and_windowed():
+    window = (date(2026, 3, 1), date(2026, 3, 31))
+    rules = [
+        _rule(date(2026, 1, 31), "month", 1, name="rent"),
+        _rule(date(2026, 2, 2), "week", 1, name="gym"),
+        _rule(date(2026, 3, 10), "day", 3, name="walk", end_date=date(2026, 3, 20)),
+        _rule(date(2026, 4, 1), "day", 1, name="later"),
+    ]
+    merged = list(merge_upcoming(rules, *window))
+    dates = [d for d, _ in merged]
+
+    assert dates == sorted(dates)
+    assert all(window[0] <= d <= window[1] for d in dates)
+    by_name: dict[str, list[date]] = {}
+    for d, rule in merged:
+        by_name.setdefault(rule.name, []).append(d)
+    assert by_name["rent"] == [date(2026, 3, 31)]
+    assert by_name["gym"] == [date(2026, 3, d) for d in (2, 9, 16, 23, 30)]
+    assert by_name["walk"] == [date(2026, 3, d) for d in (10, 13, 16, 19)]
+    assert "later" not in by_name
+
+
+def test_merge_upcoming_skips_materialized_and_old_history_cheaply():
+    # A daily rule from 1900: the window still costs only the 7 occurrences in it.
+    old = _rule(date(1900, 1, 1), "day", 1, name="old")
+    assert [d for d, _ in merge_upcoming([old], date(2026, 5, 1), date(2026, 5, 7))] == [
+        date(2026, 5, d) for d in range(1, 8)
+    ]
+    # Occurrences before next_due_at have been materialized already.
+    fired = _rule(date(2026, 5, 1), "day", 1, name="fired", next_due_at=date(2026, 5, 5))
+    assert [d for d, _ in merge_upcoming([fired], date(2026, 5, 1), date(2026, 5, 7))] == [
+        date(2026, 5, 5),
+        date(2026, 5, 6),
+        date(2026, 5, 7),
+    ]
+
+
+def test_upcoming_endpoint_converts_and_limits(client, auth_headers, db_session, sample_category):
+    from app.db.models import ExchangeRate
+    from app.services.exchange_rates import invalidate_cache
+
+    headers, user_id = auth_headers
+    accts = _get_accounts(client, headers)
+    now = datetime.now(UTC)
+    db_session.add(ExchangeRate(currency_code="NZD", rate_to_usd=2.0, updated_at=now))
+    db_session.add(ExchangeRate(currency_code="USD", rate_to_usd=1.0, updated_at=now))
+    db_session.commit()
+    invalidate_cache()
+
+    start = date.today() + timedelta(days=5)
+    for name, unit, currency in (("Rent", "month", "NZD"), ("Gym", "week", "USD")):
+        payload = _make_rule_payload(
+            accts[0]["id"],
+            str(sample_category.id),
+            name=name,
+            amount=100,
+            currency=currency,
+            interval_unit=unit,
+            start_date=start.isoformat(),
+        )
+        assert client.post("/recurring/", json=payload, headers=headers).status_code == 201
+
+    params = {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=27)).isoformat(),
+        "currency": "USD",
+    }
+    resp = client.get("/recurring/upcoming", params=params, headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    occurrences = body["occurrences"]
+    assert [o["name"] for o in occurrences].count("Gym") == 4
+    assert [o["name"] for o in occurrences].count("Rent") == 1
+    assert [o["due_date"] for o in occurrences] == sorted(o["due_date"] for o in occurrences)
+    rent = next(o for o in occurrences if o["name"] == "Rent")
+    assert rent["amount"] == 50.0
+    assert rent["original_currency"] == "NZD"
+    assert body["is_converted"] is True
+    assert body["truncated"] is False
+
+    limited = client.get(
+        "/recurring/upcoming", params={**params, "limit": 2}, headers=headers
+    ).json()
+    assert len(limited["occurrences"]) == 2
+    assert limited["truncated"] is True
+
+    bad = client.get(
+        "/recurring/upcoming",
+        params={"start_date": params["end_date"], "end_date": params["start_date"]},
+        headers=headers,
+    )
+    assert bad.status_code == 400
+    # Half-open windows are checked after start defaults to today.
+    for only_end in (date.today() - timedelta(days=1), date.today() + timedelta(days=400)):
+        resp = client.get(
+            "/recurring/upcoming", params={"end_date": only_end.isoformat()}, headers=headers
+        )
+        assert resp.status_code == 400
+    invalidate_cache()
+
+
+def test_bootstrap_includes_upcoming_recurring(client, auth_headers, sample_category):
+    headers, _ = auth_headers
+    accts = _get_accounts(client, headers)
+    start = date.today() + timedelta(days=1)
+    payload = _make_rule_payload(
+        accts[0]["id"], str(sample_category.id), interval_unit="week", start_date=str(start)
+    )
+    client.post("/recurring/", json=payload, headers=headers)
+
+    params = {
+        "start_date": f"{date.today()}T00:00:00",
+        "end_date": f"{date.today()}T23:59:59",
+        "widget_type": ["upcoming_recurring"],
+        "upcoming_days": 14,
+    }
+    body = client.get("/dashboard/bootstrap", params=params, headers=headers).json()
+    assert len(body["upcoming_recurring"]["occurrences"]) == 2
+
+    params["widget_type"] = ["transactions"]
+    body = client.get("/dashboard/bootstrap", params=params, headers=headers).json()
+    assert body["upcoming_recurring"]["occurrences"] == []
@@ -0,0 +1,36 @@
+from app.commands.seed_dataset import DEFAULT_END
+from benchmarks.services import compare, run
+
+
+def test_service_benchmark_smoke():
+    result = run(users=1, months=3, rounds=2, only=["expenses.", "recurring."])
+
+    cases = result["cases"]
+    assert result["meta"]["transactions"] > 100
+    assert result["meta"]["end"] == DEFAULT_END.isoformat()
+    assert set(cases) == {
+        "expenses.get_expenses",
+        "expenses.get_expenses_filtered",
+        "expenses.get_range_stats",
+        "expenses.get_account_balances",
+        "expenses.get_lifetime_stats",
+        "expenses.get_spend_sparkline",
+        "recurring.materialize_all_due",
+    }
+    assert all(case["rounds"] == 2 and case["statements"] > 0 for case in cases.values())
+
+
+def test_compare_flags_slowdowns_and_extra_statements():
+    def doc(**cases):
+        return {
+            "cases": {name: {"median_ms": ms, "statements": n} for name, (ms, n) in cases.items()}
+        }
+
+    baseline = doc(a=(10.0, 3), b=(10.0, 3), c=(0.2, 1), d=(10.0, 3))
+    current = doc(a=(11.0, 3), b=(13.0, 3), c=(0.9, 1), d=(9.0, 4), e=(50.0, 9))
+
+    regressions = compare(current, baseline, threshold=0.2, min_delta_ms=1.0)
+
+    # a is within the threshold, c is 4x slower but under the absolute floor and
+    # e has no baseline.
+    assert [line.split(":")[0] for line in regressions] == ["b", "d"]
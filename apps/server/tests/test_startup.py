@@ -0,0 +1,24 @@
+"""Cold start: the app serves requests before warmup finishes, heavy deps load lazily."""
+
+from unittest.mock import patch
+
+from benchmarks.startup import run
+
+
+def test_cold_start_serves_health_without_heavy_imports():
+    result = run()
+
+    assert result["health_status"] == 200
+    assert result["lazy_loaded"] == [], f"eagerly imported: {result['lazy_loaded']}"
+    # Warmup jobs run in the background; the lifespan itself must not wait on
+    # the rates fetch (10s timeout) or the recurring catch-up.
+    assert result["first_request_seconds"] < 3.0
+
+
+def test_failed_rates_refresh_retries_early():
+    from app.main import _RATES_RETRY_SECONDS, _refresh_rates
+
+    with patch("app.services.exchange_rates.refresh_rates_in_db", return_value=False):
+        assert _refresh_rates() == _RATES_RETRY_SECONDS
+    with patch("app.services.exchange_rates.refresh_rates_in_db", return_value=True):
+        assert _refresh_rates() is None